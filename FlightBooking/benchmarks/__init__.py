@@ -0,0 +1,9 @@
+"""
+This package contains benchmarks for the flight booking packages. Each benchmark is a module that can be run from the
+command line, at the root of the project folder, as follows:
+
+::
+
+    export PYTHONPATH=`pwd`/src/
+    python -m benchmarks.<module name>
+"""
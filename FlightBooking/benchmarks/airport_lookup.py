@@ -0,0 +1,123 @@
+"""
+This module benchmarks the start-up and lookup time for a full-size airport database, comparing the JSON-formatted
+lookup with the indexed lookup created by convert_airport_lookup(). It also measures the time taken to build the
+airport search index and the time per search for typeahead-style prefix searches.
+
+A synthetic database of airports is written to a temporary data folder, so the benchmark doesn't depend on the
+content of the lookup file in the project's data folder.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import string
+import tempfile
+import time
+from src.flight_booking.airport import get_airport, search_airports, convert_airport_lookup, clear_airport_lookup, \
+    build_airport_search_index, AIRPORT_CODES_FILE_NAME, AIRPORT_INDEX_FILE_NAME
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV, get_lookup_file_path
+
+
+def write_airports(number_of_airports):
+    """
+    Write a synthetic JSON-formatted airport lookup to the lookup folder
+
+    :param number_of_airports: Number of airports to write
+    :return: List of the airport codes
+    """
+    # 4-letter codes give room for a full-size database, as the 3-letter IATA codes are exhausted at 17,576
+    codes = ["".join(letters) for letters in itertools.product(string.ascii_uppercase, repeat=4)]
+    codes = random.sample(codes, number_of_airports)
+    airports = {code: {"code": code, "name": make_airport_name(), "tz": "Europe/London"} for code in codes}
+    with open(get_lookup_file_path(AIRPORT_CODES_FILE_NAME), mode="wt", encoding="utf-8") as f:
+        json.dump({"airport_codes": airports}, f)
+    return codes
+
+
+def make_airport_name():
+    """
+    Return a synthetic airport name made up of a random place name and a suffix
+
+    :return: Airport name
+    """
+    syllables = ["ba", "cor", "del", "fa", "gar", "hol", "is", "ken", "lon", "mar", "nor", "os", "pet", "ros", "san",
+                 "tor", "ur", "val", "wes", "zu"]
+    place = "".join(random.choices(syllables, k=random.randint(2, 4))).capitalize()
+    suffix = random.choice(["", " International", " Regional", " Airfield", " City Airport"])
+    return f"{place}{suffix}"
+
+
+def time_searches(codes):
+    """
+    Time building the search index and a typeahead-style search for each airport, searching for the first two
+    letters of its code and the first three letters of its name
+
+    :param codes: Airport codes to search for
+    :return: Tuple of the index build time and the mean time per search, in seconds
+    """
+    queries = [get_airport(code)["name"][:3] for code in codes] + [code[:2] for code in codes]
+    start = time.perf_counter()
+    build_airport_search_index()
+    built = time.perf_counter()
+    for query in queries:
+        search_airports(query)
+    finished = time.perf_counter()
+    return built - start, (finished - built) / len(queries)
+
+
+def time_lookups(codes):
+    """
+    Time loading the airport lookup, by way of the first call to get_airport(), and looking up airports
+
+    :param codes: Airport codes to look up
+    :return: Tuple of the start-up time and the lookup time, in seconds
+    """
+    clear_airport_lookup()
+    start = time.perf_counter()
+    get_airport(codes[0])
+    loaded = time.perf_counter()
+    for code in codes:
+        get_airport(code)
+    finished = time.perf_counter()
+    clear_airport_lookup()
+    return loaded - start, finished - loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Airport lookup benchmark")
+    parser.add_argument("--airports", type=int, default=70000, help="Number of airports in the database")
+    parser.add_argument("--lookups", type=int, default=100000, help="Number of airport lookups")
+    parser.add_argument("--searches", type=int, default=10000, help="Number of airports to search for")
+    args = parser.parse_args()
+
+    original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+    with tempfile.TemporaryDirectory() as data_folder:
+        os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = data_folder
+        try:
+            codes = write_airports(args.airports)
+            lookups = random.choices(codes, k=args.lookups)
+
+            print(f"Airport lookup for {args.airports} airports, {args.lookups} lookups")
+            results = [("JSON", time_lookups(lookups))]
+            convert_airport_lookup()
+            results.append(("Indexed", time_lookups(lookups)))
+
+            for description, (startup, lookup) in results:
+                print(f"{description.ljust(10)} : start-up {startup * 1000:8.2f} ms, "
+                      f"{args.lookups / lookup:12.0f} lookups per second")
+
+            build, search = time_searches(lookups[:args.searches])
+            print(f"{'Search'.ljust(10)} : index {build * 1000:11.2f} ms, {search * 1000:12.4f} ms per search")
+            clear_airport_lookup()
+            os.remove(get_lookup_file_path(AIRPORT_INDEX_FILE_NAME))
+        finally:
+            if original_data_folder is None:
+                del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+            else:
+                os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = original_data_folder
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+This module benchmarks boarding card generation for a full flight, using minimal card generators so the timings
+reflect the cost of assembling the card details and writing the card files rather than rendering them. The no-op
+generator returns an empty card, so its timings are the per-card overhead of the core plus the file write. Each
+generator is timed using both the synchronous and asynchronous generation methods, forcing every card to be
+generated. Finally, incremental regeneration is timed following a change to a single passenger's seat.
+
+The flight is created in a temporary data folder containing copies of the lookups and seating plans, so the generated
+cards don't affect the project's data folder.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV, get_data_folder
+from tests.helpers import create_test_flight, fill_test_flight
+
+
+def text_card_generator(card_details):
+    """
+    Minimal card generator that returns the card details as text
+
+    :param card_details: Boarding card details
+    :return: Boarding card data
+    """
+    return "\n".join(card_details.values())
+
+
+def noop_card_generator(_):
+    """
+    Card generator that does no work
+
+    :return: Empty boarding card data
+    """
+    return b""
+
+
+card_generators = {
+    "text": text_card_generator,
+    "no-op": noop_card_generator
+}
+
+
+def create_full_flight(aircraft, layout):
+    """
+    Create a flight and fill it with passengers
+
+    :param aircraft: Aircraft model
+    :param layout: Airline-specific layout name
+    :return: An instance of the Flight class
+    """
+    flight = create_test_flight()
+    flight.load_seating(aircraft, layout)
+    fill_test_flight(flight)
+    return flight
+
+
+def time_card_generation(flight, generator, repeats, max_concurrency):
+    """
+    Time generating the boarding cards for a flight
+
+    :param flight: Flight to generate boarding cards for
+    :param generator: Card generator function
+    :param repeats: Number of times to generate the full set of cards
+    :param max_concurrency: Maximum concurrency for asynchronous generation or None to generate synchronously
+    :return: The mean time, in seconds, to generate the full set of cards
+    """
+    async def generate_async():
+        for _ in range(repeats):
+            await flight.generate_boarding_cards_async("txt", "28A", max_concurrency=max_concurrency, force=True)
+
+    with patch("src.flight_booking.flight.card_generator_map", {"txt": generator}):
+        start = time.perf_counter()
+        if max_concurrency is None:
+            for _ in range(repeats):
+                flight.generate_boarding_cards("txt", "28A", force=True)
+        else:
+            asyncio.run(generate_async())
+        finished = time.perf_counter()
+    return (finished - start) / repeats
+
+
+def time_incremental_generation(flight, repeats):
+    """
+    Time regenerating the boarding cards for a flight after moving one passenger to a different seat
+
+    :param flight: Flight to generate boarding cards for
+    :param repeats: Number of times to move a passenger and regenerate the cards
+    :return: Tuple of the mean time, in seconds, to regenerate the cards and the mean number of cards rendered
+    """
+    # Remove one passenger to leave a vacant seat, then repeatedly move another passenger into the vacant seat
+    allocations = flight.get_all_seat_allocations()
+    vacant_seat_number = allocations[0][0]
+    flight.remove_passenger(allocations[0][1]["id"])
+    passenger_ids = [passenger["id"] for _, passenger in allocations[1:]]
+
+    rendered = 0
+    elapsed = 0
+    with patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator}):
+        flight.generate_boarding_cards("txt", "28A")
+        for i in range(repeats):
+            passenger_id = passenger_ids[i % len(passenger_ids)]
+            seat_number = flight.get_allocated_seat(passenger_id)
+            flight.allocate_seat(vacant_seat_number, passenger_id)
+            vacant_seat_number = seat_number
+
+            start = time.perf_counter()
+            report = flight.generate_boarding_cards("txt", "28A")
+            elapsed += time.perf_counter() - start
+            rendered += len(report["generated"])
+
+    return elapsed / repeats, rendered / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boarding card generation benchmark")
+    parser.add_argument("--aircraft", default="A321", help="Aircraft model")
+    parser.add_argument("--layout", default="neo", help="Airline-specific layout name")
+    parser.add_argument("--repeats", type=int, default=20, help="Number of times to generate the cards")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrency for asynchronous generation")
+    args = parser.parse_args()
+
+    original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+    lookups_folder = get_data_folder("lookups")
+    seating_plans_folder = get_data_folder("seating_plans")
+    with tempfile.TemporaryDirectory() as data_folder:
+        shutil.copytree(lookups_folder, os.path.join(data_folder, "lookups"))
+        shutil.copytree(seating_plans_folder, os.path.join(data_folder, "seating_plans"))
+        os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = data_folder
+        try:
+            flight = create_full_flight(args.aircraft, args.layout)
+            print(f"Boarding cards for {flight.capacity} passengers, {args.aircraft} layout {args.layout}")
+            for description, generator in card_generators.items():
+                for mode, max_concurrency in [("sync", None), ("async", args.concurrency)]:
+                    elapsed = time_card_generation(flight, generator, args.repeats, max_concurrency)
+                    print(f"{f'{description} ({mode})'.ljust(15)} : {elapsed * 1000:8.2f} ms per flight, "
+                          f"{elapsed * 1000000 / flight.capacity:8.2f} us per card")
+
+            elapsed, rendered = time_incremental_generation(flight, args.repeats)
+            print(f"{'One seat change'.ljust(15)} : {elapsed * 1000:8.2f} ms per flight, "
+                  f"{rendered:8.2f} cards rendered")
+        finally:
+            if original_data_folder is None:
+                del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+            else:
+                os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = original_data_folder
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+This module benchmarks the number of flights loaded per second from the flights folder, comparing loading via the
+full Flight constructor, which looks up the airports and converts the departure time from local time, with loading via
+Flight.from_normalised(), as used by Flight.load_flight_file().
+
+By default, a set of flights with seating plans is saved to a temporary data folder containing copies
+of the lookups and seating plans, so the benchmark doesn't affect the project's data folder. The flights are empty
+unless the benchmark is run with --full, as creating the passengers otherwise dominates the load time. Alternatively,
+the flights already saved in the configured data folder can be loaded.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import time
+from src.flight_booking.flight import Flight, DEPARTURE_DATE_FORMAT
+from src.flight_booking.passenger import PassengerRecord
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV, get_data_folder
+from tests.helpers import fill_test_flight
+
+
+def save_flights(number_of_flights, aircraft, layout, full):
+    """
+    Save a set of flights to the flights folder
+
+    :param number_of_flights: Number of flights to save
+    :param aircraft: Aircraft model
+    :param layout: Airline-specific layout name
+    :param full: If True, the flights are filled with passengers
+    """
+    for i in range(number_of_flights):
+        flight = Flight(
+            airline="EasyJet",
+            number=f"U2{i:04d}",
+            embarkation="RMU" if i % 2 else "LGW",
+            destination="LGW" if i % 2 else "RMU",
+            departs=datetime.datetime(2099, 7, 1, 10, 45) + datetime.timedelta(days=i % 28),
+            duration=datetime.timedelta(hours=2, minutes=35)
+        )
+        flight.load_seating(aircraft, layout)
+        if full:
+            fill_test_flight(flight)
+        flight.save()
+
+
+def load_via_constructor(file_path):
+    """
+    Load a flight data file by way of the full Flight constructor, as Flight.load_flight_file() did before
+    Flight.from_normalised() was added
+
+    :param file_path: Full path to the flight data file
+    :return: A new Flight instance
+    """
+    with open(file_path, mode="rt", encoding="utf-8") as f:
+        json_data = json.load(f)
+
+    details = json_data["details"]
+    flight = Flight(
+        airline=details["airline"],
+        number=details["number"],
+        embarkation=details["embarkation"],
+        destination=details["destination"],
+        departs=datetime.datetime.strptime(details["departs"], DEPARTURE_DATE_FORMAT),
+        duration=datetime.timedelta(seconds=int(details["duration"]))
+    )
+    flight._passengers = {passenger_id: PassengerRecord.from_dict(passenger)
+                          for passenger_id, passenger in json_data["passengers"].items()}
+    flight._seating = json_data["seating"]
+    return flight
+
+
+def time_loading(file_paths, loader):
+    """
+    Time loading a set of flight data files
+
+    :param file_paths: Full paths to the flight data files
+    :param loader: Function to load a flight data file, given its path
+    :return: Flights loaded per second
+    """
+    start = time.perf_counter()
+    for file_path in file_paths:
+        loader(file_path)
+    return len(file_paths) / (time.perf_counter() - start)
+
+
+def time_all_loaders():
+    """
+    Time loading all the flight data files in the flights folder using each loader
+
+    :return: Tuple of the number of flights and a list of (description, flights per second) tuples
+    """
+    folder = get_data_folder("flights")
+    file_paths = [os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith(".json")]
+    if not file_paths:
+        return 0, []
+
+    # Load one flight before timing starts, so the airport lookup is loaded and the timings don't include
+    # start-up costs
+    Flight.load_flight_file(file_paths[0])
+    return len(file_paths), [
+        ("Constructor", time_loading(file_paths, load_via_constructor)),
+        ("Normalised", time_loading(file_paths, Flight.load_flight_file)),
+        ("Columnar", time_loading(file_paths, lambda file_path: Flight.load_flight_file(file_path, True)))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flight loading benchmark")
+    parser.add_argument("--flights", type=int, default=500, help="Number of flights to save and load")
+    parser.add_argument("--aircraft", default="A320", help="Aircraft model")
+    parser.add_argument("--layout", default="1", help="Airline-specific layout name")
+    parser.add_argument("--full", action="store_true", help="Fill the flights with passengers")
+    parser.add_argument("--use-data-folder", action="store_true",
+                        help="Load the flights already saved in the configured data folder")
+    args = parser.parse_args()
+
+    if args.use_data_folder:
+        number_of_flights, results = time_all_loaders()
+    else:
+        original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+        lookups_folder = get_data_folder("lookups")
+        seating_plans_folder = get_data_folder("seating_plans")
+        with tempfile.TemporaryDirectory() as data_folder:
+            shutil.copytree(lookups_folder, os.path.join(data_folder, "lookups"))
+            shutil.copytree(seating_plans_folder, os.path.join(data_folder, "seating_plans"))
+            os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = data_folder
+            try:
+                save_flights(args.flights, args.aircraft, args.layout, args.full)
+                number_of_flights, results = time_all_loaders()
+            finally:
+                if original_data_folder is None:
+                    del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+                else:
+                    os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = original_data_folder
+
+    print(f"Loading {number_of_flights} flights")
+    for description, rate in results:
+        print(f"{description.ljust(12)} : {rate:10.0f} flights per second")
+
+
+if __name__ == "__main__":
+    main()
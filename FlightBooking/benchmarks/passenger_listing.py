@@ -0,0 +1,125 @@
+"""
+This module benchmarks building and rendering the web application's passenger listing for flights with 200, 500 and
+1000 passengers, all shown on a single page. Two ways of building the listing are compared:
+
++--------+-----------------------------------------------------------------------------------------------------------+
+| Copies | Each passenger is copied to a dictionary and the seat number is found by scanning the seating plan, as   |
+|        | the model did before passenger views were introduced                                                      |
++--------+-----------------------------------------------------------------------------------------------------------+
+| Views  | The seat numbers are found with a single pass over the seating plan and each passenger is wrapped in a    |
+|        | PassengerSeatView, as returned by FlightBookingModel.get_passenger_page()                                 |
++--------+-----------------------------------------------------------------------------------------------------------+
+
+The listings are then rendered using the passenger listing template. The flights use a synthetic 1000-seat aircraft
+with every passenger allocated a seat, so the cost of finding the seat numbers is included.
+"""
+
+import argparse
+import os
+import time
+from flask import render_template
+from src.booking_web.booking import app
+from src.booking_web.model import FlightBookingModel
+from benchmarks.synthetic import AircraftSpecification, SYNTHETIC_AIRLINE, temporary_data_folder
+
+# Synthetic aircraft large enough to seat the largest number of passengers
+AIRCRAFT = "LISTING"
+AIRCRAFT_SPECIFICATION = AircraftSpecification(1000, 10, 0, 0)
+
+
+def create_model(number_of_passengers):
+    """
+    Create a booking model whose current flight has the specified number of passengers, each allocated a seat
+
+    :param number_of_passengers: Number of passengers
+    :return: An instance of the FlightBookingModel class
+    """
+    model = FlightBookingModel()
+    model.create_flight("LGW", "RMU", SYNTHETIC_AIRLINE, "SY0001", "20/11/2099", "10:45", "2:35")
+    model.flight.load_seating(AIRCRAFT, None)
+    for i in range(number_of_passengers):
+        model.add_passenger(f"Passenger {i}", "M" if i % 2 else "F", "01/01/1980", "United Kingdom",
+                            "United Kingdom", str(i).zfill(6))
+    return model
+
+
+def build_copies(model, number_of_passengers):
+    flight = model.flight
+    return [
+        dict(flight.passengers[passenger_id], number=number, seat_number=flight.get_allocated_seat(passenger_id))
+        for number, passenger_id in enumerate(flight.passengers, 1)
+    ]
+
+
+def build_views(model, number_of_passengers):
+    return model.get_passenger_page(page_size=number_of_passengers)["passengers"]
+
+
+def render_listing(passengers):
+    """
+    Render the passenger listing template for a single page containing the specified passengers
+
+    :param passengers: Sequence of passenger mappings, including the passenger and seat numbers
+    :return: Rendered HTML
+    """
+    page = {"page": 1, "page_size": len(passengers), "pages": 1, "matches": len(passengers),
+            "total": len(passengers), "passengers": passengers}
+    with app.test_request_context("/list_passengers"):
+        return render_template("list_passengers.html",
+                               page=page,
+                               query={},
+                               listing_url=lambda **_: "/list_passengers",
+                               error=None,
+                               options_map=[])
+
+
+def time_listing(build, model, number_of_passengers, repeats):
+    """
+    Time building and rendering a passenger listing
+
+    :param build: Function to build the listing from the model
+    :param model: Booking model
+    :param number_of_passengers: Number of passengers on the flight
+    :param repeats: Number of times to build and render the listing
+    :return: Tuple of the mean build time and mean render time, in seconds
+    """
+    build_time = 0
+    render_time = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        passengers = build(model, number_of_passengers)
+        built = time.perf_counter()
+        render_listing(passengers)
+        build_time += built - start
+        render_time += time.perf_counter() - built
+    return build_time / repeats, render_time / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Passenger listing benchmark")
+    parser.add_argument("--passengers", type=int, nargs="+", default=[200, 500, 1000],
+                        help="Numbers of passengers, up to 1000")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to build and render each listing")
+    args = parser.parse_args()
+
+    # The application locates its templates relative to its root path, which is the working directory when it's run
+    # normally, so point it at the application folder
+    app.root_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "booking_web")
+
+    with temporary_data_folder({AIRCRAFT: AIRCRAFT_SPECIFICATION}):
+        print(f"{'Passengers':>10} {'Copies build':>14} {'Views build':>14} {'Copies render':>14} "
+              f"{'Views render':>14}  (ms)")
+        for number_of_passengers in args.passengers:
+            model = create_model(number_of_passengers)
+
+            # Warm up the template cache so the first measurement doesn't include compiling the templates
+            render_listing(build_views(model, number_of_passengers))
+
+            copies = time_listing(build_copies, model, number_of_passengers, args.repeats)
+            views = time_listing(build_views, model, number_of_passengers, args.repeats)
+            print(f"{number_of_passengers:10d} {copies[0] * 1000:14.2f} {views[0] * 1000:14.2f} "
+                  f"{copies[1] * 1000:14.2f} {views[1] * 1000:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+This module benchmarks the memory used by a large number of passengers, comparing passengers held as dictionaries
+with passengers held as passenger records and in a columnar passenger store.
+
+The passengers are serialised to JSON before measurement starts and each representation is then created by loading
+the JSON, as happens when flights are loaded from their data files, so neither representation shares string objects
+with the source data.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import random
+import tracemalloc
+from src.flight_booking.passenger import create_passenger, PassengerRecord
+from src.flight_booking.passenger_store import PassengerStore
+
+
+def create_passenger_json(number_of_passengers):
+    """
+    Create the JSON representation of a list of passengers
+
+    :param number_of_passengers: Number of passengers to create
+    :return: JSON representation of the passengers
+    """
+    countries = ["United Kingdom", "Spain", "France", "Germany", "Italy", "Ireland", "Portugal", "Netherlands"]
+    passengers = []
+    for i in range(number_of_passengers):
+        passengers.append(create_passenger(f"Passenger {i}",
+                                           random.choice(["M", "F"]),
+                                           datetime.date(random.randint(1940, 2010), random.randint(1, 12), 1),
+                                           random.choice(countries),
+                                           random.choice(countries),
+                                           str(i).zfill(9)).to_dict())
+    return json.dumps(passengers)
+
+
+def load_dictionaries(json_data):
+    """
+    Load passengers as dictionaries
+
+    :param json_data: JSON representation of the passengers
+    :return: List of dictionaries
+    """
+    return json.loads(json_data)
+
+
+def load_records(json_data):
+    """
+    Load passengers as passenger records
+
+    :param json_data: JSON representation of the passengers
+    :return: List of passenger records
+    """
+    return [PassengerRecord.from_dict(passenger) for passenger in json.loads(json_data)]
+
+
+def load_store(json_data):
+    """
+    Load passengers into a columnar passenger store
+
+    :param json_data: JSON representation of the passengers
+    :return: Passenger store
+    """
+    return PassengerStore(json.loads(json_data))
+
+
+def measure_passengers(json_data, loader):
+    """
+    Load passengers from their JSON representation and return the memory they use
+
+    :param json_data: JSON representation of the passengers
+    :param loader: Function to create the passengers from the JSON
+    :return: Tuple of the bytes allocated to hold the passengers and the peak bytes allocated while loading them
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    passengers = loader(json_data)
+    end, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del passengers
+    return end - start, peak - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Passenger memory benchmark")
+    parser.add_argument("--passengers", type=int, default=1000000, help="Number of passengers")
+    args = parser.parse_args()
+
+    json_data = create_passenger_json(args.passengers)
+    print(f"Memory for {args.passengers} passengers")
+    for description, loader in [("Dictionary", load_dictionaries), ("Record", load_records),
+                                ("Columnar", load_store)]:
+        used, peak = measure_passengers(json_data, loader)
+        print(f"{description.ljust(10)} : {used / 2 ** 20:8.1f} MiB, {used / args.passengers:6.0f} bytes per "
+              f"passenger, peak while loading {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
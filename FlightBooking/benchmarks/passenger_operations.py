@@ -0,0 +1,76 @@
+"""
+This module benchmarks manifest-wide passenger operations, comparing passengers held in a dictionary of passenger
+records, as used by default by the Flight class, with passengers held in a columnar passenger store. The operations
+are filtering by nationality, sorting by date of birth, exporting the names and passport numbers and finding duplicate
+passport numbers.
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from src.flight_booking.passenger import PassengerRecord
+from src.flight_booking.passenger_store import PassengerStore
+from benchmarks.passenger_memory import create_passenger_json
+
+
+def records_filter(passengers):
+    return [pid for pid, p in passengers.items() if p["nationality"] == "Spain"]
+
+
+def records_sort(passengers):
+    return sorted(passengers, key=lambda pid: passengers[pid]["dob"])
+
+
+def records_export(passengers):
+    return {field: [p[field] for p in passengers.values()] for field in ["name", "passport_number"]}
+
+
+def records_duplicates(passengers):
+    counts = Counter(p["passport_number"] for p in passengers.values())
+    return [pid for pid, p in passengers.items() if counts[p["passport_number"]] > 1]
+
+
+operations = {
+    "Filter": (records_filter, lambda store: store.filter(nationality="Spain")),
+    "Sort": (records_sort, lambda store: store.sort("dob")),
+    "Export": (records_export, lambda store: store.export(["name", "passport_number"])),
+    "Duplicates": (records_duplicates, lambda store: store.find_duplicates("passport_number"))
+}
+
+
+def time_operation(operation, passengers, repeats):
+    """
+    Time an operation on a set of passengers
+
+    :param operation: Function to apply to the passengers
+    :param passengers: Passengers, as a dictionary of records or a passenger store
+    :param repeats: Number of times to apply the operation
+    :return: The mean time, in seconds, per operation
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        operation(passengers)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Passenger operations benchmark")
+    parser.add_argument("--passengers", type=int, default=100000, help="Number of passengers")
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to repeat each operation")
+    args = parser.parse_args()
+
+    passengers = json.loads(create_passenger_json(args.passengers))
+    records = {p["id"]: PassengerRecord.from_dict(p) for p in passengers}
+    store = PassengerStore(passengers)
+
+    print(f"Operations on {args.passengers} passengers")
+    for description, (records_operation, store_operation) in operations.items():
+        records_time = time_operation(records_operation, records, args.repeats)
+        store_time = time_operation(store_operation, store, args.repeats)
+        print(f"{description.ljust(10)} : records {records_time * 1000:8.2f} ms, "
+              f"columnar {store_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
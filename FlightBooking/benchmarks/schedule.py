@@ -0,0 +1,255 @@
+"""
+This module generates a synthetic schedule for load and scale testing, writing it directly into a data folder:
+
++---------------+---------------------------------------------------------------------------------------------------+
+| Airports      | An airport lookup containing the requested number of airports, with timezones                     |
++---------------+---------------------------------------------------------------------------------------------------+
+| Seating plans | Seating plans for the requested number of aircraft of the synthetic airline, from 100 to 550 seats |
++---------------+---------------------------------------------------------------------------------------------------+
+| Flights       | Flight data files with passenger manifests and seat allocations                                   |
++---------------+---------------------------------------------------------------------------------------------------+
+
+The load factor for each flight is drawn from a beta distribution with a mean of around 80%, so most flights are
+well-filled but some are nearly empty or full, and every passenger is allocated a random seat. The output depends
+only on the arguments and the seed, so the same schedule can be recreated on any machine:
+
+::
+
+    python -m benchmarks.schedule /path/to/data --airports 500 --aircraft 20 --flights 5000 --seed 1
+
+Flight data files are written in the same format as Flight.save(), but without indentation, and the passengers and
+seating plans are created as the dictionaries Flight.to_json() serialises rather than by way of the Flight class, so
+large schedules can be generated quickly. Loading a generated flight with Flight.load_flight() gives the same result
+as loading a flight that had been created through the Flight class.
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import string
+import time
+import uuid
+import pytz
+from src.flight_booking.airport import AIRPORT_CODES_FILE_NAME, AIRPORT_INDEX_FILE_NAME, clear_airport_lookup
+from src.flight_booking.flight import DEPARTURE_DATE_FORMAT
+from src.flight_booking.seating_plan import get_plan_template, create_plan_from_template
+from src.flight_booking.utils import get_data_folder, get_flight_file_path, get_lookup_file_path
+from benchmarks.synthetic import SYNTHETIC_AIRLINE, AircraftSpecification, use_data_folder, write_synthetic_plan
+
+FIRST_NAMES = ["Alex", "Ana", "Ben", "Carmen", "Chloe", "David", "Elena", "Finn", "Grace", "Hugo", "Isla", "Jack",
+               "Javier", "Lena", "Lucia", "Marco", "Maria", "Noah", "Olivia", "Pablo", "Sophie", "Tom", "Yusuf", "Zoe"]
+LAST_NAMES = ["Brown", "Fernandez", "Garcia", "Jones", "Kowalski", "Martin", "Meyer", "Murphy", "Novak", "Rossi",
+              "Santos", "Smith", "Taylor", "Van Dijk", "Walker", "Williams"]
+COUNTRIES = ["United Kingdom", "Spain", "France", "Germany", "Italy", "Ireland", "Portugal", "Netherlands", "Poland",
+             "United States"]
+
+# Beta distribution parameters for the flight load factors, giving a mean of 0.8
+LOAD_FACTOR_ALPHA = 8
+LOAD_FACTOR_BETA = 2
+
+
+def write_airports(rng, number_of_airports):
+    """
+    Write a synthetic airport lookup with a random timezone for each airport
+
+    :param rng: Random number generator
+    :param number_of_airports: Number of airports to write
+    :return: List of the airport codes
+    """
+    codes = rng.sample(["".join(letters) for letters in itertools.product(string.ascii_uppercase, repeat=3)],
+                       number_of_airports)
+    timezones = sorted(pytz.common_timezones)
+    airports = {code: {"code": code, "name": f"{code.capitalize()} International", "tz": rng.choice(timezones)}
+                for code in codes}
+
+    with open(get_lookup_file_path(AIRPORT_CODES_FILE_NAME), mode="wt", encoding="utf-8") as f:
+        json.dump({"airport_codes": airports}, f, indent=3)
+
+    # Remove any indexed lookup for the previous airports and discard the airports loaded by this process
+    index_file = get_lookup_file_path(AIRPORT_INDEX_FILE_NAME)
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    clear_airport_lookup()
+
+    return codes
+
+
+def write_seating_plans(rng, number_of_aircraft):
+    """
+    Write synthetic seating plans for the synthetic airline, with capacities between 100 and 550 seats
+
+    :param rng: Random number generator
+    :param number_of_aircraft: Number of aircraft seating plans to write
+    :return: Dictionary of aircraft model to plan template
+    """
+    templates = {}
+    for i in range(number_of_aircraft):
+        capacity = rng.randrange(100, 551, 10)
+        seats_per_row = 6 if capacity <= 240 else 9 if capacity <= 350 else 10
+        business_rows = rng.randint(0, capacity // 50)
+        aircraft = f"SY{i + 1:03d}"
+        write_synthetic_plan(aircraft, AircraftSpecification(capacity, seats_per_row, business_rows, 4))
+        templates[aircraft] = get_plan_template(SYNTHETIC_AIRLINE, aircraft)
+    return templates
+
+
+def create_dates_of_birth():
+    """
+    Create a list of the dates of birth to choose from, in the format stored for passengers
+
+    :return: List of dates in the format YYYYMMDD
+    """
+    first = datetime.date(1940, 1, 1).toordinal()
+    last = datetime.date(2015, 12, 31).toordinal()
+    return [datetime.date.fromordinal(day).strftime("%Y%m%d") for day in range(first, last + 1)]
+
+
+def create_manifest(rng, number_of_passengers, first_passport_number, dates_of_birth):
+    """
+    Create the passengers for a flight
+
+    :param rng: Random number generator
+    :param number_of_passengers: Number of passengers to create
+    :param first_passport_number: Passport number for the first passenger, incremented for each passenger
+    :param dates_of_birth: List of dates of birth to choose from
+    :return: Dictionary of passenger dictionaries, keyed by passenger ID
+    """
+    first_names = rng.choices(FIRST_NAMES, k=number_of_passengers)
+    last_names = rng.choices(LAST_NAMES, k=number_of_passengers)
+    genders = rng.choices(["M", "F"], k=number_of_passengers)
+    dobs = rng.choices(dates_of_birth, k=number_of_passengers)
+    nationalities = rng.choices(COUNTRIES, k=number_of_passengers)
+    residencies = rng.choices(COUNTRIES, k=number_of_passengers)
+
+    passengers = {}
+    for i in range(number_of_passengers):
+        passenger_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        passengers[passenger_id] = {
+            "id": passenger_id,
+            "name": f"{first_names[i]} {last_names[i]}",
+            "gender": genders[i],
+            "dob": dobs[i],
+            "nationality": nationalities[i],
+            "residency": residencies[i],
+            "passport_number": str(first_passport_number + i).zfill(9)
+        }
+    return passengers
+
+
+def create_seating(rng, template, passenger_ids):
+    """
+    Create a seating plan with each passenger allocated to a random seat
+
+    :param rng: Random number generator
+    :param template: Plan template for the aircraft
+    :param passenger_ids: List of passenger IDs
+    :return: Seating plan
+    """
+    plan = create_plan_from_template(template)
+    for seat_number, passenger_id in zip(rng.sample(template.seat_numbers, len(passenger_ids)), passenger_ids):
+        plan[seat_number[:-1]]["seats"][seat_number] = passenger_id
+    return plan
+
+
+def generate_schedule(data_folder, number_of_airports, number_of_aircraft, number_of_flights, seed=0,
+                      start_date=datetime.date(2099, 1, 1), days=365):
+    """
+    Generate a synthetic schedule in a data folder. Existing airport lookups, synthetic seating plans and flights
+    with the same file names are replaced
+
+    :param data_folder: Full path to the data folder
+    :param number_of_airports: Number of airports, between 2 and 17,576
+    :param number_of_aircraft: Number of aircraft seating plans
+    :param number_of_flights: Number of flights
+    :param seed: Seed for the random number generator
+    :param start_date: Date of the first day of the schedule
+    :param days: Number of days covered by the schedule
+    :raises ValueError: If any of the numbers are out of range
+    :return: Dictionary containing the number of airports, aircraft, flights and passengers written
+    """
+    if not 2 <= number_of_airports <= len(string.ascii_uppercase) ** 3:
+        raise ValueError(f"The number of airports must be between 2 and {len(string.ascii_uppercase) ** 3}")
+
+    if number_of_aircraft < 1:
+        raise ValueError("The number of aircraft must be at least 1")
+
+    if number_of_flights < 0:
+        raise ValueError("The number of flights cannot be negative")
+
+    if days < 1:
+        raise ValueError("The schedule must cover at least 1 day")
+
+    rng = random.Random(seed)
+    number_of_passengers = 0
+    with use_data_folder(data_folder):
+        airport_codes = write_airports(rng, number_of_airports)
+        templates = write_seating_plans(rng, number_of_aircraft)
+        aircraft = sorted(templates)
+        dates_of_birth = create_dates_of_birth()
+        get_data_folder("flights")
+
+        first_departure = datetime.datetime.combine(start_date, datetime.time())
+        for i in range(number_of_flights):
+            template = templates[rng.choice(aircraft)]
+            embarkation, destination = rng.sample(airport_codes, 2)
+            departs = first_departure + datetime.timedelta(days=rng.randrange(days), minutes=5 * rng.randrange(288))
+            duration = datetime.timedelta(minutes=5 * rng.randint(6, 180))
+            load_factor = rng.betavariate(LOAD_FACTOR_ALPHA, LOAD_FACTOR_BETA)
+
+            passengers = create_manifest(rng, round(template.capacity * load_factor), number_of_passengers,
+                                         dates_of_birth)
+            number_of_passengers += len(passengers)
+
+            number = f"SY{i + 1:06d}"
+            flight_data = {
+                "details": {
+                    "airline": SYNTHETIC_AIRLINE,
+                    "number": number,
+                    "embarkation": embarkation,
+                    "destination": destination,
+                    "departs": departs.strftime(DEPARTURE_DATE_FORMAT),
+                    "duration": duration.seconds,
+                    "aircraft": template.aircraft,
+                    "layout": template.layout,
+                    "capacity": template.capacity
+                },
+                "passengers": passengers,
+                "seating": create_seating(rng, template, list(passengers))
+            }
+
+            # json.dump() encodes in Python as it writes, so the flight is encoded with json.dumps() and then written
+            with open(get_flight_file_path(number, departs), mode="wt", encoding="utf-8") as f:
+                f.write(json.dumps(flight_data))
+
+    return {
+        "airports": number_of_airports,
+        "aircraft": number_of_aircraft,
+        "flights": number_of_flights,
+        "passengers": number_of_passengers
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic schedule generator")
+    parser.add_argument("data_folder", help="Data folder to write the schedule to")
+    parser.add_argument("--airports", type=int, default=200, help="Number of airports")
+    parser.add_argument("--aircraft", type=int, default=10, help="Number of aircraft seating plans")
+    parser.add_argument("--flights", type=int, default=1000, help="Number of flights")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random number generator")
+    parser.add_argument("--days", type=int, default=365, help="Number of days covered by the schedule")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    os.makedirs(args.data_folder, exist_ok=True)
+    report = generate_schedule(os.path.abspath(args.data_folder), args.airports, args.aircraft, args.flights,
+                               args.seed, days=args.days)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {report['airports']} airports, {report['aircraft']} seating plans, {report['flights']} flights and "
+          f"{report['passengers']} passengers in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+This module benchmarks the memory used by the seating plans for a large number of in-memory flights, comparing
+dictionary-based seating plans with compact seating plans.
+
+Each flight's plan is created from the cached template for an A321neo and filled to a configurable load factor. The
+passenger IDs are created before measurement starts, as they're owned by the passengers rather than the plans.
+"""
+
+import argparse
+import tracemalloc
+import uuid
+from src.flight_booking.seating_plan import read_plan, get_plan_template
+
+
+def measure_plans(number_of_flights, load_factor, compact):
+    """
+    Create seating plans for the specified number of flights and return the memory they use
+
+    :param number_of_flights: Number of flights to create
+    :param load_factor: Proportion of the seats to allocate on each flight, between 0 and 1
+    :param compact: If True, create compact seating plans
+    :return: The number of bytes allocated to hold the plans
+    """
+    template = get_plan_template("EasyJet", "A321", "neo")
+    seat_numbers = template.seat_numbers[:int(template.capacity * load_factor)]
+    passenger_ids = [str(uuid.uuid4()) for _ in seat_numbers]
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    plans = []
+    for _ in range(number_of_flights):
+        plan = read_plan("EasyJet", "A321", "neo", compact=compact)
+        for seat_number, passenger_id in zip(seat_numbers, passenger_ids):
+            plan[seat_number[:-1]]["seats"][seat_number] = passenger_id
+        plans.append(plan)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return end - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seating plan memory benchmark")
+    parser.add_argument("--flights", type=int, default=10000, help="Number of in-memory flights")
+    parser.add_argument("--load-factor", type=float, default=0.8, help="Proportion of seats allocated")
+    args = parser.parse_args()
+
+    print(f"Seating plan memory for {args.flights} flights, load factor {args.load_factor:.0%}")
+    for description, compact in [("Dictionary", False), ("Compact", True)]:
+        used = measure_plans(args.flights, args.load_factor, compact)
+        print(f"{description.ljust(10)} : {used / 2 ** 20:8.1f} MiB, {used / args.flights:8.0f} bytes per flight")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+This module contains a benchmark suite covering the core flight_booking operations, run against synthetic seating
+plans ranging from an A320 to a 550-seat A380 (see the synthetic module). Passengers are created using the
+reproducible passenger generator in the test helpers, so each run works with the same data.
+
+The suite has two commands. The run command times each case for each aircraft, prints the results and, optionally,
+writes them to a JSON file:
+
+::
+
+    python -m benchmarks.suite run --output results.json
+
+The compare command compares two result files and flags cases that have slowed down by more than a threshold,
+exiting with a non-zero status if there are any, so it can be used to check for regressions between runs:
+
+::
+
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.1
+
+Each case returns the time taken and the number of operations timed, so results are reported as the time per
+operation. The cases are:
+
++-------------------------+-----------------------------------------------------------------------------------------+
+| add_passenger           | Add passengers to an empty flight until it's full                                       |
++-------------------------+-----------------------------------------------------------------------------------------+
+| allocate_next_empty_seat| Allocate every passenger on a full flight to the next empty seat                       |
++-------------------------+-----------------------------------------------------------------------------------------+
+| get_seat_allocations    | Get the seat allocations for a full seating plan                                        |
++-------------------------+-----------------------------------------------------------------------------------------+
+| copy_seat_allocations   | Copy the allocations for a full seating plan to an empty plan                           |
++-------------------------+-----------------------------------------------------------------------------------------+
+| to_json                 | Serialise a full flight to JSON                                                         |
++-------------------------+-----------------------------------------------------------------------------------------+
+| load_flight             | Load a full flight from its data file                                                   |
++-------------------------+-----------------------------------------------------------------------------------------+
+| generate_boarding_cards | Generate text boarding cards for every passenger on a full flight                       |
++-------------------------+-----------------------------------------------------------------------------------------+
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from unittest.mock import patch
+from src.flight_booking.flight import Flight
+from src.flight_booking.seating_plan import read_plan, get_seat_allocations, copy_seat_allocations
+from benchmarks.synthetic import AIRCRAFT, SYNTHETIC_AIRLINE, temporary_data_folder, create_synthetic_flight
+from tests.helpers import create_test_passengers, text_card_generator
+
+# Number of times get_seat_allocations() is called per repeat, as a single call is too quick to time reliably
+SEAT_ALLOCATION_CALLS = 100
+
+
+def create_full_flight(aircraft, passengers):
+    """
+    Create a synthetic flight, add the passengers and allocate them to seats from front to back
+
+    :param aircraft: Aircraft model
+    :param passengers: List of passengers, at least as long as the capacity of the aircraft
+    :return: An instance of the Flight class
+    """
+    flight = create_synthetic_flight(aircraft)
+    for passenger in passengers[:flight.capacity]:
+        flight.add_passenger(passenger)
+        flight.allocate_next_empty_seat(passenger["id"])
+    return flight
+
+
+def case_add_passenger(aircraft, passengers):
+    flight = create_synthetic_flight(aircraft)
+    passengers = passengers[:flight.capacity]
+    start = time.perf_counter()
+    for passenger in passengers:
+        flight.add_passenger(passenger)
+    return time.perf_counter() - start, len(passengers)
+
+
+def case_allocate_next_empty_seat(aircraft, passengers):
+    flight = create_synthetic_flight(aircraft)
+    passengers = passengers[:flight.capacity]
+    for passenger in passengers:
+        flight.add_passenger(passenger)
+
+    start = time.perf_counter()
+    for passenger in passengers:
+        flight.allocate_next_empty_seat(passenger["id"])
+    return time.perf_counter() - start, len(passengers)
+
+
+def case_get_seat_allocations(aircraft, passengers):
+    plan = create_full_flight(aircraft, passengers).seating_plan
+    start = time.perf_counter()
+    for _ in range(SEAT_ALLOCATION_CALLS):
+        get_seat_allocations(plan)
+    return time.perf_counter() - start, SEAT_ALLOCATION_CALLS
+
+
+def case_copy_seat_allocations(aircraft, passengers):
+    plan = create_full_flight(aircraft, passengers).seating_plan
+    to_plan = read_plan(SYNTHETIC_AIRLINE, aircraft)
+    start = time.perf_counter()
+    copy_seat_allocations(plan, to_plan)
+    return time.perf_counter() - start, 1
+
+
+def case_to_json(aircraft, passengers):
+    flight = create_full_flight(aircraft, passengers)
+    start = time.perf_counter()
+    flight.to_json()
+    return time.perf_counter() - start, 1
+
+
+def case_load_flight(aircraft, passengers):
+    flight = create_full_flight(aircraft, passengers)
+    flight.save()
+    start = time.perf_counter()
+    Flight.load_flight(flight.number, flight.departure_date)
+    return time.perf_counter() - start, 1
+
+
+def case_generate_boarding_cards(aircraft, passengers):
+    flight = create_full_flight(aircraft, passengers)
+    with patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator}):
+        start = time.perf_counter()
+        flight.generate_boarding_cards("txt", "28A", force=True)
+        return time.perf_counter() - start, flight.capacity
+
+
+CASES = {
+    "add_passenger": case_add_passenger,
+    "allocate_next_empty_seat": case_allocate_next_empty_seat,
+    "get_seat_allocations": case_get_seat_allocations,
+    "copy_seat_allocations": case_copy_seat_allocations,
+    "to_json": case_to_json,
+    "load_flight": case_load_flight,
+    "generate_boarding_cards": case_generate_boarding_cards
+}
+
+
+def run_case(case, aircraft, passengers, repeats):
+    """
+    Run a benchmark case repeatedly and summarise the time per operation
+
+    :param case: Benchmark case function
+    :param aircraft: Aircraft model
+    :param passengers: List of passengers for the case
+    :param repeats: Number of times to run the case
+    :return: Dictionary of the median, minimum and mean time per operation, in seconds, and the operations per repeat
+    """
+    timings = []
+    operations = 0
+    for _ in range(repeats):
+        elapsed, operations = case(aircraft, passengers)
+        timings.append(elapsed / operations)
+
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "mean": statistics.mean(timings),
+        "operations": operations
+    }
+
+
+def run_suite(aircraft, cases, repeats, seed):
+    """
+    Run the benchmark cases for each aircraft in a temporary data folder
+
+    :param aircraft: List of aircraft models
+    :param cases: List of case names
+    :param repeats: Number of times to run each case
+    :param seed: Seed for the passenger generator
+    :return: Dictionary of results, containing the run metadata and the results for each aircraft and case
+    """
+    passengers = create_test_passengers(max(AIRCRAFT[model].capacity for model in aircraft), seed)
+    results = {}
+    with temporary_data_folder():
+        for model in aircraft:
+            results[model] = {}
+            for name in cases:
+                results[model][name] = run_case(CASES[name], model, passengers, repeats)
+                print(f"{model.ljust(6)} {name.ljust(25)} : {results[model][name]['median'] * 1000000:12.2f} us")
+
+    return {
+        "metadata": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "seed": seed
+        },
+        "results": results
+    }
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Compare two sets of benchmark results
+
+    :param baseline: Baseline results, as returned by run_suite()
+    :param current: Current results, as returned by run_suite()
+    :param threshold: Proportional increase in the median time above which a case is flagged as slower e.g. 0.1
+    :return: List of (aircraft, case, baseline median, current median, ratio, is slower) tuples for the cases
+        present in both sets of results
+    """
+    comparison = []
+    for model, cases in current["results"].items():
+        for name, result in cases.items():
+            baseline_result = baseline["results"].get(model, {}).get(name)
+            if baseline_result is not None:
+                ratio = result["median"] / baseline_result["median"]
+                comparison.append((model, name, baseline_result["median"], result["median"], ratio,
+                                   ratio > 1 + threshold))
+    return comparison
+
+
+def run_command(args):
+    """
+    Run the benchmark suite and optionally write the results to a JSON file
+
+    :param args: Parsed command line arguments
+    :return: Exit status
+    """
+    results = run_suite(args.aircraft, args.cases, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, mode="wt", encoding="utf-8") as f:
+            json.dump(results, f, indent=3)
+    return 0
+
+
+def compare_command(args):
+    """
+    Compare two result files and report any cases that have slowed down
+
+    :param args: Parsed command line arguments
+    :return: Exit status, 1 if any case is slower than the threshold and 0 otherwise
+    """
+    with open(args.baseline, mode="rt", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, mode="rt", encoding="utf-8") as f:
+        current = json.load(f)
+
+    comparison = compare_results(baseline, current, args.threshold)
+    for model, name, baseline_median, current_median, ratio, is_slower in comparison:
+        print(f"{model.ljust(6)} {name.ljust(25)} : {baseline_median * 1000000:12.2f} us -> "
+              f"{current_median * 1000000:12.2f} us {ratio:6.2f}x{'  SLOWER' if is_slower else ''}")
+
+    slower = sum(1 for *_, is_slower in comparison if is_slower)
+    print(f"{slower} of {len(comparison)} cases slower by more than {args.threshold:.0%}")
+    return 1 if slower else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flight booking benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--aircraft", nargs="+", choices=list(AIRCRAFT), default=list(AIRCRAFT),
+                            help="Aircraft to benchmark")
+    run_parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Cases to run")
+    run_parser.add_argument("--repeats", type=int, default=5, help="Number of times to run each case")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed for the passenger generator")
+    run_parser.add_argument("--output", help="JSON file to write the results to")
+    run_parser.set_defaults(handler=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Baseline JSON result file")
+    compare_parser.add_argument("current", help="Current JSON result file")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Proportional slowdown above which a case is flagged e.g. 0.1 for 10%%")
+    compare_parser.set_defaults(handler=compare_command)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
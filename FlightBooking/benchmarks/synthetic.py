@@ -0,0 +1,133 @@
+"""
+This module contains helpers for creating synthetic data for the benchmarks: seating plans of a parameterised size,
+written to a temporary data folder, and flights using those plans.
+
+The preset aircraft range from a single-aisle A320 to a 550-seat A380. Each plan has a block of business class rows at
+the front, with fewer seats per row, followed by economy class rows and a final, partially filled, row if the economy
+seats don't fill a whole number of rows:
+
++----------+----------+-----------------------+----------------------+----------------------+
+| Aircraft | Capacity | Economy seats per row | Business class rows  | Business seats / row |
++----------+----------+-----------------------+----------------------+----------------------+
+| A320     | 180      | 6                     | 0                    | 0                    |
++----------+----------+-----------------------+----------------------+----------------------+
+| A321     | 220      | 6                     | 3                    | 4                    |
++----------+----------+-----------------------+----------------------+----------------------+
+| B787     | 300      | 9                     | 6                    | 6                    |
++----------+----------+-----------------------+----------------------+----------------------+
+| B777     | 400      | 10                    | 8                    | 6                    |
++----------+----------+-----------------------+----------------------+----------------------+
+| A380     | 550      | 10                    | 12                   | 6                    |
++----------+----------+-----------------------+----------------------+----------------------+
+"""
+
+import contextlib
+import datetime
+import os
+import shutil
+import string
+import tempfile
+from collections import namedtuple
+from src.flight_booking.flight import Flight
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV, get_data_folder, get_seating_file_path
+
+# Airline used for the synthetic seating plans and flights
+SYNTHETIC_AIRLINE = "Synthetic"
+
+AircraftSpecification = namedtuple("AircraftSpecification", ["capacity",
+                                                             "seats_per_row",
+                                                             "business_rows",
+                                                             "business_seats_per_row"])
+
+AIRCRAFT = {
+    "A320": AircraftSpecification(180, 6, 0, 0),
+    "A321": AircraftSpecification(220, 6, 3, 4),
+    "B787": AircraftSpecification(300, 9, 6, 6),
+    "B777": AircraftSpecification(400, 10, 8, 6),
+    "A380": AircraftSpecification(550, 10, 12, 6)
+}
+
+
+def write_synthetic_plan(aircraft, specification):
+    """
+    Write a synthetic seating plan file for the synthetic airline to the seating plans folder
+
+    :param aircraft: Aircraft model, used in the seating plan file name
+    :param specification: AircraftSpecification giving the size and layout of the plan
+    :raises ValueError: If the business class seats exceed the capacity
+    :return: Full path to the seating plan file
+    """
+    economy_seats = specification.capacity - specification.business_rows * specification.business_seats_per_row
+    if economy_seats < 0:
+        raise ValueError(f"The business class seats exceed the capacity of {specification.capacity}")
+
+    rows = [("Business", specification.business_seats_per_row)] * specification.business_rows
+    rows += [("Economy", specification.seats_per_row)] * (economy_seats // specification.seats_per_row)
+    if economy_seats % specification.seats_per_row:
+        rows.append(("Economy", economy_seats % specification.seats_per_row))
+
+    file_path = get_seating_file_path(SYNTHETIC_AIRLINE, aircraft)
+    with open(file_path, mode="wt", encoding="utf-8") as f:
+        f.write("Row,Class,Seats\n")
+        for row_number, (seat_class, seats) in enumerate(rows, start=1):
+            f.write(f"{row_number},{seat_class},{string.ascii_uppercase[:seats]}\n")
+
+    return file_path
+
+
+@contextlib.contextmanager
+def use_data_folder(data_folder):
+    """
+    Context manager that points the data folder at the specified folder, restoring the original data folder on exit
+
+    :param data_folder: Full path to the data folder
+    :return: Full path to the data folder
+    """
+    original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+    os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = data_folder
+    try:
+        yield data_folder
+    finally:
+        if original_data_folder is None:
+            del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+        else:
+            os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = original_data_folder
+
+
+@contextlib.contextmanager
+def temporary_data_folder(aircraft=None):
+    """
+    Context manager that points the data folder at a temporary folder containing a copy of the lookups and synthetic
+    seating plans for the preset aircraft, restoring the original data folder on exit
+
+    :param aircraft: Dictionary of aircraft model to AircraftSpecification or None for the preset aircraft
+    :return: Full path to the temporary data folder
+    """
+    lookups_folder = get_data_folder("lookups")
+    with tempfile.TemporaryDirectory() as data_folder, use_data_folder(data_folder):
+        shutil.copytree(lookups_folder, os.path.join(data_folder, "lookups"))
+        for model, specification in (AIRCRAFT if aircraft is None else aircraft).items():
+            write_synthetic_plan(model, specification)
+        yield data_folder
+
+
+def create_synthetic_flight(aircraft, number="SY0001", compact=False):
+    """
+    Create a flight for the synthetic airline and load its seating plan. The synthetic seating plans must have been
+    written to the data folder
+
+    :param aircraft: Aircraft model
+    :param number: Flight number
+    :param compact: If True, the seating plan is held as a CompactSeatingPlan
+    :return: An instance of the Flight class
+    """
+    flight = Flight(
+        airline=SYNTHETIC_AIRLINE,
+        number=number,
+        embarkation="LGW",
+        destination="RMU",
+        departs=datetime.datetime(2099, 11, 20, 10, 45, 0),
+        duration=datetime.timedelta(hours=2, minutes=35)
+    )
+    flight.load_seating(aircraft, None, compact=compact)
+    return flight
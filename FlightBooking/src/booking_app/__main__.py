@@ -1,2 +1,3 @@
+import sys
 from booking_app import main
-main()
+sys.exit(main())
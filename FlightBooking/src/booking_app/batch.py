@@ -0,0 +1,337 @@
+"""
+This module implements the non-interactive commands for the console booking application package. The commands perform
+the same operations as the interactive options but take their input from arguments rather than prompting for it, so
+they can be run from the command line or from batch files:
+
++-------------------+-------------------------------------------------------------------------------------------------+
+| create            | Create a flight, which becomes the current flight                                               |
++-------------------+-------------------------------------------------------------------------------------------------+
+| load              | Load a saved flight, which becomes the current flight                                           |
++-------------------+-------------------------------------------------------------------------------------------------+
+| seating           | Load a seating plan for the current flight                                                      |
++-------------------+-------------------------------------------------------------------------------------------------+
+| add-passenger     | Add a passenger to the current flight, optionally allocating a seat                             |
++-------------------+-------------------------------------------------------------------------------------------------+
+| import-passengers | Add the passengers in a CSV file to the current flight, optionally allocating seats             |
++-------------------+-------------------------------------------------------------------------------------------------+
+| allocate          | Allocate a seat to the passenger with a given passport number                                   |
++-------------------+-------------------------------------------------------------------------------------------------+
+| remove-passenger  | Remove the passenger with a given passport number                                               |
++-------------------+-------------------------------------------------------------------------------------------------+
+| list-passengers   | List the passengers on the current flight                                                       |
++-------------------+-------------------------------------------------------------------------------------------------+
+| list-allocations  | List the seat allocations for the current flight                                                |
++-------------------+-------------------------------------------------------------------------------------------------+
+| details           | Print the details of the current flight                                                         |
++-------------------+-------------------------------------------------------------------------------------------------+
+| boarding-cards    | Generate the boarding cards for the current flight                                              |
++-------------------+-------------------------------------------------------------------------------------------------+
+| save              | Save the current flight                                                                         |
++-------------------+-------------------------------------------------------------------------------------------------+
+
+A batch file contains one command per line, with arguments quoted as they would be in the shell. Blank lines and
+comments starting with "#" are ignored. A batch file can work with any number of flights, by creating or loading each
+one in turn:
+
+::
+
+    # Create a flight, add passengers and generate boarding cards
+    create LGW RMU EasyJet U28549 20/11/2026 10:45 1:00
+    seating A321 neo
+    add-passenger "Some Passenger" M 01/01/1970 UK UK 1234567 --seat 1A
+    import-passengers passengers.csv --allocate
+    boarding-cards 28A
+    save
+
+    load U28550 21/11/2026
+    ...
+
+Batch files are parsed in full before any commands are run, so a syntax error doesn't leave a batch partially
+applied. The commands are run in a single process, so seating plan templates and airport details loaded by one
+command are reused by the following commands. The time taken by each command is printed as it completes.
+
+The passenger CSV files have a header row containing the name, gender, dob, nationality, residency and
+passport_number columns, in any order, with other columns ignored. Dates of birth are in the format DD/MM/YYYY or
+YYYYMMDD, so files exported using PassengerStore.export_csv() can be imported.
+"""
+
+import argparse
+import csv
+import datetime
+import shlex
+import time
+from flight_booking import Flight, create_passenger
+from flight_booking.instrumentation import timer
+from flight_booking.profiling import OperationProfiler
+from .data_entry import parse_date, parse_departure_time, parse_duration
+from .exceptions import HANDLED_ERRORS
+from .option_callbacks import add_passenger, allocate_passenger_seat, remove_passenger_from_flight, \
+    generate_boarding_cards, list_passengers_on_flight, list_seat_allocations, list_flight_details, save_flight
+from .option_handler import print_profile_report
+
+# Columns that must be present in a passenger CSV file
+PASSENGER_COLUMNS = ("name", "gender", "dob", "nationality", "residency", "passport_number")
+
+
+class _BatchParser(argparse.ArgumentParser):
+    def error(self, message):
+        # The default implementation prints usage and exits, which would end the application on the first error in
+        # a batch file. Raising a ValueError allows the error to be reported with its location
+        raise ValueError(message)
+
+
+def _parse_dob(dob_string):
+    """
+    Parse a date of birth in the format DD/MM/YYYY or YYYYMMDD
+
+    :param dob_string: Date of birth string
+    :raises ValueError: If the string is not a valid date in either format
+    :return: The date as a date() object
+    """
+    if len(dob_string) == 8 and dob_string.isdigit():
+        return datetime.datetime.strptime(dob_string, "%Y%m%d").date()
+    return parse_date(dob_string)
+
+
+def _find_passenger(flight, passport_number):
+    """
+    Find a passenger on a flight by passport number
+
+    :param flight: Flight to search
+    :param passport_number: Passport number to find
+    :raises ValueError: If there is no passenger with the passport number
+    :return: The passenger
+    """
+    for passenger in flight.passengers.values():
+        if passenger["passport_number"] == passport_number:
+            return passenger
+    raise ValueError(f"There is no passenger with passport number {passport_number}")
+
+
+def _create_flight(_, arguments):
+    departs = datetime.datetime.combine(parse_date(arguments.departure_date),
+                                        parse_departure_time(arguments.departure_time))
+    return Flight(arguments.embarkation.upper(), arguments.destination.upper(), arguments.airline, arguments.number,
+                  departs, parse_duration(arguments.duration))
+
+
+def _load_flight(_, arguments):
+    return Flight.load_flight(arguments.number, parse_date(arguments.departure_date))
+
+
+def _load_seating(flight, arguments):
+    flight.load_seating(arguments.aircraft, arguments.layout)
+    print(f"Seating plan for {flight.aircraft} has been loaded")
+
+
+def _add_passenger(flight, arguments):
+    passenger = create_passenger(arguments.name, arguments.gender.upper(), _parse_dob(arguments.dob),
+                                 arguments.nationality, arguments.residency, arguments.passport_number)
+    add_passenger(flight, passenger, arguments.seat)
+
+
+def _import_passengers(flight, arguments):
+    with open(arguments.file, mode="rt", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in PASSENGER_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{arguments.file} is missing the columns {', '.join(missing)}")
+
+        count = 0
+        for row in reader:
+            passenger = create_passenger(row["name"], row["gender"].upper(), _parse_dob(row["dob"]),
+                                         row["nationality"], row["residency"], row["passport_number"])
+            flight.add_passenger(passenger)
+            if arguments.allocate:
+                flight.allocate_next_empty_seat(passenger["id"])
+            count += 1
+
+    print(f"{count} passengers have been added to the flight")
+
+
+def _allocate_seat(flight, arguments):
+    allocate_passenger_seat(flight, _find_passenger(flight, arguments.passport_number), arguments.seat)
+
+
+def _remove_passenger(flight, arguments):
+    remove_passenger_from_flight(flight, _find_passenger(flight, arguments.passport_number))
+
+
+def _print_boarding_cards(flight, arguments):
+    generate_boarding_cards(flight, arguments.gate, arguments.format, arguments.force)
+
+
+def add_command_parsers(subparsers):
+    """
+    Add a parser for each command to a set of argparse sub-parsers. The parsed arguments for a command include the
+    function that runs it and a flag indicating whether it requires a current flight
+
+    :param subparsers: Sub-parsers object returned by ArgumentParser.add_subparsers()
+    """
+    parser = subparsers.add_parser("create", help="Create a flight")
+    parser.add_argument("embarkation", help="Embarkation airport code")
+    parser.add_argument("destination", help="Destination airport code")
+    parser.add_argument("airline", help="Airline")
+    parser.add_argument("number", help="Flight number")
+    parser.add_argument("departure_date", help="Departure date DD/MM/YYYY")
+    parser.add_argument("departure_time", help="Departure time in 24-hour format HH:MM")
+    parser.add_argument("duration", help="Duration HH:MM")
+    parser.set_defaults(function=_create_flight, requires_flight=False)
+
+    parser = subparsers.add_parser("load", help="Load a saved flight")
+    parser.add_argument("number", help="Flight number")
+    parser.add_argument("departure_date", help="Departure date DD/MM/YYYY")
+    parser.set_defaults(function=_load_flight, requires_flight=False)
+
+    parser = subparsers.add_parser("seating", help="Load a seating plan for the current flight")
+    parser.add_argument("aircraft", help="Aircraft model")
+    parser.add_argument("layout", nargs="?", help="Optional seating layout")
+    parser.set_defaults(function=_load_seating, requires_flight=True)
+
+    parser = subparsers.add_parser("add-passenger", help="Add a passenger to the current flight")
+    parser.add_argument("name", help="Passenger name")
+    parser.add_argument("gender", help="Gender M/F")
+    parser.add_argument("dob", help="Date of birth DD/MM/YYYY")
+    parser.add_argument("nationality", help="Nationality")
+    parser.add_argument("residency", help="Residency")
+    parser.add_argument("passport_number", help="Passport number")
+    parser.add_argument("--seat", help="Seat to allocate to the passenger")
+    parser.set_defaults(function=_add_passenger, requires_flight=True)
+
+    parser = subparsers.add_parser("import-passengers", help="Add the passengers in a CSV file to the current flight")
+    parser.add_argument("file", help="Path to the CSV file")
+    parser.add_argument("--allocate", action="store_true", help="Allocate the next empty seat to each passenger")
+    parser.set_defaults(function=_import_passengers, requires_flight=True)
+
+    parser = subparsers.add_parser("allocate", help="Allocate a seat to a passenger on the current flight")
+    parser.add_argument("passport_number", help="Passport number of the passenger")
+    parser.add_argument("seat", help="Seat number")
+    parser.set_defaults(function=_allocate_seat, requires_flight=True)
+
+    parser = subparsers.add_parser("remove-passenger", help="Remove a passenger from the current flight")
+    parser.add_argument("passport_number", help="Passport number of the passenger")
+    parser.set_defaults(function=_remove_passenger, requires_flight=True)
+
+    parser = subparsers.add_parser("list-passengers", help="List the passengers on the current flight")
+    parser.set_defaults(function=lambda flight, _: list_passengers_on_flight(flight), requires_flight=True)
+
+    parser = subparsers.add_parser("list-allocations", help="List the seat allocations for the current flight")
+    parser.set_defaults(function=lambda flight, _: list_seat_allocations(flight), requires_flight=True)
+
+    parser = subparsers.add_parser("details", help="Print the details of the current flight")
+    parser.set_defaults(function=lambda flight, _: list_flight_details(flight), requires_flight=True)
+
+    parser = subparsers.add_parser("boarding-cards", help="Generate boarding cards for the current flight")
+    parser.add_argument("gate", help="Gate number")
+    parser.add_argument("--format", default="pdf", help="Boarding card format")
+    parser.add_argument("--force", action="store_true", help="Generate all cards, not just those that have changed")
+    parser.set_defaults(function=_print_boarding_cards, requires_flight=True)
+
+    parser = subparsers.add_parser("save", help="Save the current flight")
+    parser.set_defaults(function=lambda flight, _: save_flight(flight), requires_flight=True)
+
+
+def _create_batch_parser():
+    """
+    Create the parser for the commands in batch files
+
+    :return: Argument parser
+    """
+    parser = _BatchParser(prog="", add_help=False)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_command_parsers(subparsers)
+    return parser
+
+
+_batch_parser = None
+
+
+def parse_command(words):
+    """
+    Parse a command from a batch file
+
+    :param words: List of the command name and its arguments
+    :raises ValueError: If the command isn't recognised or its arguments are invalid
+    :return: Parsed arguments
+    """
+    global _batch_parser
+    if _batch_parser is None:
+        _batch_parser = _create_batch_parser()
+    return _batch_parser.parse_args(words)
+
+
+def parse_batch_file(file_path):
+    """
+    Read and parse the commands in a batch file
+
+    :param file_path: Path to the batch file
+    :raises ValueError: If any line can't be parsed, with the file and line number in the message
+    :raises FileNotFoundError: If the batch file doesn't exist
+    :return: List of tuples of a description of each command, including its location, and its parsed arguments
+    """
+    commands = []
+    with open(file_path, mode="rt", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                words = shlex.split(line, comments=True)
+                if words:
+                    commands.append((f"{file_path}:{line_number} {shlex.join(words)}", parse_command(words)))
+            except ValueError as e:
+                raise ValueError(f"{file_path}:{line_number}: {e}") from e
+
+    return commands
+
+
+def run_command(arguments, flight, profile=False):
+    """
+    Run a single parsed command
+
+    :param arguments: Parsed arguments for the command
+    :param flight: Current flight or None
+    :param profile: If True, profile the command and print a summary of the hotspots
+    :raises ValueError: If the command requires a flight and there is no current flight
+    :return: Either a new flight or the current flight
+    """
+    if arguments.requires_flight and flight is None:
+        raise ValueError(f"'{arguments.command}' requires a valid flight")
+
+    with timer(f"booking_app.{arguments.command}"):
+        if not profile:
+            result = arguments.function(flight, arguments)
+        else:
+            profiler = OperationProfiler(arguments.command)
+            try:
+                with profiler:
+                    result = arguments.function(flight, arguments)
+            finally:
+                if profiler.report:
+                    print_profile_report(profiler.report)
+
+    # As with the interactive options, compare the type name as isinstance() fails in the context of the unit tests
+    return result if type(result).__name__ == "Flight" else flight
+
+
+def run_commands(commands, flight=None, keep_going=False, profile=False):
+    """
+    Run a sequence of parsed commands, printing the time taken by each one
+
+    :param commands: Iterable of tuples of a description of each command and its parsed arguments
+    :param flight: Initial current flight or None
+    :param keep_going: If True, continue with the remaining commands when a command fails
+    :param profile: If True, profile each command and print a summary of the hotspots
+    :return: Tuple of the current flight after the last command and the number of commands that failed
+    """
+    failures = 0
+    for description, arguments in commands:
+        start = time.perf_counter()
+        try:
+            flight = run_command(arguments, flight, profile)
+        except HANDLED_ERRORS as e:
+            failures += 1
+            print(f"{description} failed: {e}")
+            if not keep_going:
+                break
+        else:
+            print(f"{description} completed in {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    return flight, failures
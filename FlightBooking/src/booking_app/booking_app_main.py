@@ -2,16 +2,15 @@
 This module defines the main entry point for the console booking application package
 """
 
+import argparse
+import time
 from .option_handler import validate_all_options, display_options, input_option, call_option_function
 from .option_callbacks import *
 from .data_entry import input_flight, input_aircraft_seating_plan
-from flight_booking import InsufficientCapacityError, \
-    FlightIsFullError, \
-    DuplicatePassportNumberError, \
-    InvalidOperationError, \
-    SeatingPlanNotFoundError, \
-    MissingBoardingCardPluginError, \
-    AirportCodeNotFoundError
+from .batch import add_command_parsers, parse_batch_file, parse_command, run_commands
+from .exceptions import HANDLED_ERRORS
+from flight_booking.instrumentation import add_sink, remove_sink, HistogramSink
+from flight_booking.profiling import is_profiling_requested, PROFILE_ENV
 
 # The available options are represented as a dictionary in which the key is the input
 # the user must provide to select the option and the value is a dictionary with a
@@ -31,10 +30,88 @@ options_map = {
 }
 
 
-def main():
+def parse_arguments(argv=None):
     """
-    Main loop for the console-based flight booking application
+    Parse the command line arguments for the console application
+
+    :param argv: List of arguments or None to use the arguments passed to the application
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="booking_app",
+                                     description="Console-based flight booking application. Without a command, the "
+                                                 "interactive application is started")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each selected option or command, writing the output to the profiles folder "
+                             f"under the data folder. Profiling can also be enabled by setting {PROFILE_ENV}=1")
+    parser.add_argument("--flight", nargs=2, metavar=("NUMBER", "DEPARTURE_DATE"),
+                        help="Load a saved flight before running the command")
+    parser.add_argument("--save", action="store_true", help="Save the current flight after running the command")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print a summary of the time spent in each command and flight booking operation")
+
+    subparsers = parser.add_subparsers(dest="command", title="commands")
+    run_parser = subparsers.add_parser("run", help="Run the commands in one or more batch files")
+    run_parser.add_argument("batch_files", nargs="+", metavar="BATCH_FILE", help="Path to a batch file")
+    run_parser.add_argument("--keep-going", action="store_true",
+                            help="Continue with the remaining commands when a command fails")
+    add_command_parsers(subparsers)
+
+    return parser.parse_args(argv)
+
+
+def run_from_arguments(arguments, profile=False):
     """
+    Run the command or batch files specified on the command line
+
+    :param arguments: Parsed command line arguments
+    :param profile: If True, profile each command and print a summary of the hotspots
+    :return: Exit code, 0 if all the commands succeeded or 1 if any failed
+    """
+    try:
+        commands = [] if arguments.flight is None else [("load", parse_command(["load"] + arguments.flight))]
+        if arguments.command == "run":
+            for file_path in arguments.batch_files:
+                commands.extend(parse_batch_file(file_path))
+        else:
+            commands.append((arguments.command, arguments))
+        if arguments.save:
+            commands.append(("save", parse_command(["save"])))
+    except HANDLED_ERRORS as e:
+        print(e)
+        return 1
+
+    sink = HistogramSink() if arguments.timings else None
+    if sink:
+        add_sink(sink)
+
+    try:
+        start = time.perf_counter()
+        _, failures = run_commands(commands, keep_going=getattr(arguments, "keep_going", False), profile=profile)
+        print(f"{len(commands)} commands run in {(time.perf_counter() - start) * 1000:.3f} ms, {failures} failed")
+    finally:
+        if sink:
+            remove_sink(sink)
+
+    if sink:
+        print()
+        print(sink.report())
+
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    """
+    Entry point for the console-based flight booking application. If a command or batch files are specified on the
+    command line, they're run and the application exits. Otherwise, the interactive main loop is started
+
+    :param argv: List of command line arguments or None to use the arguments passed to the application
+    :return: Exit code
+    """
+    arguments = parse_arguments(argv)
+    profile = arguments.profile or is_profiling_requested()
+    if arguments.command is not None:
+        return run_from_arguments(arguments, profile)
+
     validate_all_options(options_map)
 
     flight = None
@@ -57,15 +134,8 @@ def main():
             else:
                 try:
                     print()
-                    flight = call_option_function(selected, flight)
-                except (ValueError,
-                        FileNotFoundError,
-                        InsufficientCapacityError,
-                        FlightIsFullError,
-                        DuplicatePassportNumberError,
-                        InvalidOperationError,
-                        SeatingPlanNotFoundError,
-                        MissingBoardingCardPluginError,
-                        AirportCodeNotFoundError
-                        ) as e:
+                    flight = call_option_function(selected, flight, profile)
+                except HANDLED_ERRORS as e:
                     print(e)
+
+    return 0
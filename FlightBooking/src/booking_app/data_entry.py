@@ -59,6 +59,19 @@ def input_date(date_type, minimum=None, maximum=None):
     if len(date_string) == 0:
         return None
 
+    return parse_date(date_string, minimum, maximum)
+
+
+def parse_date(date_string, minimum=None, maximum=None):
+    """
+    Parse a date in the format DD/MM/YYYY and optionally check it conforms to the specified minimum and maximum values
+
+    :param date_string: Date string
+    :param minimum: Minimum acceptable date or None if there is no minimum
+    :param maximum: Maximum acceptable date or None if there is no maximum
+    :raises ValueError: If the string is not a valid date in the specified format or the date is out of range
+    :return: The date as a date() object
+    """
     try:
         d = datetime.datetime.strptime(date_string, "%d/%m/%Y").date()
     except ValueError as e:
@@ -120,6 +133,17 @@ def input_departure_time():
     if len(departure_time_string) == 0:
         return None
 
+    return parse_departure_time(departure_time_string)
+
+
+def parse_departure_time(departure_time_string):
+    """
+    Parse a departure time in the 24-hour format HH:MM
+
+    :param departure_time_string: Departure time string
+    :raises ValueError: If the string is not a valid time
+    :return: The departure time as a time() object
+    """
     try:
         departure_time = datetime.datetime.strptime(departure_time_string, "%H:%M").time()
     except ValueError as e:
@@ -140,6 +164,17 @@ def input_duration():
     if len(duration_string) == 0:
         return None
 
+    return parse_duration(duration_string)
+
+
+def parse_duration(duration_string):
+    """
+    Parse a flight duration expressed as HH:MM, where the hours are >= 0 and the minutes are between 0 and 59
+
+    :param duration_string: Duration string
+    :raises ValueError: If the string is malformed or its components do not result in a valid flight time
+    :return: The flight duration as a timedelta() object
+    """
     words = duration_string.split(sep=":")
     if len(words) != 2:
         raise ValueError(f"{duration_string} is not a valid duration")
@@ -2,8 +2,26 @@
 This module defines custom exceptions used by the console booking application package
 """
 
-from flight_booking import SeatingPlanNotFoundError
+from flight_booking import InsufficientCapacityError, \
+    FlightIsFullError, \
+    DuplicatePassportNumberError, \
+    InvalidOperationError, \
+    SeatingPlanNotFoundError, \
+    MissingBoardingCardPluginError, \
+    AirportCodeNotFoundError
 
 
 class InvalidAircraftSeatingPlanError(SeatingPlanNotFoundError):
     pass
+
+
+# Exceptions raised by the booking operations that are reported to the user rather than ending the application
+HANDLED_ERRORS = (ValueError,
+                  FileNotFoundError,
+                  InsufficientCapacityError,
+                  FlightIsFullError,
+                  DuplicatePassportNumberError,
+                  InvalidOperationError,
+                  SeatingPlanNotFoundError,
+                  MissingBoardingCardPluginError,
+                  AirportCodeNotFoundError)
@@ -1,21 +1,75 @@
 """
-This module contains callback methods for handling the options selected in the console booking application
+This module contains callback methods for handling the options selected in the console booking application.
+
+The callbacks prompt for their input and then call the operations that add, allocate seats to and remove passengers
+and generate boarding cards, which take their input as arguments. The non-interactive commands in the batch module
+call the same operations, so both front ends behave in the same way.
 """
 
 from .data_entry import input_passenger, trimmed_input, input_future_date, select_passenger, list_passengers
 from flight_booking import Flight
 
 
+def add_passenger(flight, passenger, seat_number=None):
+    """
+    Add a passenger to a flight, optionally allocating them a seat
+
+    :param flight: Flight to add the passenger to
+    :param passenger: The passenger, created using create_passenger()
+    :param seat_number: Seat number to allocate to the passenger or None
+    """
+    flight.add_passenger(passenger)
+    print(f"Passenger {passenger['name']} has been added to the flight")
+
+    if seat_number:
+        allocate_passenger_seat(flight, passenger, seat_number)
+
+
+def allocate_passenger_seat(flight, passenger, seat_number):
+    """
+    Allocate a seat to a passenger on a flight
+
+    :param flight: Flight on which to perform the allocation
+    :param passenger: The passenger
+    :param seat_number: Seat number to allocate
+    """
+    flight.allocate_seat(seat_number, passenger["id"])
+    print(f"Seat {seat_number} has been allocated to {passenger['name']}")
+
+
+def remove_passenger_from_flight(flight, passenger):
+    """
+    Remove a passenger from a flight
+
+    :param flight: Flight to remove the passenger from
+    :param passenger: The passenger
+    """
+    flight.remove_passenger(passenger["id"])
+    print(f"Passenger {passenger['name']} has been removed")
+
+
+def generate_boarding_cards(flight, gate, card_format="pdf", force=False):
+    """
+    Generate the boarding cards for a flight
+
+    :param flight: Flight to generate boarding cards for
+    :param gate: Gate number
+    :param card_format: Boarding card format
+    :param force: If True, all cards are generated, not just those that have changed
+    """
+    flight.generate_boarding_cards(card_format, gate, force)
+    print(f"Boarding cards have been generated for gate {gate}")
+
+
 def add_passenger_to_flight(flight):
     """
-    Prompt for a new passenger, add them to the specified flight and allocate the next available seat
+    Prompt for a new passenger and add them to the specified flight
 
     :param flight: Flight to add the passenger to
     """
     passenger = input_passenger()
     if passenger:
-        flight.add_passenger(passenger)
-        print(f"Passenger {passenger['name']} has been added to the flight")
+        add_passenger(flight, passenger)
 
 
 def list_passengers_on_flight(flight):
@@ -102,8 +156,7 @@ def allocate_seat(flight):
     if passenger is not None:
         seat_number = trimmed_input("Seat number [ENTER to quit] ")
         if seat_number:
-            flight.allocate_seat(seat_number, passenger["id"])
-            print(f"Seat {seat_number} has been allocated to {passenger['name']}")
+            allocate_passenger_seat(flight, passenger, seat_number)
 
 
 def remove_passenger(flight):
@@ -114,8 +167,7 @@ def remove_passenger(flight):
     """
     passenger = select_passenger(flight.passengers)
     if passenger is not None:
-        flight.remove_passenger(passenger["id"])
-        print(f"Passenger {passenger['name']} has been removed")
+        remove_passenger_from_flight(flight, passenger)
 
 
 def print_boarding_cards(flight):
@@ -126,5 +178,4 @@ def print_boarding_cards(flight):
     """
     gate = trimmed_input("Gate number [ENTER to quit] ")
     if gate:
-        flight.generate_boarding_cards("pdf", gate)
-        print(f"Boarding cards have been generated for gate {gate}")
+        generate_boarding_cards(flight, gate)
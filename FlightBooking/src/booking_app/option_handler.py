@@ -6,6 +6,7 @@ and invoking the handler for the selected option
 import inspect
 from .data_entry import trimmed_input
 from flight_booking.flight import Flight
+from flight_booking.profiling import OperationProfiler, format_hotspots
 
 
 def validate_option_definition(definition):
@@ -66,7 +67,43 @@ def input_option(options_map):
     return options_map[selection]
 
 
-def call_option_function(option, flight):
+def print_profile_report(report):
+    """
+    Print the location of the profile output and the hotspots for a profiled option
+
+    :param report: Profiling report, as returned by OperationProfiler
+    """
+    print()
+    print(f"Profile written to {report['pstats']}")
+    print(f"Collapsed stacks written to {report['collapsed']}")
+    print()
+    print(format_hotspots(report["hotspots"]))
+
+
+def call_option_function(option, flight, profile=False):
+    """
+    Call the function associated with the specified option
+
+    :param option: Option definiton (dictionary)
+    :param flight: Current flight object
+    :param profile: If True, profile the function and print a summary of the hotspots
+    :raises ValueError: If the callback function requires a flight object and the passed instance is None
+    :return: Either a new flight or the current flight object
+    """
+    if not profile:
+        return _call_option_function(option, flight)
+
+    # The report is printed even if the option fails, as profiling failing operations is often the point
+    profiler = OperationProfiler(option["description"])
+    try:
+        with profiler:
+            return _call_option_function(option, flight)
+    finally:
+        if profiler.report:
+            print_profile_report(profiler.report)
+
+
+def _call_option_function(option, flight):
     """
     Call the function associated with the specified option
 
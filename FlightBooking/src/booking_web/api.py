@@ -0,0 +1,627 @@
+"""
+This module implements a JSON API for the Flight Booking Web Application, as a Flask blueprint registered under /api.
+Flights are identified by flight number and departure date, in the format YYYY-MM-DD, as used in the names of the
+flight data files:
+
++--------+------------------------------------------------+----------------------------------------------------------+
+| POST   | /api/flights                                   | Create and save a flight                                 |
++--------+------------------------------------------------+----------------------------------------------------------+
+| GET    | /api/flights/<number>/<date>                   | Return the flight details                                |
++--------+------------------------------------------------+----------------------------------------------------------+
+| PUT    | /api/flights/<number>/<date>/seating           | Load a seating plan, given the aircraft and layout       |
++--------+------------------------------------------------+----------------------------------------------------------+
+| GET    | /api/flights/<number>/<date>/passengers        | Return the passengers, including their seat numbers      |
++--------+------------------------------------------------+----------------------------------------------------------+
+| POST   | /api/flights/<number>/<date>/passengers        | Add one passenger or a list of passengers                |
++--------+------------------------------------------------+----------------------------------------------------------+
+| DELETE | /api/flights/<number>/<date>/passengers/<id>   | Remove a passenger                                       |
++--------+------------------------------------------------+----------------------------------------------------------+
+| GET    | /api/flights/<number>/<date>/seats             | Return the seat allocations                              |
++--------+------------------------------------------------+----------------------------------------------------------+
+| GET    | /api/flights/<number>/<date>/seat_map          | Return the seat map as an SVG image                      |
++--------+------------------------------------------------+----------------------------------------------------------+
+| POST   | /api/flights/<number>/<date>/seats             | Allocate one seat or a list of seats                     |
++--------+------------------------------------------------+----------------------------------------------------------+
+| DELETE | /api/flights/<number>/<date>/seats/<id>        | Clear a passenger's seat allocation                      |
++--------+------------------------------------------------+----------------------------------------------------------+
+| POST   | /api/flights/<number>/<date>/boarding_cards    | Generate boarding cards, given the gate and format       |
++--------+------------------------------------------------+----------------------------------------------------------+
+
+Flights are loaded from their data files through the flight cache shared with the web pages, and every successful
+change is saved to the data file. If the flight has been loaded by the web pages, the API works with the same instance,
+so changes made through one aren't overwritten by the other. If that instance has changes made through the web pages
+that haven't been saved yet, the read endpoints return the flight as it is in its data file and the endpoints that
+change the flight return a 409 response rather than saving the unsaved changes along with their own.
+
+The passenger and seat endpoints accept a batch, as a list of up to MAX_BATCH_SIZE items, as well as a single item.
+A batch is applied in full or not at all: if any item fails, the changes made by the earlier items are reversed and
+the error is returned with the index of the failing item. Each passenger has the name, gender, dob (YYYY-MM-DD),
+nationality, residency and passport_number properties and may include a seat_number or "allocate": true to allocate
+the next empty seat. Each seat allocation has the passenger_id and, optionally, the seat_number. If the seat number
+is omitted, the next empty seat is allocated.
+
+The read endpoints return an ETag derived from the flight's version number. A request whose If-None-Match header
+matches the current ETag receives a 304 response without the response body being built, so polling is cheap.
+
+Invalid requests and operations that can't be carried out are returned as JSON objects with an "error" property and a
+4xx status code. Any other exception is unexpected and results in a 500 response.
+"""
+
+import datetime
+import os
+import uuid
+from contextlib import contextmanager
+from flask import Blueprint, Response, jsonify, request, url_for
+from flight_booking import Flight, create_passenger, InsufficientCapacityError, FlightIsFullError, \
+    DuplicatePassportNumberError, InvalidOperationError, SeatingPlanNotFoundError, MissingBoardingCardPluginError, \
+    AirportCodeNotFoundError
+from flight_booking.utils import get_flight_file_path
+from .model import flight_cache, PassengerSeatView
+from .seat_map import get_seat_map
+
+# Maximum number of items in a batch of passengers or seat allocations
+MAX_BATCH_SIZE = 1000
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+# ETags include a token that's unique to this process, as version numbers restart when the application is restarted
+_etag_prefix = uuid.uuid4().hex[:8]
+
+# Status codes for the flight_booking exceptions that report a request that can't be carried out. Any other exception
+# is unexpected and results in a 500 response
+_error_status_codes = [
+    (SeatingPlanNotFoundError, 404),
+    (DuplicatePassportNumberError, 409),
+    (FlightIsFullError, 409),
+    (InsufficientCapacityError, 409),
+    (InvalidOperationError, 409),
+    (AirportCodeNotFoundError, 400),
+    (MissingBoardingCardPluginError, 400)
+]
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        """
+        Exception raised when a request is invalid or refers to a flight or passenger that doesn't exist
+
+        :param message: Error message returned to the client
+        :param status: HTTP status code
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class BatchItemError(Exception):
+    def __init__(self, index, error):
+        """
+        Exception raised when an item in a batch fails, after the changes made by the batch have been reversed
+
+        :param index: Index of the failing item in the batch
+        :param error: The exception raised by the item
+        """
+        super().__init__(str(error))
+        self.index = index
+        self.error = error
+
+
+def _get_status_code(error):
+    """
+    Return the HTTP status code for an invalid request or an exception raised by a flight booking operation
+
+    :param error: The exception
+    :return: HTTP status code or None if the exception is unexpected
+    """
+    if isinstance(error, ApiError):
+        return error.status
+    return next((status for error_type, status in _error_status_codes if isinstance(error, error_type)), None)
+
+
+@api.errorhandler(BatchItemError)
+def handle_batch_item_error(e):
+    return jsonify(error=str(e), index=e.index), _get_status_code(e.error)
+
+
+def handle_error(e):
+    return jsonify(error=str(e)), _get_status_code(e)
+
+
+api.register_error_handler(ApiError, handle_error)
+for _error_type, _ in _error_status_codes:
+    api.register_error_handler(_error_type, handle_error)
+
+
+@contextmanager
+def _invalid_input_is_bad_request():
+    """
+    Context manager that converts the ValueError raised by a flight_booking operation that's been given invalid
+    input, such as a passenger's details or a seat number, into a 400 response. It's used only around the operations
+    that validate their input, so a ValueError raised anywhere else is treated as unexpected
+    """
+    try:
+        yield
+    except ValueError as e:
+        raise ApiError(str(e)) from e
+
+
+def _get_json_body():
+    """
+    Return the JSON body of the request
+
+    :raises ApiError: If the body isn't valid JSON
+    :return: The decoded body
+    """
+    body = request.get_json(silent=True)
+    if body is None:
+        raise ApiError("The request body must be a JSON object or list")
+    return body
+
+
+def _get_json_object():
+    """
+    Return the JSON body of the request, which must be an object
+
+    :raises ApiError: If the body isn't a JSON object
+    :return: Dictionary of properties
+    """
+    body = _get_json_body()
+    if not isinstance(body, dict):
+        raise ApiError("The request body must be a JSON object")
+    return body
+
+
+def _get_batch():
+    """
+    Return the JSON body of the request as a batch of items
+
+    :raises ApiError: If the body isn't a JSON object or list of objects or the batch is too large
+    :return: List of items
+    """
+    body = _get_json_body()
+    items = body if isinstance(body, list) else [body]
+    if not items or len(items) > MAX_BATCH_SIZE:
+        raise ApiError(f"A batch must contain between 1 and {MAX_BATCH_SIZE} items")
+    if not all(isinstance(item, dict) for item in items):
+        raise ApiError("Each item in a batch must be a JSON object")
+    return items
+
+
+def _get_property(properties, name, required=True, default=None):
+    """
+    Return a string property from a JSON object in the request
+
+    :param properties: Dictionary of properties
+    :param name: Property name
+    :param required: If True, the property must be present and not blank
+    :param default: Value returned if the property is optional and hasn't been given
+    :raises ApiError: If a required property is missing or the property isn't a string
+    :return: The property value
+    """
+    value = properties.get(name)
+    if value is None or value == "":
+        if required:
+            raise ApiError(f"Missing property {name}")
+        return default
+    if not isinstance(value, str):
+        raise ApiError(f"Property {name} must be a string")
+    return value
+
+
+def _get_flag(properties, name):
+    """
+    Return an optional boolean property from a JSON object in the request
+
+    :param properties: Dictionary of properties
+    :param name: Property name
+    :raises ApiError: If the property isn't a boolean
+    :return: The property value or False if it hasn't been given
+    """
+    value = properties.get(name, False)
+    if not isinstance(value, bool):
+        raise ApiError(f"Property {name} must be true or false")
+    return value
+
+
+def _parse_date(date_string):
+    """
+    Parse a date in the format YYYY-MM-DD
+
+    :param date_string: Date string
+    :raises ApiError: If the string is not a valid date
+    :return: The date as a date() object
+    """
+    try:
+        return datetime.date.fromisoformat(date_string)
+    except ValueError as e:
+        raise ApiError(f"{date_string} is not a valid date in the format YYYY-MM-DD") from e
+
+
+def _parse_duration(duration_string):
+    """
+    Parse a flight duration in the format HH:MM
+
+    :param duration_string: Duration string
+    :raises ApiError: If the string is not a valid duration
+    :return: The duration as a timedelta() object
+    """
+    try:
+        hours, minutes = [int(word) for word in duration_string.split(":")]
+    except ValueError as e:
+        raise ApiError(f"{duration_string} is not a valid duration in the format HH:MM") from e
+
+    if hours < 0 or minutes < 0 or minutes > 59 or hours + minutes == 0:
+        raise ApiError(f"{duration_string} is not a valid duration in the format HH:MM")
+
+    return datetime.timedelta(hours=hours, minutes=minutes)
+
+
+def _get_flight(number, departure_date, for_update=False):
+    """
+    Return the flight with the specified number and departure date from the shared flight cache, which loads it again
+    if its data file has changed. If the cached flight has unsaved changes made through the web pages, a copy loaded
+    from the data file is returned for reading and updates are refused
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :param for_update: True if the flight is to be changed and saved
+    :raises ApiError: If the departure date is invalid, there's no data file for the flight or the flight is to be
+        updated and has unsaved changes
+    :return: The flight
+    """
+    departs = _parse_date(departure_date)
+    try:
+        flight = flight_cache.get(number, departs)
+        if not flight_cache.has_unsaved_changes(flight):
+            return flight
+        if for_update:
+            raise ApiError(f"Flight {number} on {departure_date} has unsaved changes in the web application", 409)
+        return Flight.load_flight(number, departs)
+    except FileNotFoundError as e:
+        raise ApiError(f"Flight {number} on {departure_date} not found", 404) from e
+
+
+def _check_passenger(flight, passenger_id):
+    """
+    Check a passenger is on a flight
+
+    :param flight: The flight
+    :param passenger_id: Unique identifier for the passenger
+    :raises ApiError: If the passenger isn't on the flight
+    """
+    if not isinstance(passenger_id, str) or passenger_id not in flight.passengers:
+        raise ApiError(f"Passenger {passenger_id} is not on this flight", 404)
+
+
+def _get_etag(flight):
+    """
+    Return the entity tag for the current version of a flight
+
+    :param flight: The flight
+    :return: Entity tag, without quotes
+    """
+    return f"{_etag_prefix}-{flight.version}"
+
+
+def _conditional_response(flight, build, mimetype=None):
+    """
+    Return a response for a read endpoint, with an ETag for the current version of the flight. If the request's
+    If-None-Match header matches, a 304 response is returned without building the body
+
+    :param flight: The flight
+    :param build: Function returning the body. If no MIME type is given, it should return a JSON-serialisable body
+    :param mimetype: MIME type of the body or None for a JSON body
+    :return: Response object
+    """
+    etag = _get_etag(flight)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    elif mimetype is None:
+        response = jsonify(build())
+    else:
+        response = Response(build(), mimetype=mimetype)
+    response.set_etag(etag)
+    return response
+
+
+def _flight_to_dict(flight):
+    """
+    Return the JSON representation of a flight
+
+    :param flight: The flight
+    :return: Dictionary of flight properties
+    """
+    hours, minutes = flight.duration
+    return {
+        "number": flight.number,
+        "departure_date": flight.departure_date.isoformat(),
+        "airline": flight.airline,
+        "embarkation": flight.embarkation_airport_code,
+        "destination": flight.destination_airport_code,
+        "departs": flight.departs_localtime.strftime("%Y-%m-%dT%H:%M"),
+        "duration": f"{hours}:{minutes:02d}",
+        "aircraft": flight.aircraft,
+        "layout": flight.layout,
+        "capacity": flight.capacity,
+        "available_capacity": flight.available_capacity,
+        "passengers": len(flight.passengers),
+        "version": flight.version
+    }
+
+
+def _get_seat_numbers(flight):
+    """
+    Return a mapping of passenger ID to seat number for the passengers with seats
+
+    :param flight: The flight
+    :return: Dictionary of seat numbers keyed by passenger ID
+    """
+    return {passenger["id"]: seat_number for seat_number, passenger in flight.get_all_seat_allocations() or []}
+
+
+def _passengers_to_list(flight, passenger_ids=None):
+    """
+    Return the JSON representation of passengers on a flight
+
+    :param flight: The flight
+    :param passenger_ids: IDs of the passengers to include, or None for all passengers
+    :return: List of dictionaries of passenger properties, including the passenger and seat numbers
+    """
+    seats = _get_seat_numbers(flight)
+    wanted = None if passenger_ids is None else set(passenger_ids)
+    return [
+        PassengerSeatView(flight.passengers[passenger_id], number, seats.get(passenger_id)).to_dict()
+        for number, passenger_id in enumerate(flight.passengers, 1)
+        if wanted is None or passenger_id in wanted
+    ]
+
+
+@api.route("/flights", methods=["POST"])
+def create_flight():
+    """
+    Create a flight, load its seating plan if an aircraft is given and save it
+
+    :return: JSON response containing the flight, with status 201
+    """
+    properties = _get_json_object()
+    departs_string = _get_property(properties, "departs")
+    try:
+        departs = datetime.datetime.strptime(departs_string, "%Y-%m-%dT%H:%M")
+    except ValueError as e:
+        raise ApiError(f"{departs_string} is not a valid departure time in the format YYYY-MM-DDTHH:MM") from e
+
+    flight = Flight(_get_property(properties, "embarkation").upper(),
+                    _get_property(properties, "destination").upper(),
+                    _get_property(properties, "airline"),
+                    _get_property(properties, "number"),
+                    departs,
+                    _parse_duration(_get_property(properties, "duration")))
+
+    key = (flight.number, flight.departure_date)
+    if os.path.exists(get_flight_file_path(*key)):
+        return jsonify(error=f"Flight {flight.number} on {flight.departure_date.isoformat()} already exists"), 409
+
+    aircraft = _get_property(properties, "aircraft", required=False)
+    if aircraft:
+        flight.load_seating(aircraft, _get_property(properties, "layout", required=False))
+
+    flight_cache.save(flight)
+
+    response = jsonify(_flight_to_dict(flight))
+    response.status_code = 201
+    response.headers["Location"] = url_for("api.get_flight", number=flight.number,
+                                           departure_date=flight.departure_date.isoformat())
+    return response
+
+
+@api.route("/flights/<number>/<departure_date>")
+def get_flight(number, departure_date):
+    """
+    Return the details of a flight
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing the flight or a 304 response if it hasn't changed
+    """
+    flight = _get_flight(number, departure_date)
+    return _conditional_response(flight, lambda: _flight_to_dict(flight))
+
+
+@api.route("/flights/<number>/<departure_date>/seating", methods=["PUT"])
+def load_seating(number, departure_date):
+    """
+    Load a seating plan for a flight, migrating any existing seat allocations
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing the flight
+    """
+    flight = _get_flight(number, departure_date, for_update=True)
+    properties = _get_json_object()
+    flight.load_seating(_get_property(properties, "aircraft"), _get_property(properties, "layout", required=False))
+    flight_cache.save(flight)
+    return jsonify(_flight_to_dict(flight))
+
+
+@api.route("/flights/<number>/<departure_date>/passengers")
+def get_passengers(number, departure_date):
+    """
+    Return the passengers on a flight
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing the passengers or a 304 response if the flight hasn't changed
+    """
+    flight = _get_flight(number, departure_date)
+    return _conditional_response(flight, lambda: _passengers_to_list(flight))
+
+
+@api.route("/flights/<number>/<departure_date>/passengers", methods=["POST"])
+def add_passengers(number, departure_date):
+    """
+    Add a passenger or a batch of passengers to a flight, allocating seats to those that request them
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing the added passengers, with status 201
+    """
+    flight = _get_flight(number, departure_date, for_update=True)
+    items = _get_batch()
+
+    added = []
+    for index, item in enumerate(items):
+        try:
+            seat_number = _get_property(item, "seat_number", required=False)
+            allocate = _get_flag(item, "allocate")
+            with _invalid_input_is_bad_request():
+                passenger = create_passenger(_get_property(item, "name"),
+                                             _get_property(item, "gender"),
+                                             _parse_date(_get_property(item, "dob")),
+                                             _get_property(item, "nationality"),
+                                             _get_property(item, "residency"),
+                                             _get_property(item, "passport_number"))
+            flight.add_passenger(passenger)
+            added.append(passenger["id"])
+            if seat_number:
+                with _invalid_input_is_bad_request():
+                    flight.allocate_seat(seat_number, passenger["id"])
+            elif allocate:
+                flight.allocate_next_empty_seat(passenger["id"])
+        except Exception as e:
+            # Removing the passengers also clears the seats allocated to them
+            for passenger_id in reversed(added):
+                flight.remove_passenger(passenger_id)
+            flight_cache.mark_saved(flight)
+            if _get_status_code(e) is None:
+                raise
+            raise BatchItemError(index, e) from e
+
+    flight_cache.save(flight)
+    response = jsonify(_passengers_to_list(flight, added))
+    response.status_code = 201
+    return response
+
+
+@api.route("/flights/<number>/<departure_date>/passengers/<passenger_id>", methods=["DELETE"])
+def remove_passenger(number, departure_date, passenger_id):
+    """
+    Remove a passenger from a flight
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :param passenger_id: Unique identifier for the passenger
+    :return: Empty response with status 204
+    """
+    flight = _get_flight(number, departure_date, for_update=True)
+    _check_passenger(flight, passenger_id)
+    flight.remove_passenger(passenger_id)
+    flight_cache.save(flight)
+    return Response(status=204)
+
+
+@api.route("/flights/<number>/<departure_date>/seats")
+def get_seat_allocations(number, departure_date):
+    """
+    Return the seat allocations for a flight
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing a list of seat allocations or a 304 response if the flight hasn't changed
+    """
+    flight = _get_flight(number, departure_date)
+    return _conditional_response(flight, lambda: [
+        {"seat_number": seat_number, "passenger_id": passenger["id"]}
+        for seat_number, passenger in flight.get_all_seat_allocations() or []
+    ])
+
+
+@api.route("/flights/<number>/<departure_date>/seat_map")
+def get_flight_seat_map(number, departure_date):
+    """
+    Return the seat map for a flight, rendered as SVG
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: Response containing the seat map or a 304 response if the flight hasn't changed
+    """
+    flight = _get_flight(number, departure_date)
+    return _conditional_response(flight, lambda: get_seat_map(flight), "image/svg+xml")
+
+
+@api.route("/flights/<number>/<departure_date>/seats", methods=["POST"])
+def allocate_seats(number, departure_date):
+    """
+    Allocate a seat or a batch of seats on a flight. Passengers who already have a seat are moved
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing a list of the seat allocations that were made
+    """
+    flight = _get_flight(number, departure_date, for_update=True)
+    items = _get_batch()
+
+    # The previous seat for each passenger is recorded so the batch can be reversed if an allocation fails
+    applied = []
+    for index, item in enumerate(items):
+        try:
+            passenger_id = _get_property(item, "passenger_id")
+            _check_passenger(flight, passenger_id)
+            seat_number = _get_property(item, "seat_number", required=False)
+
+            previous_seat_number = flight.get_allocated_seat(passenger_id)
+            if seat_number:
+                with _invalid_input_is_bad_request():
+                    flight.allocate_seat(seat_number, passenger_id)
+            else:
+                flight.allocate_next_empty_seat(passenger_id)
+            applied.append((passenger_id, previous_seat_number))
+        except Exception as e:
+            for applied_passenger_id, previous_seat_number in reversed(applied):
+                if previous_seat_number is None:
+                    flight.clear_seat_allocation(applied_passenger_id)
+                else:
+                    flight.allocate_seat(previous_seat_number, applied_passenger_id)
+            flight_cache.mark_saved(flight)
+            if _get_status_code(e) is None:
+                raise
+            raise BatchItemError(index, e) from e
+
+    flight_cache.save(flight)
+    return jsonify([
+        {"seat_number": flight.get_allocated_seat(passenger_id), "passenger_id": passenger_id}
+        for passenger_id, _ in applied
+    ])
+
+
+@api.route("/flights/<number>/<departure_date>/seats/<passenger_id>", methods=["DELETE"])
+def clear_seat_allocation(number, departure_date, passenger_id):
+    """
+    Clear a passenger's seat allocation, leaving them on the flight
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :param passenger_id: Unique identifier for the passenger
+    :return: Empty response with status 204
+    """
+    flight = _get_flight(number, departure_date, for_update=True)
+    _check_passenger(flight, passenger_id)
+    flight.clear_seat_allocation(passenger_id)
+    flight_cache.save(flight)
+    return Response(status=204)
+
+
+@api.route("/flights/<number>/<departure_date>/boarding_cards", methods=["POST"])
+def generate_boarding_cards(number, departure_date):
+    """
+    Generate boarding cards for a flight. Only cards whose details have changed are generated, unless "force" is
+    set in the request
+
+    :param number: Flight number
+    :param departure_date: Departure date in the format YYYY-MM-DD
+    :return: JSON response containing lists of the seat numbers for generated, unchanged and deleted cards
+    """
+    flight = _get_flight(number, departure_date)
+    properties = _get_json_object()
+    report = flight.generate_boarding_cards(_get_property(properties, "format", required=False, default="pdf"),
+                                            _get_property(properties, "gate"),
+                                            _get_flag(properties, "force"))
+    return jsonify(report)
@@ -6,13 +6,34 @@ The site is not responsive but the Bootstrap customizer has been used to generat
 to provide button and form element styling.
 """
 
-from flask import Flask, render_template, redirect, request, session
-from flight_booking import InvalidOperationError, SeatingPlanNotFoundError, AirportCodeNotFoundError
-from .model import booking_model
+from flask import Flask, Response, render_template, redirect, request, session, jsonify, url_for
+from flight_booking import InvalidOperationError, SeatingPlanNotFoundError, AirportCodeNotFoundError, search_airports, \
+    build_airport_search_index
+from flight_booking.instrumentation import add_sink
+from markupsafe import Markup
+from .metrics import MetricsRegistry, init_metrics, CONTENT_TYPE
+from .profiling import init_profiling
+from .model import booking_model, DEFAULT_PAGE_SIZE
+from .api import api
+from .seat_map import get_seat_map
 
 app = Flask("Flight Booking")
 app.secret_key = b'some secret key'
 
+# Collect request metrics and the metrics reported by the flight_booking package, for the /metrics endpoint
+metrics_registry = MetricsRegistry()
+init_metrics(app, metrics_registry)
+add_sink(metrics_registry)
+
+# Allow individual requests to be profiled, using the profile query parameter, when running in debug mode
+init_profiling(app)
+
+# JSON API for booking operations, under /api
+app.register_blueprint(api)
+
+# Build the airport search index up front, so the first airport search doesn't pay for building it
+build_airport_search_index()
+
 options_map = [
     {
         "description": "Create",
@@ -34,6 +55,11 @@ options_map = [
         "view": "list_passengers",
         "requires_flight": True
     },
+    {
+        "description": "Seat map",
+        "view": "seat_map",
+        "requires_flight": True
+    },
     {
         "description": "Boarding cards",
         "view": "print_boarding_cards",
@@ -103,6 +129,33 @@ def create_new_flight():
         return render_template("create_flight.html", error=None)
 
 
+@app.route("/airports/search")
+def airport_search():
+    """
+    Search for airports matching the text in the "q" query string parameter, for use by the airport typeahead
+    on the flight creation page. The optional "limit" parameter sets the maximum number of results
+
+    :return: JSON response containing a list of dictionaries of airport properties
+    """
+    try:
+        limit = int(request.args.get("limit", 10))
+        airports = search_airports(request.args.get("q", ""), min(limit, 50))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    else:
+        return jsonify(airports)
+
+
+@app.route("/metrics")
+def metrics():
+    """
+    Serve the operational metrics for the application in the Prometheus text exposition format
+
+    :return: Response containing the metrics
+    """
+    return Response(metrics_registry.render(), content_type=CONTENT_TYPE)
+
+
 @app.route("/create_dummy_flight")
 def create_dummy_flight():
     """
@@ -156,22 +209,108 @@ def add_passenger_to_flight():
         return render_template("add_passenger.html", error=None)
 
 
+def _get_passenger_listing_query():
+    """
+    Return the passenger listing parameters from the query string, omitting those that aren't set. The "page" and
+    "page_size" parameters set the page, "sort" and "order" (asc or desc) set the order and "name", "seat" and
+    "passport" filter the passengers
+
+    :return: Dictionary of query string parameters
+    """
+    names = ["page", "page_size", "sort", "order", "name", "seat", "passport"]
+    return {name: request.args[name] for name in names if request.args.get(name)}
+
+
+def _get_passenger_page(query):
+    """
+    Return a page of the passenger listing for the current flight
+
+    :param query: Dictionary of query string parameters, as returned by _get_passenger_listing_query()
+    :raises ValueError: If any of the parameters are invalid
+    :return: The page, as returned by FlightBookingModel.get_passenger_page()
+    """
+    return booking_model.get_passenger_page(page=int(query.get("page", 1)),
+                                            page_size=int(query.get("page_size", DEFAULT_PAGE_SIZE)),
+                                            sort=query.get("sort", "number"),
+                                            reverse=query.get("order") == "desc",
+                                            name=query.get("name"),
+                                            seat_number=query.get("seat"),
+                                            passport_number=query.get("passport"))
+
+
 @app.route("/list_passengers")
 def list_passengers():
     """
-    Serve the page showing passenger details and their seat allocations. From this page, seat allocations can
-    be added and changed and passengers can be removed from the flight.
+    Serve the page showing passenger details and their seat allocations, a page at a time. From this page, seat
+    allocations can be added and changed and passengers can be removed from the flight. The listing can be sorted
+    and filtered using the query string parameters described in _get_passenger_listing_query()
 
     :return: The HTML for the passenger details page
     """
-    passengers = booking_model.get_passengers_including_seat_allocations()
-    if len(passengers) > 0:
-        home_option = [o for o in options_map if "is_home_link" in o and o["is_home_link"]]
-        return render_template("list_passengers.html", passengers=passengers, options_map=home_option)
-    else:
+    if len(booking_model.flight.passengers) == 0:
         session["message"] = "There are no passengers on the flight"
         return redirect("/")
 
+    query = _get_passenger_listing_query()
+
+    def listing_url(**changes):
+        # Build the URL for the listing with some of the parameters changed, keeping the rest
+        return url_for("list_passengers", **{**query, **changes})
+
+    try:
+        page = _get_passenger_page(query)
+        error = None
+    except ValueError as e:
+        page = None
+        error = e
+
+    home_option = [o for o in options_map if "is_home_link" in o and o["is_home_link"]]
+    return render_template("list_passengers.html",
+                           page=page,
+                           query=query,
+                           listing_url=listing_url,
+                           error=error,
+                           options_map=home_option)
+
+
+@app.route("/list_passengers/page")
+def passenger_page():
+    """
+    Return a page of the passenger listing as JSON, for client-side tables that load the passengers as they're
+    scrolled into view. The query string parameters are the same as for the passenger details page
+
+    :return: JSON response containing the page, as returned by FlightBookingModel.get_passenger_page(), with each
+        passenger as a dictionary
+    """
+    if booking_model.flight is None:
+        return jsonify(error="There is no current flight"), 404
+
+    try:
+        page = _get_passenger_page(_get_passenger_listing_query())
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    else:
+        return jsonify(dict(page, passengers=[passenger.to_dict() for passenger in page["passengers"]]))
+
+
+@app.route("/seat_map")
+def seat_map():
+    """
+    Serve the page showing the seat map for the current flight. The map is only rendered again if the flight has
+    changed since it was last shown
+
+    :return: The HTML for the seat map page or a response object redirecting to / if there's no seating plan
+    """
+    if booking_model.flight.seating_plan is None:
+        session["message"] = "A seating plan has not been loaded"
+        return redirect("/")
+
+    home_option = [o for o in options_map if "is_home_link" in o and o["is_home_link"]]
+    return render_template("seat_map.html",
+                           seat_map=Markup(get_seat_map(booking_model.flight)),
+                           flight=booking_model.flight,
+                           options_map=home_option)
+
 
 @app.route("/allocate_seat/<passenger_id>", methods=["GET", "POST"])
 def allocate_seat(passenger_id):
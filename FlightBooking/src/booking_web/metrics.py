@@ -0,0 +1,309 @@
+"""
+This module collects operational metrics for the Flight Booking Web Application and renders them in the Prometheus
+text exposition format, for the /metrics endpoint.
+
+Request metrics are collected by request hooks registered with the Flask application by init_metrics():
+
++----------------------------------------+--------------------------------------------------------------------------+
+| booking_web_request_duration_seconds   | Histogram of request latency, by route and method                        |
++----------------------------------------+--------------------------------------------------------------------------+
+| booking_web_requests_total             | Count of completed requests, by route, method and status code            |
++----------------------------------------+--------------------------------------------------------------------------+
+| booking_web_requests_in_progress       | Gauge of the requests currently being handled, by route                  |
++----------------------------------------+--------------------------------------------------------------------------+
+
+Metrics for the flight_booking package are collected by an instrumentation sink (see flight_booking.instrumentation),
+so timed operations, such as rendering and writing boarding cards, appear as a histogram labelled by operation and
+counters, such as the passengers added and seats allocated, appear as individual counters named after the
+instrumentation counter. These include the hits and misses for the caches, from which the cache hit rates can be
+calculated:
+
++----------------------+----------------------------------------------------------------------------------------------+
+| Seating plan files   | flight_booking_seating_plan_template_cache_hits_total and                                    |
+|                      | flight_booking_seating_plan_template_cache_misses_total                                      |
++----------------------+----------------------------------------------------------------------------------------------+
+| Flight data files    | flight_booking_flight_cache_hits_total and flight_booking_flight_cache_misses_total          |
++----------------------+----------------------------------------------------------------------------------------------+
+| Seat maps            | flight_booking_seat_map_cache_hits_total and flight_booking_seat_map_cache_misses_total      |
++----------------------+----------------------------------------------------------------------------------------------+
+
+The metrics for the flight_booking package are:
+
++---------------------------------------------+---------------------------------------------------------------------+
+| flight_booking_operation_duration_seconds   | Histogram of the duration of timed operations, by operation         |
++---------------------------------------------+---------------------------------------------------------------------+
+| flight_booking_<counter>_total              | Total for each instrumentation counter e.g.                         |
+|                                             | flight_booking_flight_passengers_added_total                        |
++---------------------------------------------+---------------------------------------------------------------------+
+"""
+
+import bisect
+import re
+import threading
+import time
+from flask import g, request
+
+# Histogram bucket upper bounds, in seconds, for request latency and operation durations
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OPERATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Content type for the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label_value(value):
+    """
+    Escape a label value for the exposition format
+
+    :param value: Label value
+    :return: Label value with backslashes, double quotes and line feeds escaped
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(label_names, label_values):
+    """
+    Format a set of labels for the exposition format
+
+    :param label_names: Sequence of label names
+    :param label_values: Sequence of label values, in the same order as the names
+    :return: Formatted labels e.g. {route="/",method="GET"} or an empty string if there are no labels
+    """
+    if not label_names:
+        return ""
+
+    labels = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values))
+    return "{" + labels + "}"
+
+
+def _format_value(value):
+    """
+    Format a sample value for the exposition format
+
+    :param value: Sample value
+    :return: Formatted value
+    """
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    TYPE = None
+
+    def __init__(self, name, description, label_names=()):
+        """
+        Initialise a metric
+
+        :param name: Metric name
+        :param description: Help text for the metric
+        :param label_names: Sequence of label names
+        """
+        self._name = name
+        self._description = description
+        self._label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _render_samples(self):
+        for label_values, value in sorted(self._values.items()):
+            yield f"{self._name}{_format_labels(self._label_names, label_values)} {_format_value(value)}"
+
+    def render(self):
+        """
+        Render the metric in the exposition format
+
+        :return: List of lines
+        """
+        with self._lock:
+            samples = list(self._render_samples())
+        return [f"# HELP {self._name} {self._description}", f"# TYPE {self._name} {self.TYPE}"] + samples
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def inc(self, label_values=(), value=1):
+        """
+        Increment the counter
+
+        :param label_values: Tuple of label values, in the same order as the label names
+        :param value: Amount by which to increment the counter
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + value
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def inc(self, label_values=(), value=1):
+        """
+        Increase the gauge
+
+        :param label_values: Tuple of label values, in the same order as the label names
+        :param value: Amount by which to increase the gauge
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + value
+
+    def dec(self, label_values=(), value=1):
+        """
+        Decrease the gauge
+
+        :param label_values: Tuple of label values, in the same order as the label names
+        :param value: Amount by which to decrease the gauge
+        """
+        self.inc(label_values, -value)
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name, description, label_names=(), buckets=REQUEST_BUCKETS):
+        """
+        Initialise a histogram
+
+        :param name: Metric name
+        :param description: Help text for the metric
+        :param label_names: Sequence of label names
+        :param buckets: Sorted sequence of bucket upper bounds. A +Inf bucket is added automatically
+        """
+        super().__init__(name, description, label_names)
+        self._buckets = tuple(buckets)
+
+    def observe(self, value, label_values=()):
+        """
+        Record an observation
+
+        :param value: Observed value e.g. a duration in seconds
+        :param label_values: Tuple of label values, in the same order as the label names
+        """
+        with self._lock:
+            observations = self._values.get(label_values)
+            if observations is None:
+                observations = self._values[label_values] = [[0] * len(self._buckets), 0.0, 0]
+
+            # Bucket counts are held per bucket and accumulated when rendered. Values above the largest bound are
+            # only included in the +Inf bucket, which is the total count
+            bucket = bisect.bisect_left(self._buckets, value)
+            if bucket < len(self._buckets):
+                observations[0][bucket] += 1
+            observations[1] += value
+            observations[2] += 1
+
+    def _render_samples(self):
+        label_names = self._label_names + ("le",)
+        for label_values, (bucket_counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self._buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(label_names, label_values + (_format_value(float(upper_bound)),))
+                yield f"{self._name}_bucket{labels} {cumulative}"
+            yield f"{self._name}_bucket{_format_labels(label_names, label_values + ('+Inf',))} {count}"
+            labels = _format_labels(self._label_names, label_values)
+            yield f"{self._name}_sum{labels} {_format_value(total)}"
+            yield f"{self._name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Initialise a registry holding the request metrics and the metrics for the flight_booking package
+        """
+        self._lock = threading.Lock()
+        self.request_duration = Histogram("booking_web_request_duration_seconds",
+                                          "Request latency in seconds, by route and method",
+                                          ("route", "method"))
+        self.requests = Counter("booking_web_requests_total",
+                                "Completed requests, by route, method and status code",
+                                ("route", "method", "status"))
+        self.requests_in_progress = Gauge("booking_web_requests_in_progress",
+                                          "Requests currently being handled, by route",
+                                          ("route",))
+        self.operation_duration = Histogram("flight_booking_operation_duration_seconds",
+                                            "Duration of flight booking operations in seconds, by operation",
+                                            ("operation",),
+                                            OPERATION_BUCKETS)
+        self._counters = {}
+
+    def timing(self, name, seconds):
+        """
+        Instrumentation sink method, recording the duration of a flight booking operation
+
+        :param name: Name of the timed operation
+        :param seconds: Duration of the operation in seconds
+        """
+        self.operation_duration.observe(seconds, (name,))
+
+    def count(self, name, value):
+        """
+        Instrumentation sink method, incrementing the counter for a flight booking counter
+
+        :param name: Name of the counter
+        :param value: Amount by which the counter has been incremented
+        """
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.get(name)
+                if counter is None:
+                    metric_name = "flight_booking_" + re.sub("[^a-zA-Z0-9_]", "_", name) + "_total"
+                    counter = self._counters[name] = Counter(metric_name, f"Total for the {name} counter")
+        counter.inc((), value)
+
+    def render(self):
+        """
+        Render all the metrics in the exposition format
+
+        :return: Metrics as a string
+        """
+        with self._lock:
+            counters = [self._counters[name] for name in sorted(self._counters)]
+
+        lines = []
+        for metric in [self.request_duration, self.requests, self.requests_in_progress, self.operation_duration]:
+            lines.extend(metric.render())
+        for counter in counters:
+            lines.extend(counter.render())
+        return "\n".join(lines) + "\n"
+
+
+def _get_route():
+    """
+    Return the route for the current request, as the URL rule rather than the path so that routes with parameters,
+    such as /allocate_seat/<passenger_id>, aren't recorded separately for each value
+
+    :return: The URL rule or "unmatched" for requests that don't match a route
+    """
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+def init_metrics(app, registry):
+    """
+    Register request hooks with a Flask application to collect the request metrics
+
+    :param app: Flask application
+    :param registry: MetricsRegistry to record the metrics in
+    """
+    @app.before_request
+    def start_request_timer():
+        g.metrics_route = _get_route()
+        g.metrics_start = time.perf_counter()
+        registry.requests_in_progress.inc((g.metrics_route,))
+
+    @app.after_request
+    def record_response_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request_metrics(_):
+        # Teardown runs whether or not the request succeeded, so the in-progress gauge is always decremented. If
+        # an exception prevented the response being created, the request is recorded as a server error
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+
+        route = g.pop("metrics_route")
+        registry.request_duration.observe(time.perf_counter() - start, (route, request.method))
+        registry.requests.inc((route, request.method, str(g.pop("metrics_status", 500))))
+        registry.requests_in_progress.dec((route,))
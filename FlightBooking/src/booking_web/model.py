@@ -7,13 +7,232 @@ an interface between data input in the web application and the Flight business l
 
 A module level variable exposes an instance of the model class for use in the Flask view functions in the booking.py
 module.
+
+Passenger Listing
+=================
+
+Full flights on large aircraft have hundreds of passengers, so the passenger listing is served a page at a time by
+get_passenger_page(). Each request builds an index of passenger numbers and IDs, with a mapping of passenger ID to
+seat number built from a single pass over the seating plan. The index is filtered and sorted, and then only the
+passengers on the requested page are wrapped in PassengerSeatView objects, read-only views that add the passenger
+number and seat number to the passenger without copying it. The listing can be filtered by:
+
++-----------------+-----------------------------------------------------------------------------------------------+
+| name            | Passengers whose name contains the text, ignoring case                                        |
++-----------------+-----------------------------------------------------------------------------------------------+
+| seat_number     | A row number, for all the passengers in that row, or a seat number e.g. 12 or 12A             |
++-----------------+-----------------------------------------------------------------------------------------------+
+| passport_number | Passengers whose passport number starts with the text, ignoring case                          |
++-----------------+-----------------------------------------------------------------------------------------------+
+
+and sorted by any of the PASSENGER_SORT_FIELDS. Passengers without a seat are listed after those with one when
+sorting by seat number.
+
+Flight Cache
+============
+
+Flights loaded from data files by the web pages and the JSON API are held in a FlightCache, a process-wide, bounded
+cache exposed by the flight_cache module level variable, so both work with the same instance of a flight. Each entry
+records the modification time and size of the data file when it was loaded or saved through the cache. If the file
+has been changed since, for example by another process, the flight is loaded again rather than the stale instance
+being returned and its changes overwritten when it's next saved. Each entry also records the flight's version number
+at that point, so a flight that has been changed in memory, for example through the web pages, but not yet saved can
+be identified. Cache hits and misses are reported to the flight_booking instrumentation as flight_cache.hits and
+flight_cache.misses.
 """
 
 from flight_booking import Flight, create_passenger
+from flight_booking.instrumentation import increment
+from flight_booking.passenger import PASSENGER_FIELDS
+from flight_booking.utils import get_flight_file_path
+from collections import OrderedDict
+from collections.abc import Mapping
 import datetime
-from copy import deepcopy
+import math
+import os
+import re
+import threading
 from random import randint
 
+# Fields by which the passenger listing can be sorted. The number is the position of the passenger on the flight
+PASSENGER_SORT_FIELDS = ("number", "name", "seat_number", "passport_number")
+
+# Default and maximum number of passengers on a page of the passenger listing
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 1000
+
+_SEAT_NUMBER_PATTERN = re.compile(r"^(\d+)([A-Z]*)$")
+
+# Maximum number of flights held in the flight cache
+DEFAULT_FLIGHT_CACHE_SIZE = 32
+
+
+# Properties of a PassengerSeatView, in addition to the passenger properties
+PASSENGER_VIEW_FIELDS = PASSENGER_FIELDS + ("number", "seat_number")
+
+
+class PassengerSeatView(Mapping):
+    __slots__ = ("_passenger", "_number", "_seat_number")
+
+    def __init__(self, passenger, number, seat_number):
+        """
+        Initialise a read-only view of a passenger with their passenger number and seat number added. The passenger
+        isn't copied, so the view reflects later changes to it
+
+        :param passenger: The passenger
+        :param number: Position of the passenger on the flight, starting at 1
+        :param seat_number: Seat number allocated to the passenger or None
+        """
+        self._passenger = passenger
+        self._number = number
+        self._seat_number = seat_number
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getitem__(self, key):
+        if key == "seat_number":
+            return self._seat_number
+        if key == "number":
+            return self._number
+        return self._passenger[key]
+
+    def __contains__(self, key):
+        return key in PASSENGER_VIEW_FIELDS
+
+    def __iter__(self):
+        return iter(PASSENGER_VIEW_FIELDS)
+
+    def __len__(self):
+        return len(PASSENGER_VIEW_FIELDS)
+
+    def to_dict(self):
+        """
+        Return the passenger properties, passenger number and seat number as a dictionary, for JSON serialisation
+
+        :return: Dictionary of passenger properties
+        """
+        return {field: self[field] for field in PASSENGER_VIEW_FIELDS}
+
+
+def _get_seat_sort_key(seat_number):
+    """
+    Return a key for sorting seat numbers by row and then by letter, with unallocated seats last
+
+    :param seat_number: Seat number e.g. 12A or None
+    :return: Sort key
+    """
+    match = _SEAT_NUMBER_PATTERN.match(seat_number) if seat_number else None
+    return (0, int(match.group(1)), match.group(2)) if match else (1, 0, seat_number or "")
+
+
+def _get_file_signature(file_path):
+    """
+    Return the modification time and size of a file, used to detect changes to it
+
+    :param file_path: Full path to the file
+    :raises FileNotFoundError: If the file doesn't exist
+    :return: Tuple of the modification time, in nanoseconds, and the size
+    """
+    status = os.stat(file_path)
+    return status.st_mtime_ns, status.st_size
+
+
+class FlightCache:
+    def __init__(self, max_size=DEFAULT_FLIGHT_CACHE_SIZE):
+        """
+        Initialise a cache of flights loaded from flight data files, discarding the least recently used flight when
+        it holds more than max_size flights
+
+        :param max_size: Maximum number of flights to hold
+        """
+        self._max_size = max_size
+        self._flights = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._flights)
+
+    def get(self, number, departure_date):
+        """
+        Return a flight, loading it from its data file if it isn't in the cache or the file has changed since it was
+        loaded or saved through the cache
+
+        :param number: Flight number
+        :param departure_date: UTC departure date, as used in the name of the flight data file
+        :raises FileNotFoundError: If there's no data file for the flight
+        :return: Instance of the Flight class
+        """
+        key = (number, departure_date)
+        with self._lock:
+            signature = _get_file_signature(get_flight_file_path(number, departure_date))
+            cached = self._flights.get(key)
+            if cached is not None and cached[0] == signature:
+                increment("flight_cache.hits")
+                self._flights.move_to_end(key)
+                return cached[2]
+
+            increment("flight_cache.misses")
+            flight = Flight.load_flight(number, departure_date)
+            self._store(key, signature, flight)
+            return flight
+
+    def save(self, flight):
+        """
+        Save a flight to its data file and hold it in the cache
+
+        :param flight: Instance of the Flight class
+        """
+        with self._lock:
+            flight.save()
+            key = (flight.number, flight.departure_date)
+            self._store(key, _get_file_signature(get_flight_file_path(*key)), flight)
+
+    def has_unsaved_changes(self, flight):
+        """
+        Return True if a flight has been changed since it was loaded or saved through the cache, or wasn't loaded
+        through the cache at all
+
+        :param flight: Instance of the Flight class
+        :return: True if the flight has changes that haven't been saved to its data file
+        """
+        with self._lock:
+            cached = self._flights.get((flight.number, flight.departure_date))
+            return cached is None or cached[2] is not flight or cached[1] != flight.version
+
+    def mark_saved(self, flight):
+        """
+        Record that a cached flight matches its data file without saving it, for example once a failed change to it
+        has been reversed
+
+        :param flight: Instance of the Flight class
+        """
+        with self._lock:
+            key = (flight.number, flight.departure_date)
+            cached = self._flights.get(key)
+            if cached is not None and cached[2] is flight:
+                self._flights[key] = (cached[0], flight.version, flight)
+
+    def clear(self):
+        """
+        Discard all cached flights
+        """
+        with self._lock:
+            self._flights.clear()
+
+    def _store(self, key, signature, flight):
+        """
+        Add or replace a flight in the cache, discarding the least recently used flights if it's full
+
+        :param key: Tuple of the flight number and departure date
+        :param signature: Modification time and size of the flight data file
+        :param flight: Instance of the Flight class
+        """
+        self._flights[key] = (signature, flight.version, flight)
+        self._flights.move_to_end(key)
+        while len(self._flights) > self._max_size:
+            self._flights.popitem(last=False)
+
 
 class FlightBookingModel:
     def __init__(self):
@@ -97,20 +316,92 @@ class FlightBookingModel:
 
     def get_passengers_including_seat_allocations(self):
         """
-        Return a dictionary of passengers with the allocated seat number included in each passenger's details
+        Return a dictionary of passengers with the allocated seat number included in each passenger's details. The
+        seat numbers are found with a single pass over the seating plan and the passengers aren't copied
 
-        :return: Dictionary of passengers
+        :return: Dictionary of PassengerSeatView objects, keyed by passenger ID
         """
-        passengers = {}
-        for passenger_id in self._flight.passengers:
-            passengers[passenger_id] = self._get_passenger_including_seat_allocation(passenger_id)
-        return passengers
+        passengers = self._flight.passengers
+        seats = self._get_seat_numbers()
+        return {
+            passenger_id: PassengerSeatView(passengers[passenger_id], number, seats.get(passenger_id))
+            for number, passenger_id in enumerate(passengers, 1)
+        }
+
+    def get_passenger_page(self, page=1, page_size=DEFAULT_PAGE_SIZE, sort="number", reverse=False, name=None,
+                           seat_number=None, passport_number=None):
+        """
+        Return a page of the passenger listing, optionally filtered and sorted
+
+        :param page: Page number, starting at 1
+        :param page_size: Number of passengers on each page
+        :param sort: Field to sort by, one of the PASSENGER_SORT_FIELDS
+        :param reverse: If True, sort in descending order
+        :param name: Text to match against passenger names or None
+        :param seat_number: Row or seat number to match or None
+        :param passport_number: Text to match against the start of passport numbers or None
+        :raises ValueError: If the page, page size or sort field are invalid
+        :return: Dictionary containing the page number, page size, number of pages, the number of passengers matching
+            the filters, the total number of passengers and a list of PassengerSeatView objects. Pages beyond the last
+            page contain no passengers
+        """
+        if page < 1:
+            raise ValueError(f"{page} is not a valid page number")
+
+        if page_size < 1 or page_size > MAX_PAGE_SIZE:
+            raise ValueError(f"The page size must be in the range 1 to {MAX_PAGE_SIZE}")
+
+        if sort not in PASSENGER_SORT_FIELDS:
+            raise ValueError(f"{sort} is not a valid sort field")
+
+        passengers = self._flight.passengers
+        seats = self._get_seat_numbers()
+        index = list(enumerate(passengers, 1))
+
+        if name:
+            name = name.casefold()
+            index = [(number, pid) for number, pid in index if name in passengers[pid]["name"].casefold()]
+
+        if seat_number:
+            seat_number = seat_number.strip().upper()
+            if seat_number.isdigit():
+                index = [(number, pid) for number, pid in index
+                         if _get_seat_sort_key(seats.get(pid))[:2] == (0, int(seat_number))]
+            else:
+                index = [(number, pid) for number, pid in index if seats.get(pid) == seat_number]
+
+        if passport_number:
+            passport_number = passport_number.casefold()
+            index = [(number, pid) for number, pid in index
+                     if passengers[pid]["passport_number"].casefold().startswith(passport_number)]
+
+        if sort == "name":
+            index.sort(key=lambda entry: passengers[entry[1]]["name"].casefold(), reverse=reverse)
+        elif sort == "seat_number":
+            index.sort(key=lambda entry: _get_seat_sort_key(seats.get(entry[1])), reverse=reverse)
+        elif sort == "passport_number":
+            index.sort(key=lambda entry: passengers[entry[1]]["passport_number"], reverse=reverse)
+        elif reverse:
+            index.reverse()
+
+        start = (page - 1) * page_size
+        return {
+            "page": page,
+            "page_size": page_size,
+            "pages": max(1, math.ceil(len(index) / page_size)),
+            "matches": len(index),
+            "total": len(passengers),
+            "passengers": [
+                PassengerSeatView(passengers[pid], number, seats.get(pid))
+                for number, pid in index[start:start + page_size]
+            ]
+        }
 
     def save(self):
         """
         Save the current flight details to a flight data file
         """
-        self._flight.save()
+        flight_cache.save(self._flight)
 
     def load(self, number, departure_date):
         """
@@ -120,7 +411,7 @@ class FlightBookingModel:
         :param departure_date: Departure date in the format DD/MM/YYYY
         """
         departs = datetime.datetime.strptime(departure_date, "%d/%m/%Y").date()
-        self._flight = Flight.load_flight(number, departs)
+        self._flight = flight_cache.get(number, departs)
 
     def _create_dummy_flight(self):
         """
@@ -162,16 +453,15 @@ class FlightBookingModel:
         for passenger_id in self._flight.passengers:
             self._flight.allocate_next_empty_seat(passenger_id)
 
-    def _get_passenger_including_seat_allocation(self, passenger_id):
+    def _get_seat_numbers(self):
         """
-        For a given flight and passenger ID, return the passenger details with the seat allocation added
+        Return a mapping of passenger ID to seat number for the passengers with seats, built from a single pass over
+        the seating plan
 
-        :param passenger_id: Passenger unique ID
-        :return: Passenger dictionary for the specified passenger with the seat number added
+        :return: Dictionary of seat numbers keyed by passenger ID
         """
-        passenger = deepcopy(self._flight.passengers[passenger_id])
-        passenger["seat_number"] = self._flight.get_allocated_seat(passenger_id)
-        return passenger
+        allocations = self._flight.get_all_seat_allocations() or []
+        return {passenger["id"]: seat_number for seat_number, passenger in allocations}
 
     @staticmethod
     def _next_passport_number():
@@ -211,4 +501,5 @@ class FlightBookingModel:
         return datetime.timedelta(hours=hours, minutes=minutes)
 
 
+flight_cache = FlightCache()
 booking_model = FlightBookingModel()
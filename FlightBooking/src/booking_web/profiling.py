@@ -0,0 +1,70 @@
+"""
+This module provides a per-request profiling mode for the Flight Booking Web Application. When the application is
+running in debug mode, adding profile=1 to the query string of a request profiles the request using the profiler in
+flight_booking.profiling. The output is written to the profiles folder under the data folder, named after the view
+function, the top hotspots are written to the application log and the path to the statistics file is returned in the
+X-Profile-Output response header. The collapsed stacks are written on a background thread, so the response isn't held
+up while they're reconstructed.
+
+The query parameter is ignored when the application isn't in debug mode, so profiling can't be triggered in
+production.
+"""
+
+from flask import g, request
+from flight_booking.profiling import OperationProfiler, format_hotspots
+
+# Response header containing the path to the profile statistics for a profiled request
+PROFILE_HEADER = "X-Profile-Output"
+
+
+def _is_profile_requested(app):
+    """
+    Return True if profiling has been requested for the current request and is permitted
+
+    :param app: Flask application
+    :return: True if the application is in debug mode and the profile query parameter is set
+    """
+    return app.debug and request.args.get("profile", "").lower() in ("1", "true", "yes")
+
+
+def _stop_profiler(app):
+    """
+    Stop the profiler for the current request, if there is one, and log the hotspots
+
+    :param app: Flask application
+    :return: The profiling report or None if the request wasn't profiled
+    """
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return None
+
+    profiler.__exit__(None, None, None)
+    report = profiler.report
+    app.logger.info("Profile for %s written to %s\n%s", request.path, report["pstats"],
+                    format_hotspots(report["hotspots"]))
+    return report
+
+
+def init_profiling(app):
+    """
+    Register request hooks with a Flask application to profile requests with the profile query parameter set
+
+    :param app: Flask application
+    """
+    @app.before_request
+    def start_profiler():
+        if _is_profile_requested(app):
+            g.profiler = OperationProfiler(f"web_{request.endpoint or 'unmatched'}", background=True)
+            g.profiler.__enter__()
+
+    @app.after_request
+    def stop_profiler(response):
+        report = _stop_profiler(app)
+        if report is not None:
+            response.headers[PROFILE_HEADER] = report["pstats"]
+        return response
+
+    @app.teardown_request
+    def stop_profiler_on_error(_):
+        # The after request hooks aren't called if the view raised an exception, so the profiler is stopped here
+        _stop_profiler(app)
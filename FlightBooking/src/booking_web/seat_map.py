@@ -0,0 +1,169 @@
+"""
+This module renders seat maps for the Flight Booking Web Application. A seat map is an SVG image of a flight's
+seating plan, with one row of seats per row in the plan, the row numbers down the left hand side and a legend of the
+seating classes across the top. Seats are coloured by seating class and occupied seats are shaded, with a tooltip
+giving the seat number, class and the name of the passenger allocated to it.
+
+The rows, seating classes and seats are taken from the seating plan held by the flight rather than from the seating
+plan file, so a flight saved before its seating plan file changed, or whose file has since been removed, is drawn as it
+was saved. Columns are the seat letters in the order in which they're first encountered in the plan, so seats with the
+same letter line up from front to back, with an aisle between the two halves of the cabin.
+
+Rendering a map for a large aircraft means visiting every seat, so rendered maps are cached, one per flight, along
+with the flight version number they were rendered from. The version number changes whenever the seating plan is
+loaded or passengers or seat allocations change, so a map is only rendered again once the flight has changed and
+repeatedly refreshing the map for an unchanged flight is cheap. Only the latest map for each flight is kept and the
+cache holds the maps for at most MAX_SEAT_MAPS flights, discarding the least recently used first. Cache hits and
+misses are reported to the flight_booking instrumentation as seat_map.cache_hits and seat_map.cache_misses. The cache
+is shared by all request threads, so access to it is serialised by a lock.
+"""
+
+import threading
+from collections import OrderedDict
+from html import escape
+from flight_booking import InvalidOperationError
+from flight_booking.compact_seating_plan import CompactSeatingPlan
+from flight_booking.instrumentation import timed, increment
+
+# Dimensions, in pixels, of a seat, the gap between seats, the aisle and the margins around the map
+SEAT_SIZE = 24
+SEAT_GAP = 4
+AISLE_WIDTH = 24
+ROW_LABEL_WIDTH = 32
+LEGEND_HEIGHT = 32
+MARGIN = 8
+
+# Colours for the seating classes, used in the order the classes appear in the plan
+CLASS_COLOURS = ("#3282a9", "#7cb342", "#f9a825", "#8e24aa", "#e64a19", "#00897b")
+OCCUPIED_COLOUR = "#555555"
+
+# Process-wide cache of rendered seat maps, holding at most MAX_SEAT_MAPS maps with the least recently used discarded
+# first. The key is a (flight number, departure date) tuple and the value is a tuple of the flight version number the
+# map was rendered from and the SVG for the map
+MAX_SEAT_MAPS = 32
+seat_maps = OrderedDict()
+seat_maps_lock = threading.Lock()
+
+
+def _get_rows(plan):
+    """
+    Return the rows of a seating plan, in the order they appear in the plan
+
+    :param plan: Seating plan
+    :return: Sequence of (row number, seating class, seat letters, seat numbers) tuples
+    """
+    if isinstance(plan, CompactSeatingPlan):
+        return plan.template.rows
+
+    rows = []
+    for row_number in plan.keys():
+        if row_number.isnumeric():
+            seat_numbers = tuple(plan[row_number]["seats"])
+            letters = "".join(seat_number[len(row_number):] for seat_number in seat_numbers)
+            rows.append((row_number, plan[row_number]["class"], letters, seat_numbers))
+    return rows
+
+
+def _get_columns(rows):
+    """
+    Return the horizontal position of each seat letter in the plan, leaving a gap for the aisle in the middle
+
+    :param rows: Sequence of (row number, seating class, seat letters, seat numbers) tuples
+    :return: Tuple of a dictionary of x co-ordinates keyed by seat letter and the overall width of the seats
+    """
+    seat_letters = list(dict.fromkeys(letter for _, _, letters, _ in rows for letter in letters))
+    aisle = (len(seat_letters) + 1) // 2
+    columns = {
+        letter: i * (SEAT_SIZE + SEAT_GAP) + (AISLE_WIDTH if i >= aisle else 0)
+        for i, letter in enumerate(seat_letters)
+    }
+    width = len(seat_letters) * (SEAT_SIZE + SEAT_GAP) + (AISLE_WIDTH if len(seat_letters) > 1 else 0)
+    return columns, width
+
+
+@timed("seat_map.render")
+def render_seat_map(flight):
+    """
+    Render the seat map for a flight
+
+    :param flight: The flight
+    :raises InvalidOperationError: If a seating plan has not been loaded
+    :return: The seat map as an SVG document
+    """
+    if flight.seating_plan is None:
+        raise InvalidOperationError("Cannot show a seat map if a seating plan has not been loaded")
+
+    rows = _get_rows(flight.seating_plan)
+    columns, seats_width = _get_columns(rows)
+    class_names = list(dict.fromkeys(seat_class for _, seat_class, _, _ in rows))
+    colours = {seat_class: CLASS_COLOURS[i % len(CLASS_COLOURS)] for i, seat_class in enumerate(class_names)}
+    passengers = dict(flight.get_all_seat_allocations() or [])
+
+    # Legend showing the colour for each seating class, followed by the shading for occupied seats
+    parts = []
+    x = MARGIN
+    for label, colour in [(seat_class, colours[seat_class]) for seat_class in class_names] + \
+                         [("Occupied", OCCUPIED_COLOUR)]:
+        parts.append(f'<rect x="{x}" y="{MARGIN}" width="12" height="12" fill="{colour}"/>')
+        parts.append(f'<text x="{x + 16}" y="{MARGIN + 10}">{escape(label)}</text>')
+        x += 24 + 7 * len(label)
+
+    width = max(x, ROW_LABEL_WIDTH + seats_width) + MARGIN
+    height = 2 * MARGIN + LEGEND_HEIGHT + len(rows) * (SEAT_SIZE + SEAT_GAP)
+    parts.insert(0, f'<svg xmlns="http://www.w3.org/2000/svg" class="seat-map" width="{width}" height="{height}" '
+                    f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="10">')
+
+    # One row of seats per row in the plan, each seat with a tooltip describing it
+    y = MARGIN + LEGEND_HEIGHT
+    for row_number, seat_class, letters, seat_numbers in rows:
+        parts.append(f'<text x="{MARGIN + ROW_LABEL_WIDTH - 8}" y="{y + SEAT_SIZE // 2 + 4}" '
+                     f'text-anchor="end">{row_number}</text>')
+        for letter, seat_number in zip(letters, seat_numbers):
+            passenger = passengers.get(seat_number)
+            if passenger is None:
+                fill, status = colours[seat_class], "Available"
+            else:
+                fill, status = OCCUPIED_COLOUR, passenger["name"]
+            parts.append(f'<rect x="{MARGIN + ROW_LABEL_WIDTH + columns[letter]}" y="{y}" width="{SEAT_SIZE}" '
+                         f'height="{SEAT_SIZE}" rx="4" fill="{fill}" stroke="{colours[seat_class]}">'
+                         f'<title>{seat_number} {escape(seat_class)}: {escape(status)}</title></rect>')
+        y += SEAT_SIZE + SEAT_GAP
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def get_seat_map(flight):
+    """
+    Return the seat map for a flight, rendering it only if the flight has changed since it was last rendered
+
+    :param flight: The flight
+    :raises InvalidOperationError: If a seating plan has not been loaded
+    :return: The seat map as an SVG document
+    """
+    key = (flight.number, flight.departure_date)
+    version = flight.version
+    with seat_maps_lock:
+        cached = seat_maps.get(key)
+        if cached is not None and cached[0] == version:
+            increment("seat_map.cache_hits")
+            seat_maps.move_to_end(key)
+            return cached[1]
+
+    # The map is rendered outside the lock, so rendering one flight's map doesn't hold up requests for others
+    increment("seat_map.cache_misses")
+    seat_map = render_seat_map(flight)
+    with seat_maps_lock:
+        seat_maps[key] = (version, seat_map)
+        seat_maps.move_to_end(key)
+        while len(seat_maps) > MAX_SEAT_MAPS:
+            seat_maps.popitem(last=False)
+    return seat_map
+
+
+def clear_seat_map_cache():
+    """
+    Discard all cached seat maps
+    """
+    with seat_maps_lock:
+        seat_maps.clear()
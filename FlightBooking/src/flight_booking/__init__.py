@@ -14,7 +14,7 @@ the ValueError and FileNotFoundError exceptions.
 """
 
 from .flight import Flight
-from .airport import get_airport
+from .airport import get_airport, search_airports, build_airport_search_index
 from .passenger import create_passenger
 from .exceptions import InsufficientCapacityError, \
     DuplicatePassportNumberError, \
@@ -26,6 +26,8 @@ from .exceptions import InsufficientCapacityError, \
 
 __all__ = ["Flight",
            "get_airport",
+           "search_airports",
+           "build_airport_search_index",
            "create_passenger",
            "InsufficientCapacityError",
            "DuplicatePassportNumberError",
@@ -2,13 +2,247 @@
 This module defines methods for managing airport details. A lookup of valid airports is read from a JSON-formatted
 data file to give a dictionary in which the 3-letter IATA airport codes are the keys and the values are dictionaries
 containing the airport properties.
+
+Indexed Airport Lookup
+======================
+
+Parsing a JSON file containing a full, worldwide, list of airports would dominate the start-up time of the
+applications. The JSON file can be converted, using convert_airport_lookup(), to an indexed binary file in the same
+folder. If present and no older than the JSON file, the indexed file is memory-mapped and airports are found using a
+binary search, so only the records that are accessed are read.
+
+The indexed file consists of a header followed by fixed-width records, one per airport, sorted by airport code:
+
++--------+------------------------------------------------------------------------------------------------------+
+| Header | Magic number followed by the widths of the code, name and timezone fields and the number of records  |
++--------+------------------------------------------------------------------------------------------------------+
+| Record | The airport code, name and timezone, each UTF-8 encoded and padded to the field width with NUL bytes |
++--------+------------------------------------------------------------------------------------------------------+
+
+Airport Search
+==============
+
+search_airports() supports incremental searches, such as those made by a typeahead, matching the search text against
+the start of the airport code, the start of the airport name and the start of each word in the airport name. The
+search index consists of sorted lists of normalised keys, built from the airport lookup, so the matches for a prefix
+are found using a binary search. Keys are case-folded and accents are removed, so "zur" matches "Zürich".
+
+Building the index means reading every airport, so applications that offer a search should call
+build_airport_search_index() at start-up, rather than the first search paying that cost. Otherwise, the index is built
+on the first search. It's built again if the airport lookup is reloaded.
 """
 
+import bisect
 import json
+import mmap
+import os
+import re
+import struct
+import unicodedata
+import pytz
 from .utils import get_lookup_file_path
 from .exceptions import AirportCodeNotFoundError
 
+AIRPORT_CODES_FILE_NAME = "airport_codes.json"
+AIRPORT_INDEX_FILE_NAME = "airport_codes.dat"
+
+INDEX_MAGIC = b"FBAI"
+INDEX_HEADER = struct.Struct("<4sHHHI")
+
+_WORD_PATTERN = re.compile(r"\w+")
+
 airport_codes = None
+airport_index = None
+airport_search_index = None
+
+# Cache of timezone objects, keyed by timezone name, so airports sharing a timezone share the same object
+airport_timezones = {}
+
+
+class _AirportIndex:
+    def __init__(self, file_path):
+        """
+        Open an indexed airport lookup file
+
+        :param file_path: Full path to the indexed file
+        :raises ValueError: If the file isn't an indexed airport lookup file
+        """
+        with open(file_path, mode="rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._code_width, self._name_width, self._tz_width, self.count = \
+            INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self._map.close()
+            raise ValueError(f"{file_path} is not an indexed airport lookup file")
+
+        self._record_size = self._code_width + self._name_width + self._tz_width
+
+        # Airports that have been found are cached, so repeated lookups return the same dictionary
+        self._airports = {}
+
+    def close(self):
+        """
+        Close the memory-mapped file
+        """
+        self._map.close()
+
+    def _read_field(self, offset, width):
+        return self._map[offset:offset + width].rstrip(b"\0").decode("utf-8")
+
+    def read_record(self, position):
+        """
+        Read the airport record at the specified position
+
+        :param position: Position of the record in the file, starting at 0
+        :return: Dictionary of airport properties
+        """
+        offset = INDEX_HEADER.size + position * self._record_size
+        return {
+            "code": self._read_field(offset, self._code_width),
+            "name": self._read_field(offset + self._code_width, self._name_width),
+            "tz": self._read_field(offset + self._code_width + self._name_width, self._tz_width)
+        }
+
+    def find(self, airport_code):
+        """
+        Find an airport using a binary search of the records
+
+        :param airport_code: Airport code e.g. LGW
+        :return: Dictionary of airport properties or None if not found
+        """
+        airport = self._airports.get(airport_code)
+        if airport is not None:
+            return airport
+
+        key = airport_code.encode("utf-8")
+        if len(key) > self._code_width:
+            return None
+        key = key.ljust(self._code_width, b"\0")
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = INDEX_HEADER.size + middle * self._record_size
+            code = self._map[offset:offset + self._code_width]
+            if code < key:
+                low = middle + 1
+            elif code > key:
+                high = middle
+            else:
+                airport = self.read_record(middle)
+                self._airports[airport_code] = airport
+                return airport
+
+        return None
+
+
+class _AirportSearchIndex:
+    def __init__(self, airports, source):
+        """
+        Build a search index from a collection of airports
+
+        :param airports: Iterable of dictionaries of airport properties
+        :param source: The airport lookup the index was built from, used to detect when it's out of date
+        """
+        self.source = source
+        codes = []
+        names = []
+        words = []
+        self._words = {}
+        for airport in airports:
+            code = airport["code"]
+            name = _normalise(airport["name"])
+            codes.append((_normalise(code), code))
+            names.append((name, code))
+            self._words[code] = _WORD_PATTERN.findall(name)
+            words.extend((word, code) for word in set(self._words[code]))
+
+        self.count = len(codes)
+        self._code_keys, self._code_values = self._sort_keys(codes)
+        self._name_keys, self._name_values = self._sort_keys(names)
+        self._word_keys, self._word_values = self._sort_keys(words)
+
+    @staticmethod
+    def _sort_keys(entries):
+        """
+        Sort a list of (key, airport code) tuples into parallel lists of keys and airport codes
+
+        :param entries: List of (key, airport code) tuples
+        :return: Tuple of the sorted list of keys and the corresponding list of airport codes
+        """
+        entries.sort()
+        return [key for key, _ in entries], [code for _, code in entries]
+
+    @staticmethod
+    def _prefix_matches(keys, values, prefix):
+        """
+        Generate the airport codes for the keys starting with a prefix, in key order
+
+        :param keys: Sorted list of keys
+        :param values: List of airport codes corresponding to the keys
+        :param prefix: Prefix to match
+        """
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield values[position]
+            position += 1
+
+    def _word_matches(self, query_words):
+        """
+        Generate the codes for airports where every word in the search text matches the start of a word in the
+        airport name
+
+        :param query_words: List of normalised words in the search text
+        """
+        # Candidates are taken from the longest word, as it's likely to match the fewest airports
+        longest = max(query_words, key=len)
+        for code in self._prefix_matches(self._word_keys, self._word_values, longest):
+            words = self._words[code]
+            if all(any(word.startswith(query_word) for word in words) for query_word in query_words):
+                yield code
+
+    def search(self, text, limit):
+        """
+        Search for airports matching the search text
+
+        :param text: Search text
+        :param limit: Maximum number of airport codes to return
+        :return: List of matching airport codes, with code matches first, then name matches, then word matches
+        """
+        query = _normalise(text.strip())
+        query_words = _WORD_PATTERN.findall(query)
+        if not query_words:
+            return []
+
+        matches = [
+            self._prefix_matches(self._code_keys, self._code_values, query),
+            self._prefix_matches(self._name_keys, self._name_values, query),
+            self._word_matches(query_words)
+        ]
+
+        # Dictionary keys preserve insertion order, so this collects unique codes in order of preference
+        codes = {}
+        for code in (code for match in matches for code in match):
+            codes[code] = None
+            if len(codes) >= limit:
+                break
+
+        return list(codes)
+
+
+def _normalise(text):
+    """
+    Normalise text for searching by removing accents and case-folding it
+
+    :param text: Text to normalise
+    :return: Normalised text
+    """
+    if text.isascii():
+        return text.casefold()
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
 
 
 def load_airport_code_lookup():
@@ -17,12 +251,67 @@ def load_airport_code_lookup():
 
     :return: A dictionary with airport codes as the keys and a dictionary of values as the values
     """
-    code_file = get_lookup_file_path("airport_codes.json")
+    code_file = get_lookup_file_path(AIRPORT_CODES_FILE_NAME)
     with open(code_file, mode="rt", encoding="utf-8") as f:
         json_data = json.load(f)
     return json_data["airport_codes"]
 
 
+def convert_airport_lookup():
+    """
+    Convert the JSON-formatted airport lookup to an indexed file in the same folder
+
+    :return: The number of airports written to the indexed file
+    """
+    airports = sorted(load_airport_code_lookup().values(), key=lambda a: a["code"].encode("utf-8"))
+    encoded = [(a["code"].encode("utf-8"), a["name"].encode("utf-8"), a["tz"].encode("utf-8")) for a in airports]
+    widths = [max((len(fields[i]) for fields in encoded), default=1) for i in range(3)]
+
+    # Write to a temporary file and then replace the indexed file, so a partially written file is never used
+    index_file = get_lookup_file_path(AIRPORT_INDEX_FILE_NAME)
+    temporary_file = f"{index_file}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_file, mode="wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, *widths, len(encoded)))
+            for fields in encoded:
+                f.write(b"".join(field.ljust(width, b"\0") for field, width in zip(fields, widths)))
+        os.replace(temporary_file, index_file)
+    finally:
+        if os.path.exists(temporary_file):
+            os.remove(temporary_file)
+
+    return len(encoded)
+
+
+def _open_airport_index():
+    """
+    Open the indexed airport lookup file, if it exists and is no older than the JSON-formatted lookup
+
+    :return: An instance of the _AirportIndex class or None if the indexed file can't be used
+    """
+    index_file = get_lookup_file_path(AIRPORT_INDEX_FILE_NAME)
+    code_file = get_lookup_file_path(AIRPORT_CODES_FILE_NAME)
+    if not os.path.exists(index_file):
+        return None
+
+    if os.path.exists(code_file) and os.path.getmtime(code_file) > os.path.getmtime(index_file):
+        return None
+
+    return _AirportIndex(index_file)
+
+
+def clear_airport_lookup():
+    """
+    Discard the loaded airport lookup, so it's reloaded on the next call to get_airport()
+    """
+    global airport_codes, airport_index, airport_search_index
+    if airport_index is not None:
+        airport_index.close()
+    airport_codes = None
+    airport_index = None
+    airport_search_index = None
+
+
 def get_airport(airport_code):
     """
     Return a dictionary of airport properties for the airport with the specified code
@@ -30,11 +319,84 @@ def get_airport(airport_code):
     :param airport_code: Airport code e.g. LGW
     :return: Dictionary of airport properties
     """
-    global airport_codes
+    global airport_codes, airport_index
     if airport_codes is None:
+        if airport_index is None:
+            airport_index = _open_airport_index()
+
+        if airport_index is not None:
+            airport = airport_index.find(airport_code)
+            if airport is None:
+                raise AirportCodeNotFoundError("Unrecognised airport code", code=airport_code)
+            return airport
+
         airport_codes = load_airport_code_lookup()
 
     try:
         return airport_codes[airport_code]
     except KeyError as e:
         raise AirportCodeNotFoundError("Unrecognised airport code", code=airport_code) from e
+
+
+def get_airport_timezone(airport):
+    """
+    Return the timezone object for an airport, resolving it from the timezone name on first use
+
+    :param airport: Dictionary of airport properties
+    :return: The pytz timezone for the airport
+    """
+    timezone_name = airport["tz"]
+    try:
+        return airport_timezones[timezone_name]
+    except KeyError:
+        timezone = airport_timezones[timezone_name] = pytz.timezone(timezone_name)
+        return timezone
+
+
+def _get_all_airports():
+    """
+    Return the current airport lookup and an iterable of all the airports it contains
+
+    :return: Tuple of the airport lookup and an iterable of dictionaries of airport properties
+    """
+    global airport_codes, airport_index
+    if airport_codes is None:
+        if airport_index is None:
+            airport_index = _open_airport_index()
+
+        if airport_index is not None:
+            return airport_index, (airport_index.read_record(i) for i in range(airport_index.count))
+
+        airport_codes = load_airport_code_lookup()
+
+    return airport_codes, airport_codes.values()
+
+
+def build_airport_search_index():
+    """
+    Build the airport search index from the current airport lookup, if it hasn't already been built from it
+
+    :return: The number of airports in the search index
+    """
+    global airport_search_index
+    source, airports = _get_all_airports()
+    if airport_search_index is None or airport_search_index.source is not source:
+        airport_search_index = _AirportSearchIndex(airports, source)
+    return airport_search_index.count
+
+
+def search_airports(text, limit=10):
+    """
+    Search for airports where the search text matches the start of the airport code, the airport name or a word in
+    the airport name. The search is case-insensitive and ignores accents
+
+    :param text: Search text e.g. LG, london or gatw
+    :param limit: Maximum number of airports to return
+    :raises ValueError: If the limit is less than 1
+    :return: List of dictionaries of airport properties, with code matches first, then name matches, then word matches
+    """
+    if limit < 1:
+        raise ValueError("The search limit must be at least 1")
+
+    build_airport_search_index()
+    return [get_airport(code) for code in airport_search_index.search(text, limit)]
@@ -0,0 +1,349 @@
+"""
+This module contains the BoardingCardContext class, which holds the properties of a boarding card run that are the
+same for every card on a flight.
+
+The card details passed to the boarding card plugins consist mostly of flight-level properties, such as the gate,
+airline, airports and formatted local times, with only the passenger name and seat number varying from card to card.
+Similarly, the boarding card file names differ only in the seat number. The context is built once per run, so
+generating each card only requires a copy of the invariant details, the plugin call and the write.
+
+Asynchronous Generation
+=======================
+
+generate_cards_async() is an asyncio-based alternative to generate_cards() for use from async web frameworks. Cards
+are rendered by calling the plugin in an executor and the rendered cards are passed through a bounded queue to a set
+of writer tasks, which write the card files in the executor. Rendering therefore continues while earlier cards are
+being written, but stalls when the queue is full, so slow storage limits the number of rendered cards held in memory.
+The number of cards being rendered at once and the number of writer tasks are both limited to the maximum concurrency.
+
+Incremental Generation
+======================
+
+A fingerprint of the details for each card is held in a manifest file written alongside the cards for the flight and
+card format. When cards are generated again, only the cards whose details have changed, or whose files are missing,
+are rendered and written and cards for seats that no longer have an allocation are deleted. Both generation functions
+return a report of the changes, as a dictionary of lists of seat numbers:
+
++-----------+-------------------------------------------------------------------------------------------------------+
+| generated | Seats for which a card was rendered and written                                                       |
++-----------+-------------------------------------------------------------------------------------------------------+
+| unchanged | Seats for which the existing card was up to date                                                      |
++-----------+-------------------------------------------------------------------------------------------------------+
+| deleted   | Seats in the manifest that no longer have an allocation and whose cards were deleted                  |
++-----------+-------------------------------------------------------------------------------------------------------+
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from .utils import get_boarding_card_file_name_parts, format_seat_number_for_file_name
+from .instrumentation import timed, increment
+
+
+class BoardingCardContext:
+    __slots__ = ("_details", "_card_format", "_folder", "_path_prefix", "_suffix", "_manifest_path")
+
+    def __init__(self, details, flight_number, departure_date, card_format):
+        """
+        Initialise a boarding card context
+
+        :param details: Dictionary of the card details that are the same for every card, in plugin order
+        :param flight_number: Flight number
+        :param departure_date: Departure date and time, used in the card file names
+        :param card_format: The format for the generated card data files
+        """
+        self._details = dict(details)
+        self._card_format = card_format
+        self._folder, prefix, self._suffix = \
+            get_boarding_card_file_name_parts(flight_number, departure_date, card_format)
+        self._path_prefix = os.path.join(self._folder, prefix)
+        self._manifest_path = os.path.join(self._folder, prefix.rstrip("_") + self._suffix + ".manifest.json")
+
+    @property
+    def card_format(self):
+        """
+        The format for the generated card data files
+
+        :return: The card format e.g. pdf
+        """
+        return self._card_format
+
+    @property
+    def folder(self):
+        """
+        The folder the boarding cards are written to
+
+        :return: Full path to the boarding card folder
+        """
+        return self._folder
+
+    @property
+    def manifest_path(self):
+        """
+        The path to the manifest file holding the fingerprints of the cards for the flight and card format
+
+        :return: Full path to the manifest file
+        """
+        return self._manifest_path
+
+    def get_card_details(self, name, seat_number):
+        """
+        Return the card details for a single passenger
+
+        :param name: The passenger name
+        :param seat_number: The seat number
+        :return: Dictionary of card details, in the form expected by the boarding card plugins
+        """
+        card_details = self._details.copy()
+        card_details["name"] = name
+        card_details["seat_number"] = seat_number
+        return card_details
+
+    def get_card_path(self, seat_number):
+        """
+        Return the path to the boarding card file for a seat
+
+        :param seat_number: The seat number
+        :return: Full path to the boarding card file
+        """
+        return self._path_prefix + format_seat_number_for_file_name(seat_number) + self._suffix
+
+    def get_card_fingerprint(self, card_details):
+        """
+        Return a fingerprint of the inputs to a card, which changes if any of the card details or the card
+        format change
+
+        :param card_details: Dictionary of card details, as returned by get_card_details()
+        :return: Fingerprint as a hexadecimal string
+        """
+        content = repr((self._card_format, sorted(card_details.items())))
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@timed("boarding_cards.write")
+def write_card_file(file_path, card_data):
+    """
+    Write a boarding card file
+
+    :param file_path: Full path to the boarding card file
+    :param card_data: Boarding card data, as a string for text formats or bytes for binary formats
+    """
+    if isinstance(card_data, str):
+        with open(file_path, mode="wt", encoding="utf-8") as f:
+            f.write(card_data)
+    else:
+        with open(file_path, mode="wb") as f:
+            f.write(card_data)
+
+
+def read_card_manifest(file_path):
+    """
+    Read a boarding card manifest file
+
+    :param file_path: Full path to the manifest file
+    :return: Dictionary of card fingerprints keyed by seat number, empty if the file is missing or unreadable
+    """
+    try:
+        with open(file_path, mode="rt", encoding="utf-8") as f:
+            return json.load(f)["fingerprints"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def write_card_manifest(file_path, fingerprints):
+    """
+    Write a boarding card manifest file, replacing any existing file atomically
+
+    :param file_path: Full path to the manifest file
+    :param fingerprints: Dictionary of card fingerprints keyed by seat number
+    """
+    temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_file_path, mode="wt", encoding="utf-8") as f:
+            json.dump({"fingerprints": fingerprints}, f)
+        os.replace(temporary_file_path, file_path)
+    finally:
+        if os.path.exists(temporary_file_path):
+            os.remove(temporary_file_path)
+
+
+@timed("boarding_cards.render")
+def render_card(generator, card_details):
+    """
+    Render a boarding card by calling the card generator from the boarding card plugin
+
+    :param generator: Card generator function from the boarding card plugin
+    :param card_details: Dictionary of card details
+    :return: Boarding card data
+    """
+    return generator(card_details)
+
+
+def _prepare_cards(context, allocations, force):
+    """
+    Compare the cards required for the current seat allocations with the manifest, delete the cards for seats that
+    are no longer allocated and return the cards that need to be generated
+
+    :param context: Boarding card context for the flight
+    :param allocations: Sequence of (seat number, passenger) tuples
+    :param force: If True, all cards are generated regardless of the manifest
+    :return: Tuple of a list of (seat number, card details) tuples to generate, the fingerprints for all the
+        current cards and the report
+    """
+    manifest = read_card_manifest(context.manifest_path)
+    cards = []
+    unchanged = []
+    fingerprints = {}
+    for seat_number, passenger in allocations:
+        card_details = context.get_card_details(passenger["name"], seat_number)
+        fingerprint = fingerprints[seat_number] = context.get_card_fingerprint(card_details)
+        if not force and manifest.get(seat_number) == fingerprint and \
+                os.path.exists(context.get_card_path(seat_number)):
+            unchanged.append(seat_number)
+        else:
+            cards.append((seat_number, card_details))
+
+    deleted = [seat_number for seat_number in manifest if seat_number not in fingerprints]
+    for seat_number in deleted:
+        card_file_path = context.get_card_path(seat_number)
+        if os.path.exists(card_file_path):
+            os.remove(card_file_path)
+
+    # Until the cards have been written, the manifest only records the cards that are known to be up to date, so an
+    # interrupted run doesn't leave entries for cards that weren't written
+    if cards or deleted:
+        write_card_manifest(context.manifest_path,
+                            {seat_number: fingerprints[seat_number] for seat_number in unchanged})
+
+    report = {
+        "generated": [seat_number for seat_number, _ in cards],
+        "unchanged": unchanged,
+        "deleted": deleted
+    }
+
+    for key, seat_numbers in report.items():
+        increment(f"boarding_cards.{key}", len(seat_numbers))
+
+    return cards, fingerprints, report
+
+
+def generate_cards(context, generator, allocations, force=False):
+    """
+    Generate and write the boarding cards that have changed since they were last generated
+
+    :param context: Boarding card context for the flight
+    :param generator: Card generator function from the boarding card plugin
+    :param allocations: Sequence of (seat number, passenger) tuples
+    :param force: If True, all cards are generated regardless of whether they've changed
+    :return: Dictionary of lists of the seat numbers for generated, unchanged and deleted cards
+    """
+    cards, fingerprints, report = _prepare_cards(context, allocations, force)
+    for seat_number, card_details in cards:
+        write_card_file(context.get_card_path(seat_number), render_card(generator, card_details))
+
+    if cards:
+        write_card_manifest(context.manifest_path, fingerprints)
+    return report
+
+
+async def _render_cards(context, generator, cards, queue, max_concurrency, executor):
+    """
+    Render boarding cards in the executor and add them to the write queue, with at most max_concurrency cards
+    being rendered or waiting for space in the queue at any one time
+
+    :param context: Boarding card context for the flight
+    :param generator: Card generator function from the boarding card plugin
+    :param cards: Sequence of (seat number, card details) tuples
+    :param queue: Queue of (file path, card data) tuples to be written
+    :param max_concurrency: Maximum number of cards being rendered at once
+    :param executor: Executor in which to render the cards or None for the event loop's default executor
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def render_and_queue(seat_number, card_details):
+        try:
+            card_data = await loop.run_in_executor(executor, render_card, generator, card_details)
+            await queue.put((context.get_card_path(seat_number), card_data))
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        for seat_number, card_details in cards:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(render_and_queue(seat_number, card_details)))
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _write_cards(queue, executor):
+    """
+    Write boarding cards from the write queue until a None entry is received
+
+    :param queue: Queue of (file path, card data) tuples to be written
+    :param executor: Executor in which to write the cards or None for the event loop's default executor
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        await loop.run_in_executor(executor, write_card_file, *item)
+
+
+async def generate_cards_async(context, generator, allocations, max_concurrency=4, queue_size=None, executor=None,
+                               force=False):
+    """
+    Generate and write the boarding cards that have changed since they were last generated asynchronously,
+    pipelining rendering and writing through a bounded queue
+
+    :param context: Boarding card context for the flight
+    :param generator: Card generator function from the boarding card plugin
+    :param allocations: Sequence of (seat number, passenger) tuples
+    :param max_concurrency: Maximum number of cards being rendered at once and the number of writer tasks
+    :param queue_size: Maximum number of rendered cards waiting to be written. Defaults to twice the concurrency
+    :param executor: Executor for rendering and writing the cards or None for the event loop's default executor. A
+        process pool may be used if the plugin is CPU-bound, as the card generator and details can be pickled
+    :param force: If True, all cards are generated regardless of whether they've changed
+    :raises ValueError: If the maximum concurrency or queue size is less than 1
+    :return: Dictionary of lists of the seat numbers for generated, unchanged and deleted cards
+    """
+    if max_concurrency < 1:
+        raise ValueError("The maximum concurrency must be at least 1")
+
+    if queue_size is not None and queue_size < 1:
+        raise ValueError("The queue size must be at least 1")
+
+    # The manifest and card files are checked in the default executor, so the event loop isn't blocked
+    loop = asyncio.get_running_loop()
+    cards, fingerprints, report = await loop.run_in_executor(None, _prepare_cards, context, allocations, force)
+    if not cards:
+        return report
+
+    queue = asyncio.Queue(maxsize=queue_size or 2 * max_concurrency)
+    writers = [asyncio.create_task(_write_cards(queue, executor)) for _ in range(max_concurrency)]
+
+    async def render_then_stop_writers():
+        await _render_cards(context, generator, cards, queue, max_concurrency, executor)
+        for _ in writers:
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(render_then_stop_writers())] + writers
+    try:
+        # If rendering or writing a card fails, the remaining tasks are cancelled rather than left waiting on
+        # the queue and the exception is raised
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    await loop.run_in_executor(None, write_card_manifest, context.manifest_path, fingerprints)
+    return report
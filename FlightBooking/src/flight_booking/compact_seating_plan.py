@@ -0,0 +1,283 @@
+"""
+This module defines a compact, array-backed representation of a seating plan, intended for use where a large number
+of flights are held in memory.
+
+A dictionary-based seating plan holds one dictionary entry per seat, keyed by seat number, inside one dictionary per
+row. In a compact seating plan, the seat numbers, row numbers and seating classes are held once, in the seat ordering
+table of the plan template shared by all flights using the same aircraft and layout (see the seating_plan module).
+Each flight then only holds:
+
++-----------------+------------------------------------------------------------------------------------------------+
+| Seat slots      | An array of unsigned 16-bit integers, one per seat in template order, holding the passenger    |
+|                 | slot index for the passenger allocated to that seat or 0 for an unallocated seat               |
++-----------------+------------------------------------------------------------------------------------------------+
+| Passenger table | A list of the passenger IDs that have been allocated seats, indexed by passenger slot index    |
++-----------------+------------------------------------------------------------------------------------------------+
+
+The CompactSeatingPlan class presents the same nested dictionary structure as a dictionary-based plan, as a set of
+views over the array, so it can be passed to any of the functions in the seating_plan module.
+"""
+
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+# Keys in the seating plan that hold plan properties rather than rows
+PLAN_PROPERTY_KEYS = ("airline", "aircraft", "layout")
+
+# Array type code for the seat slots and the maximum number of entries in the passenger table that can
+# be addressed using that type
+SLOT_TYPE_CODE = "H"
+MAXIMUM_PASSENGER_SLOTS = 2 ** 16
+
+
+class CompactSeatingPlan(Mapping):
+    __slots__ = ("_template", "_slots", "_passenger_ids")
+
+    def __init__(self, template):
+        """
+        Initialise an empty compact seating plan from a plan template
+
+        :param template: An instance of the PlanTemplate named tuple
+        """
+        self._template = template
+        self._slots = array(SLOT_TYPE_CODE, bytes(template.capacity * array(SLOT_TYPE_CODE).itemsize))
+
+        # Slot 0 is reserved to indicate an unallocated seat. The passenger table is searched rather than
+        # indexed by passenger ID, as a dictionary would use more memory than the rest of the plan
+        self._passenger_ids = [None]
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" \
+               f"airline={self._template.airline!r}, " \
+               f"aircraft={self._template.aircraft!r}, " \
+               f"layout={self._template.layout!r}" \
+               f")"
+
+    def __getitem__(self, key):
+        if key in PLAN_PROPERTY_KEYS:
+            return getattr(self._template, key)
+        if key == "capacity":
+            return self._template.capacity
+
+        try:
+            seat_positions = self._template.row_ranges[key]
+        except (KeyError, TypeError) as e:
+            raise KeyError(key) from e
+
+        return _CompactRow(self, key, seat_positions)
+
+    def __contains__(self, key):
+        return key in PLAN_PROPERTY_KEYS or key == "capacity" or key in self._template.row_ranges
+
+    def __iter__(self):
+        # Keys are returned in the same order as those of a dictionary-based plan
+        yield from PLAN_PROPERTY_KEYS
+        yield from self._template.row_ranges
+        yield "capacity"
+
+    def __len__(self):
+        return len(self._template.row_ranges) + len(PLAN_PROPERTY_KEYS) + 1
+
+    @property
+    def template(self):
+        """
+        Return the plan template that holds the seat ordering table for this plan
+
+        :return: An instance of the PlanTemplate named tuple
+        """
+        return self._template
+
+    @property
+    def seat_slots(self):
+        """
+        Return the array of passenger slot indices, one per seat in seat ordering table order. This is
+        exposed for efficient bulk analysis and should be treated as read-only
+
+        :return: Array of passenger slot indices, where 0 indicates an unallocated seat
+        """
+        return self._slots
+
+    def get_passenger_id(self, position):
+        """
+        Return the ID of the passenger allocated to the seat at the specified position in the seat ordering table
+
+        :param position: Position of the seat in the seat ordering table
+        :return: The passenger ID or None if the seat is unallocated
+        """
+        return self._passenger_ids[self._slots[position]]
+
+    def set_passenger_id(self, position, passenger_id):
+        """
+        Set the ID of the passenger allocated to the seat at the specified position in the seat ordering table
+
+        :param position: Position of the seat in the seat ordering table
+        :param passenger_id: The passenger ID or None to clear the allocation
+        """
+        if passenger_id is None:
+            self._slots[position] = 0
+            return
+
+        slot = self._get_passenger_slot(passenger_id)
+        if slot is None:
+            if len(self._passenger_ids) == MAXIMUM_PASSENGER_SLOTS:
+                self._compact_passenger_table()
+            slot = len(self._passenger_ids)
+            self._passenger_ids.append(passenger_id)
+
+        self._slots[position] = slot
+
+    def get_allocated_seat(self, passenger_id):
+        """
+        Return the seat number allocated to the passenger
+
+        :param passenger_id: Unique passenger identifier
+        :return: Seat number e.g. 3A if the passenger has a seat, otherwise None
+        """
+        slot = self._get_passenger_slot(passenger_id)
+        if slot is None:
+            return None
+
+        try:
+            return self._template.seat_numbers[self._slots.index(slot)]
+        except ValueError:
+            return None
+
+    def get_unallocated_seats(self):
+        """
+        Return a collection of unallocated seats
+
+        :return: A list of unallocated seat numbers
+        """
+        seat_numbers = self._template.seat_numbers
+        return [seat_numbers[position] for position, slot in enumerate(self._slots) if not slot]
+
+    def get_seat_allocations(self):
+        """
+        Return the seat allocations for the plan
+
+        :return: A list of (seat number, passenger ID) tuples for allocated seats
+        """
+        seat_numbers = self._template.seat_numbers
+        passenger_ids = self._passenger_ids
+        return [(seat_numbers[position], passenger_ids[slot]) for position, slot in enumerate(self._slots) if slot]
+
+    def to_dict(self):
+        """
+        Convert the plan to the equivalent dictionary-based seating plan, e.g. for serialisation
+
+        :return: A dictionary of rows where the row number is the key
+        """
+        return {key: (value.to_dict() if isinstance(value, _CompactRow) else value) for key, value in self.items()}
+
+    def _get_passenger_slot(self, passenger_id):
+        """
+        Return the slot index for a passenger in the passenger table
+
+        :param passenger_id: Unique passenger identifier
+        :return: The slot index or None if the passenger isn't in the table
+        """
+        if passenger_id is None:
+            return None
+
+        try:
+            return self._passenger_ids.index(passenger_id)
+        except ValueError:
+            return None
+
+    def _compact_passenger_table(self):
+        """
+        Rebuild the passenger table, discarding passengers that are no longer allocated to a seat
+        """
+        passenger_ids = [None]
+        new_slots = {}
+        for position, slot in enumerate(self._slots):
+            if slot:
+                new_slot = new_slots.get(slot)
+                if new_slot is None:
+                    new_slot = len(passenger_ids)
+                    passenger_ids.append(self._passenger_ids[slot])
+                    new_slots[slot] = new_slot
+                self._slots[position] = new_slot
+
+        if len(passenger_ids) == MAXIMUM_PASSENGER_SLOTS:
+            raise OverflowError("The passenger table for the compact seating plan is full")
+
+        self._passenger_ids = passenger_ids
+
+
+class _CompactRow(Mapping):
+    __slots__ = ("_plan", "_row_number", "_seat_positions")
+
+    def __init__(self, plan, row_number, seat_positions):
+        """
+        Initialise a view of a single row in a compact seating plan
+
+        :param plan: The compact seating plan
+        :param row_number: The row number
+        :param seat_positions: The range of positions for the seats in the row in the seat ordering table
+        """
+        self._plan = plan
+        self._row_number = row_number
+        self._seat_positions = seat_positions
+
+    def __getitem__(self, key):
+        if key == "class":
+            return self._plan.template.row_classes[self._row_number]
+        if key == "seats":
+            return _CompactSeats(self._plan, self._seat_positions)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield "class"
+        yield "seats"
+
+    def __len__(self):
+        return 2
+
+    def to_dict(self):
+        """
+        Convert the row to the equivalent dictionary-based row
+
+        :return: Dictionary containing the class and seats keys
+        """
+        return {"class": self["class"], "seats": dict(self["seats"])}
+
+
+class _CompactSeats(MutableMapping):
+    __slots__ = ("_plan", "_seat_positions")
+
+    def __init__(self, plan, seat_positions):
+        """
+        Initialise a view of the seats in a single row in a compact seating plan
+
+        :param plan: The compact seating plan
+        :param seat_positions: The range of positions for the seats in the row in the seat ordering table
+        """
+        self._plan = plan
+        self._seat_positions = seat_positions
+
+    def _get_position(self, seat_number):
+        position = self._plan.template.seat_index.get(seat_number)
+        if position is None or position not in self._seat_positions:
+            raise KeyError(seat_number)
+        return position
+
+    def __getitem__(self, seat_number):
+        return self._plan.get_passenger_id(self._get_position(seat_number))
+
+    def __setitem__(self, seat_number, passenger_id):
+        self._plan.set_passenger_id(self._get_position(seat_number), passenger_id)
+
+    def __delitem__(self, seat_number):
+        raise TypeError("Seats cannot be removed from a seating plan")
+
+    def __contains__(self, seat_number):
+        position = self._plan.template.seat_index.get(seat_number)
+        return position is not None and position in self._seat_positions
+
+    def __iter__(self):
+        seat_numbers = self._plan.template.seat_numbers
+        return (seat_numbers[position] for position in self._seat_positions)
+
+    def __len__(self):
+        return len(self._seat_positions)
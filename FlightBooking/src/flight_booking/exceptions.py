@@ -20,6 +20,10 @@ class InsufficientCapacityError(Exception):
     def __str__(self):
         return f"'{self.args[0]}' for aircraft {self._aircraft}, layout {self._layout}"
 
+    def __reduce__(self):
+        # Preserve the additional properties when the exception is pickled e.g. to return it from a worker process
+        return type(self), (self.args[0], self._aircraft, self._layout)
+
     def __repr__(self):
         return f"InsufficientCapacityError({self.args[0]!r}, {self._aircraft!r}, {self._layout!r})"
 
@@ -81,6 +85,9 @@ class SeatingPlanNotFoundError(Exception):
     def __str__(self):
         return f"{self.args[0]} for aircraft '{self._aircraft}', layout '{self._layout}'"
 
+    def __reduce__(self):
+        return type(self), (self.args[0], self._aircraft, self._layout)
+
     def __repr__(self):
         return f"SeatingPlanNotFoundError({self.args[0]!r}, {self._aircraft!r}, {self._layout!r})"
 
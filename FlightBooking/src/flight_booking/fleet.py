@@ -0,0 +1,264 @@
+"""
+This module contains functions for operating on saved flights in bulk, such as substituting the aircraft type for a
+selection of flights.
+
+Flights are selected from the flight data files in the flights data folder by departure date range, airline and the
+current aircraft and layout. The departure date is taken from the data file name, so files outside the date range are
+never opened, and only the details section at the start of the remaining files is read. Each selected flight is then
+processed in a pool of worker processes: the flight is loaded, its seat allocations are migrated to the seating plan
+for the new aircraft and layout and, if that succeeds, the flight data file is replaced atomically. A flight data file
+that can't be read or loaded doesn't stop the remaining flights being processed: it's reported as a failed result,
+with the exception as the error.
+
+The result for each flight is a dictionary of properties, as follows:
+
++-----------+---------------------------------------------------------------------------------------------------+
+| file_path | Full path to the flight data file                                                                 |
++-----------+---------------------------------------------------------------------------------------------------+
+| number    | The flight number                                                                                 |
++-----------+---------------------------------------------------------------------------------------------------+
+| departs   | The (UTC) departure date                                                                          |
++-----------+---------------------------------------------------------------------------------------------------+
+| succeeded | True if the flight was migrated to the new aircraft and saved, otherwise False                    |
++-----------+---------------------------------------------------------------------------------------------------+
+| error     | The exception that prevented the migration or None                                                |
++-----------+---------------------------------------------------------------------------------------------------+
+| report    | The migration report returned by Flight.load_seating() or None                                    |
++-----------+---------------------------------------------------------------------------------------------------+
+"""
+
+import datetime
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from .flight import Flight, DEPARTURE_DATE_FORMAT
+from .seating_plan import get_plan_template
+from .utils import get_data_folder
+from .exceptions import InsufficientCapacityError, SeatingPlanNotFoundError, AirportCodeNotFoundError
+
+# Number of characters read from the start of a flight data file when reading the flight details. The details are
+# written first and are much shorter than this, so the passengers and seating don't need to be parsed
+DETAILS_HEADER_SIZE = 4096
+
+# Flight data files are named number_YYYYMMDD.json, where the date is the (UTC) departure date
+_file_date_pattern = re.compile(r"_(\d{4})(\d{2})(\d{2})\.json$")
+_details_pattern = re.compile(r'\s*\{\s*"details"\s*:\s*')
+_details_decoder = json.JSONDecoder()
+
+# Exceptions raised when reading or loading a missing, unreadable or malformed flight data file
+_flight_file_errors = (OSError, ValueError, KeyError, TypeError, AirportCodeNotFoundError)
+
+
+def _get_file_departure_date(file_name):
+    """
+    Return the departure date encoded in the name of a flight data file
+
+    :param file_name: Name of the flight data file
+    :return: The (UTC) departure date or None if the file name doesn't include one
+    """
+    match = _file_date_pattern.search(file_name)
+    if match is None:
+        return None
+
+    try:
+        return datetime.date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def _read_flight_details(file_path):
+    """
+    Read the details section of a flight data file. Only the start of the file is read and decoded unless the
+    details aren't found there, in which case the whole file is parsed
+
+    :param file_path: Full path to the flight data file
+    :return: Dictionary of flight details
+    """
+    with open(file_path, mode="rt", encoding="utf-8") as f:
+        text = f.read(DETAILS_HEADER_SIZE)
+        match = _details_pattern.match(text)
+        if match is not None:
+            try:
+                return _details_decoder.raw_decode(text, match.end())[0]
+            except json.JSONDecodeError:
+                pass
+
+        return json.loads(text + f.read())["details"]
+
+
+def _is_in_date_range(departure_date, start_date, end_date):
+    """
+    Return True if a departure date is within a date range
+
+    :param departure_date: The (UTC) departure date
+    :param start_date: Earliest (UTC) departure date, inclusive, or None
+    :param end_date: Latest (UTC) departure date, inclusive, or None
+    :return: True if the departure date is in the range
+    """
+    return (start_date is None or departure_date >= start_date) and (end_date is None or departure_date <= end_date)
+
+
+def _select_flights(start_date, end_date, airline, aircraft, layout):
+    """
+    Return the paths and details of the saved flight data files matching the specified criteria. Files in the
+    date range whose details can't be read are returned with the exception in place of the details, as it's not
+    known whether they match the other criteria
+
+    :param start_date: Earliest (UTC) departure date, inclusive
+    :param end_date: Latest (UTC) departure date, inclusive
+    :param airline: Name of the airline
+    :param aircraft: Current aircraft model e.g. A320
+    :param layout: Current airline-specific layout name
+    :return: Sorted list of (file path, details dictionary or exception) tuples
+    """
+    folder = get_data_folder("flights")
+    selected = []
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.endswith(".json"):
+            continue
+
+        # Files outside the date range are skipped without being opened if the date is in the file name
+        departure_date = _get_file_departure_date(file_name)
+        if departure_date is not None and not _is_in_date_range(departure_date, start_date, end_date):
+            continue
+
+        file_path = os.path.join(folder, file_name)
+        try:
+            details = _read_flight_details(file_path)
+            departure_date = datetime.datetime.strptime(details["departs"], DEPARTURE_DATE_FORMAT).date()
+        except _flight_file_errors as e:
+            selected.append((file_path, e))
+            continue
+
+        if _is_in_date_range(departure_date, start_date, end_date) and \
+                (airline is None or details["airline"] == airline) and \
+                (aircraft is None or details["aircraft"] == aircraft) and \
+                (layout is None or details["layout"] == layout):
+            selected.append((file_path, details))
+
+    return selected
+
+
+def select_flight_files(start_date=None, end_date=None, airline=None, aircraft=None, layout=None):
+    """
+    Return the paths to the saved flight data files matching the specified criteria. Criteria that are None
+    are not applied and files whose details can't be read are skipped
+
+    :param start_date: Earliest (UTC) departure date, inclusive
+    :param end_date: Latest (UTC) departure date, inclusive
+    :param airline: Name of the airline
+    :param aircraft: Current aircraft model e.g. A320
+    :param layout: Current airline-specific layout name
+    :return: Sorted list of flight data file paths
+    """
+    return [
+        file_path
+        for file_path, details in _select_flights(start_date, end_date, airline, aircraft, layout)
+        if isinstance(details, dict)
+    ]
+
+
+def _create_result(file_path, error=None):
+    """
+    Create the result dictionary for a flight, initially reporting that it has not been migrated
+
+    :param file_path: Full path to the flight data file
+    :param error: The exception that prevented the migration or None
+    :return: Dictionary containing the result for the flight
+    """
+    return {
+        "file_path": file_path,
+        "number": None,
+        "departs": None,
+        "succeeded": False,
+        "error": error,
+        "report": None
+    }
+
+
+def swap_flight_equipment(file_path, aircraft, layout, class_aware=False):
+    """
+    Migrate a single saved flight to a new aircraft and layout and save it. This is the unit of work
+    performed by the worker processes but can also be called directly
+
+    :param file_path: Full path to the flight data file
+    :param aircraft: New aircraft model e.g. A320
+    :param layout: New airline-specific layout name
+    :param class_aware: If True, passengers are migrated to seats in the same seating class where possible
+    :return: Dictionary containing the result for the flight
+    """
+    result = _create_result(file_path)
+
+    try:
+        flight = Flight.load_flight_file(file_path)
+    except _flight_file_errors as e:
+        result["error"] = e
+        return result
+
+    try:
+        result["number"] = flight.number
+        result["departs"] = flight.departure_date
+        result["report"] = flight.load_seating(aircraft, layout, class_aware=class_aware)
+        if result["report"] is None or not result["report"]["unplaced"]:
+            flight.save()
+            result["succeeded"] = True
+    except (InsufficientCapacityError, SeatingPlanNotFoundError, ValueError, OSError) as e:
+        result["error"] = e
+
+    return result
+
+
+def swap_equipment(aircraft,
+                   layout,
+                   start_date=None,
+                   end_date=None,
+                   airline=None,
+                   from_aircraft=None,
+                   from_layout=None,
+                   class_aware=False,
+                   max_workers=None):
+    """
+    Substitute the aircraft and layout for a selection of saved flights, processing the flights in parallel
+    in a pool of worker processes. A flight is only saved if all of its seat allocations can be migrated
+
+    :param aircraft: New aircraft model e.g. A320
+    :param layout: New airline-specific layout name
+    :param start_date: Earliest (UTC) departure date, inclusive
+    :param end_date: Latest (UTC) departure date, inclusive
+    :param airline: Name of the airline
+    :param from_aircraft: Current aircraft model for the flights to change
+    :param from_layout: Current airline-specific layout name for the flights to change
+    :param class_aware: If True, passengers are migrated to seats in the same seating class where possible
+    :param max_workers: Maximum number of worker processes. Defaults to the number of processors and, if 1,
+        the flights are processed in the current process
+    :raises SeatingPlanNotFoundError: If there's no seating plan for the new aircraft and layout
+    :return: List of dictionaries containing the results for each flight, in data file name order
+    """
+    flights = _select_flights(start_date, end_date, airline, from_aircraft, from_layout)
+    file_paths = [file_path for file_path, details in flights if isinstance(details, dict)]
+
+    # Fail early if the target plan doesn't exist for any of the airlines involved, rather than once per flight
+    for name in {details["airline"] for _, details in flights if isinstance(details, dict)}:
+        get_plan_template(name, aircraft, layout)
+
+    if max_workers == 1 or len(file_paths) < 2:
+        results = [swap_flight_equipment(file_path, aircraft, layout, class_aware) for file_path in file_paths]
+    else:
+        # Flights are handed to the workers in chunks to reduce the inter-process overhead for large selections
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(swap_flight_equipment,
+                                        file_paths,
+                                        [aircraft] * len(file_paths),
+                                        [layout] * len(file_paths),
+                                        [class_aware] * len(file_paths),
+                                        chunksize=chunk_size))
+
+    # Merge in failed results for the files that couldn't be read, keeping the results in file name order
+    results_by_file_path = {result["file_path"]: result for result in results}
+    return [
+        results_by_file_path.get(file_path) or _create_result(file_path, details)
+        for file_path, details in flights
+    ]
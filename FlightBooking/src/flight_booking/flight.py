@@ -6,6 +6,17 @@ files.
 Instances of a Flight can be saved to JSON-formatted data files and subsequently re-created from the data held in
 those files.
 
+By default, passengers are held in a dictionary of passenger records keyed by passenger ID. Flights with a large
+number of passengers can be created or loaded with columnar_passengers=True, in which case the passengers property
+returns a PassengerStore that supports the same mapping operations along with column-wise filtering, sorting and
+export.
+
+Each flight has a version number that changes whenever the seating plan is loaded, passengers are added or removed or
+seats are allocated, so views of a flight, such as API responses and rendered seat maps, can be cached and
+invalidated when the flight changes. Version numbers are drawn from a process-wide counter, so they always increase
+and a flight that's been reloaded never reuses a version number from an earlier instance. Changes made directly to
+passenger properties, rather than through the Flight methods, don't change the version.
+
 Boarding Card Plugins
 =====================
 
@@ -51,16 +62,25 @@ The card_generator function receives a dictionary of properties, as follows:
 
 import json
 import datetime
+import itertools
+import os
 import pkg_resources
 from .seating_plan import read_plan, \
     allocate_seat, \
-    copy_seat_allocations, \
+    migrate_seat_allocations, \
     get_allocated_seat, \
-    get_unallocated_seats, \
     get_seat_allocations, \
-    clear_allocation
-from .utils import get_flight_file_path, get_boarding_card_path
-from .airport import get_airport
+    clear_allocation, \
+    build_free_run_index, \
+    update_free_run_index, \
+    get_first_free_seat, \
+    find_seat_block
+from .utils import get_flight_file_path
+from .boarding_cards import BoardingCardContext, generate_cards, generate_cards_async
+from .airport import get_airport, get_airport_timezone
+from .passenger import PassengerRecord
+from .passenger_store import PassengerStore
+from .instrumentation import timed, increment
 from .exceptions import InsufficientCapacityError, \
     FlightIsFullError, \
     DuplicatePassportNumberError, \
@@ -70,6 +90,9 @@ import pytz
 
 DEPARTURE_DATE_FORMAT = "%Y%m%d%H%M"
 
+# Source of flight version numbers, shared by all flights
+_versions = itertools.count(1)
+
 # Set comprehension that uses pkg_resources to identify entry point objects
 # for the boarding card printer. The load() method on these returns the module
 card_printer_plugins = {
@@ -86,8 +109,40 @@ card_generator_map = {
 }
 
 
+def _to_serialisable(o):
+    """
+    Default function for the JSON encoder, used to serialise objects that provide their own conversion to
+    a dictionary e.g. compact seating plans and passenger records
+
+    :param o: Object to serialise
+    :raises TypeError: If the object doesn't provide a conversion to a dictionary
+    :return: Dictionary representation of the object
+    """
+    try:
+        return o.to_dict()
+    except AttributeError as e:
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable") from e
+
+
+def _parse_departure_date(value):
+    """
+    Parse a departure date and time saved in a flight data file. This is equivalent to strptime() with the
+    DEPARTURE_DATE_FORMAT but avoids its overhead when loading large numbers of flights
+
+    :param value: Departure date and time in the format YYYYMMDDHHMM
+    :raises ValueError: If the value isn't in the expected format
+    :return: Naive datetime
+    """
+    if len(value) != 12 or not (value.isascii() and value.isdigit()):
+        raise ValueError(f"time data {value!r} does not match format {DEPARTURE_DATE_FORMAT!r}")
+    return datetime.datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]), int(value[8:10]), int(value[10:12]))
+
+
 class Flight:
-    def __init__(self, embarkation, destination, airline, number, departs, duration):
+    __slots__ = ("_embarkation", "_destination", "_airline", "_number", "_departs", "_duration", "_passengers",
+                 "_seating", "_free_runs", "_local_times", "_version")
+
+    def __init__(self, embarkation, destination, airline, number, departs, duration, columnar_passengers=False):
         """
         Initialise an instance of the Flight class. The flight properties should contain:
 
@@ -97,23 +152,81 @@ class Flight:
         :param number: Flight number
         :param departs: Departure time
         :param duration: Flight duration
+        :param columnar_passengers: If True, passengers are held in a columnar PassengerStore rather than a dictionary
         :raises AirportCodeNotFoundError: If embarkation or destination airport codes aren't recognised
         """
-        self._embarkation = get_airport(embarkation)
-        self._destination = get_airport(destination)
-        self._airline = airline
-        self._number = number
+        embarkation_airport = get_airport(embarkation)
+        destination_airport = get_airport(destination)
 
         # Store the departure date and time as UTC
         if departs.tzinfo is None:
-            departs_with_tz = pytz.timezone(self._embarkation["tz"]).localize(departs)
-            self._departs = departs_with_tz.astimezone(pytz.utc)
+            departs_with_tz = get_airport_timezone(embarkation_airport).localize(departs)
+            departs_utc = departs_with_tz.astimezone(pytz.utc)
         else:
-            self._departs = departs.astimezone(pytz.utc)
+            departs_utc = departs.astimezone(pytz.utc)
 
+        passengers = PassengerStore() if columnar_passengers else {}
+        self._initialise(embarkation_airport, destination_airport, airline, number, departs_utc, duration, passengers,
+                         None)
+
+    def _initialise(self, embarkation, destination, airline, number, departs, duration, passengers, seating):
+        """
+        Set the flight properties from normalised values. This is the common path for the constructor and
+        from_normalised()
+
+        :param embarkation: Airport dictionary for the point of embarkation
+        :param destination: Airport dictionary for the destination airport
+        :param airline: Name of the airline
+        :param number: Flight number
+        :param departs: Departure time as a timezone-aware UTC datetime
+        :param duration: Flight duration
+        :param passengers: Mapping of passenger ID to passenger
+        :param seating: Seating plan or None
+        """
+        self._embarkation = embarkation
+        self._destination = destination
+        self._airline = airline
+        self._number = number
+        self._departs = departs
         self._duration = duration
-        self._passengers = {}
-        self._seating = None
+        self._passengers = passengers
+        self._seating = seating
+
+        # Index of runs of adjacent unallocated seats in each row, built on demand and then kept up to date
+        # as seats are allocated and cleared
+        self._free_runs = None
+
+        # Local departure and arrival times and their formatted representations, computed on demand and
+        # recomputed only if the departure time or duration change
+        self._local_times = None
+
+        self._version = next(_versions)
+
+    @classmethod
+    def from_normalised(cls, embarkation, destination, airline, number, departs, duration, passengers=None,
+                        seating=None):
+        """
+        Create a flight from data that has already been validated and normalised, without looking up the airports or
+        converting the departure time. This is intended for loading large numbers of flights, such as when rebuilding
+        indexes
+
+        :param embarkation: Airport dictionary for the point of embarkation, as returned by get_airport()
+        :param destination: Airport dictionary for the destination airport, as returned by get_airport()
+        :param airline: Name of the airline
+        :param number: Flight number
+        :param departs: Departure time in UTC, either timezone-aware or naive
+        :param duration: Flight duration
+        :param passengers: Mapping of passenger ID to passenger or None for no passengers
+        :param seating: Seating plan or None if a seating plan hasn't been loaded
+        :return: A new Flight instance
+        """
+        if departs.tzinfo is None:
+            departs = departs.replace(tzinfo=pytz.utc)
+
+        flight = cls.__new__(cls)
+        flight._initialise(embarkation, destination, airline, number, departs, duration,
+                           {} if passengers is None else passengers, seating)
+        return flight
 
     def __repr__(self):
         return f"{type(self).__name__}(" \
@@ -129,7 +242,7 @@ class Flight:
         # As __format__ hasn't been overridden, it'll delegate to __str__ and produce the same output
         return f"{self._airline} {self._number} " \
                f"{self._embarkation['code']} to {self._destination['code']}, " \
-               f"{self.departs_localtime.strftime('%d-%b-%Y %H:%M %p')}"
+               f"{self._format_local_time(False, '%d-%b-%Y %H:%M %p')}"
 
     def _departure_time_repr(self):
         """
@@ -227,8 +340,7 @@ class Flight:
 
         :return: The departure time converted to localtime for the point of embarkation
         """
-        embarkation_timezone = pytz.timezone(self._embarkation["tz"])
-        return self._departs.astimezone(embarkation_timezone)
+        return self._get_local_times()[1]
 
     @property
     def arrives_localtime(self):
@@ -237,9 +349,7 @@ class Flight:
 
         :return: The arrival date and time converted to localtime for the destination
         """
-        arrives_utc = self._departs + self._duration
-        destination_timezone = pytz.timezone(self._destination["tz"])
-        return arrives_utc.astimezone(destination_timezone)
+        return self._get_local_times()[2]
 
     @property
     def duration(self):
@@ -277,6 +387,16 @@ class Flight:
         """
         return self._passengers
 
+    @property
+    def version(self):
+        """
+        Return the version number of the flight, which changes whenever the seating plan, passengers or seat
+        allocations change
+
+        :return: Version number
+        """
+        return self._version
+
     @property
     def printable_details(self):
         """
@@ -289,14 +409,14 @@ class Flight:
             f"Flight Number  : {self._number}",
             f"Embarkation    : {self._embarkation['code']}",
             f"Destination    : {self._destination['code']}",
-            f"Departs        : {self.departs_localtime.strftime('%Y-%m-%d %H:%M:00')}",
+            f"Departs        : {self._format_local_time(False, '%Y-%m-%d %H:%M:00')}",
             f"Duration       : {self._duration}",
             f"Aircraft       : {self.aircraft}",
             f"Seating Layout : {self.layout}",
             f"Capacity       : {self.capacity}"
         ]
 
-    def load_seating(self, aircraft, layout):
+    def load_seating(self, aircraft, layout, compact=False, class_aware=False):
         """
         Given an aircraft name and (optional) layout, load and return the
         seating plan. If there's an existing seating plan with seat allocations,
@@ -304,9 +424,12 @@ class Flight:
 
         :param aircraft: Aircraft model e.g. A320
         :param layout: Airline-specific layout name
+        :param compact: If True, the seating plan is held as a CompactSeatingPlan to reduce memory use
+        :param class_aware: If True, passengers are migrated to seats in the same seating class where possible
         :raises InsufficientCapacityError: If the selected plan doesn't have capacity for all the passengers
+        :return: The migration report returned by migrate_seat_allocations() or None if there was no existing plan
         """
-        to_plan = read_plan(self._airline, aircraft, layout)
+        to_plan = read_plan(self._airline, aircraft, layout, compact=compact)
         if to_plan["capacity"] < len(self.passengers):
             raise InsufficientCapacityError(
                 f"{aircraft} layout {layout} does not have enough seats for the current passengers",
@@ -314,10 +437,14 @@ class Flight:
                 layout=layout
             )
 
+        report = None
         if self._seating is not None:
-            copy_seat_allocations(self._seating, to_plan)
+            report = migrate_seat_allocations(self._seating, to_plan, class_aware=class_aware)
 
         self._seating = to_plan
+        self._free_runs = None
+        self._version = next(_versions)
+        return report
 
     def add_passenger(self, passenger):
         """
@@ -334,15 +461,21 @@ class Flight:
         if self._seating and len(self._passengers) == self.capacity:
             raise FlightIsFullError("The flight is full")
 
-        passport_numbers = [p["passport_number"] for p in self._passengers.values()]
         number = passenger["passport_number"]
-        if number in passport_numbers:
+        if isinstance(self._passengers, PassengerStore):
+            is_duplicate = self._passengers.contains_value("passport_number", number)
+        else:
+            is_duplicate = number in [p["passport_number"] for p in self._passengers.values()]
+
+        if is_duplicate:
             raise DuplicatePassportNumberError(
                 f"Passenger with passport number {number} is already on this flight",
                 number=number
             )
 
         self._passengers[passenger["id"]] = passenger
+        self._version = next(_versions)
+        increment("flight.passengers_added")
 
     def remove_passenger(self, passenger_id):
         """
@@ -354,7 +487,10 @@ class Flight:
             seat_number = get_allocated_seat(self._seating, passenger_id)
             if seat_number is not None:
                 clear_allocation(self._seating, seat_number)
+                self._update_free_runs(seat_number, True)
         del self.passengers[passenger_id]
+        self._version = next(_versions)
+        increment("flight.passengers_removed")
 
     def allocate_seat(self, seat_number, passenger_id):
         """
@@ -367,7 +503,32 @@ class Flight:
         """
         if passenger_id not in self._passengers.keys():
             raise ValueError(f"Passenger {passenger_id} is not on this flight")
-        allocate_seat(self._seating, seat_number, passenger_id)
+
+        previous_seat_number = allocate_seat(self._seating, seat_number, passenger_id)
+        if previous_seat_number != seat_number:
+            if previous_seat_number is not None:
+                self._update_free_runs(previous_seat_number, True)
+            self._update_free_runs(seat_number, False)
+        self._version = next(_versions)
+        increment("flight.seats_allocated")
+
+    def clear_seat_allocation(self, passenger_id):
+        """
+        Clear the seat allocation for a passenger, leaving them on the flight without a seat
+
+        :param passenger_id: Unique passenger identifier
+        :raises ValueError: If the passenger is not associated with the flight
+        :return: The seat number that was allocated to the passenger or None if they didn't have a seat
+        """
+        if passenger_id not in self._passengers.keys():
+            raise ValueError(f"Passenger {passenger_id} is not on this flight")
+
+        seat_number = get_allocated_seat(self._seating, passenger_id) if self._seating is not None else None
+        if seat_number is not None:
+            clear_allocation(self._seating, seat_number)
+            self._update_free_runs(seat_number, True)
+            self._version = next(_versions)
+        return seat_number
 
     def allocate_next_empty_seat(self, passenger_id):
         """
@@ -376,14 +537,73 @@ class Flight:
 
         :param passenger_id: Unique passenger identifier
         :raises InvalidOperationError: If a seating plan has not been loaded
+        :raises FlightIsFullError: If there are no unallocated seats
         """
         if not self._seating:
             # Empty sequence or None will be falsy
             raise InvalidOperationError("Cannot allocate the next seat if there is no seating plan")
 
-        next_seat = get_unallocated_seats(self._seating)[0]
+        next_seat = get_first_free_seat(self._get_free_runs())
+        if next_seat is None:
+            raise FlightIsFullError("There are no unallocated seats on the flight")
+
         self.allocate_seat(next_seat, passenger_id)
 
+    def allocate_group_seats(self, passenger_ids, allow_split=True):
+        """
+        Allocate a block of adjacent seats to a group of passengers, such as a family booked together. The
+        group is seated in a single row, if possible, and otherwise across the fewest adjacent rows. Any
+        existing seat allocations for members of the group are released before the block is chosen and are
+        restored if no seats can be allocated
+
+        :param passenger_ids: List of unique passenger identifiers
+        :param allow_split: If True and there's no suitable block of seats, the group is allocated the next
+            unallocated seats from front to back
+        :raises InvalidOperationError: If a seating plan has not been loaded or there's no suitable block of seats
+        :raises ValueError: If any passenger is not associated with the flight or appears more than once
+        :return: List of the seat numbers allocated, in the same order as the passenger IDs
+        """
+        if not self._seating:
+            raise InvalidOperationError("Cannot allocate seats to a group if there is no seating plan")
+
+        if len(set(passenger_ids)) != len(passenger_ids):
+            raise ValueError("Each passenger may only appear once in a group")
+
+        for passenger_id in passenger_ids:
+            if passenger_id not in self._passengers.keys():
+                raise ValueError(f"Passenger {passenger_id} is not on this flight")
+
+        # Release any existing seats so they're available to the group, recording them so they can be restored if
+        # no seats can be found
+        free_runs = self._get_free_runs()
+        previous_seat_numbers = {}
+        for passenger_id in passenger_ids:
+            seat_number = get_allocated_seat(self._seating, passenger_id)
+            if seat_number is not None:
+                clear_allocation(self._seating, seat_number)
+                update_free_run_index(free_runs, seat_number, True)
+                previous_seat_numbers[passenger_id] = seat_number
+
+        seat_numbers = find_seat_block(free_runs, len(passenger_ids))
+        if seat_numbers is None and allow_split:
+            seat_numbers = [seat_number for entry in free_runs.values()
+                            for start, stop in entry["runs"]
+                            for seat_number in entry["seats"][start:stop]][:len(passenger_ids)]
+
+        if seat_numbers is None or len(seat_numbers) < len(passenger_ids):
+            for passenger_id, seat_number in previous_seat_numbers.items():
+                allocate_seat(self._seating, seat_number, passenger_id)
+                update_free_run_index(free_runs, seat_number, False)
+
+            if seat_numbers is None:
+                raise InvalidOperationError(f"There is no block of {len(passenger_ids)} adjacent seats available")
+            raise InvalidOperationError(f"There are fewer than {len(passenger_ids)} seats available")
+
+        for seat_number, passenger_id in zip(seat_numbers, passenger_ids):
+            self.allocate_seat(seat_number, passenger_id)
+
+        return seat_numbers
+
     def get_allocated_seat(self, passenger_id):
         """
         Return the seat allocation for the passenger with the specified ID
@@ -406,6 +626,58 @@ class Flight:
                 for seat_number, pid
                 in get_seat_allocations(self._seating)]
 
+    def _get_local_times(self):
+        """
+        Return the local departure and arrival times, computing them if they haven't been computed or the
+        departure time or duration have changed since they were
+
+        :return: Tuple of the (UTC departure, duration) key, local departure time, local arrival time and a
+            dictionary of formatted times
+        """
+        key = (self._departs, self._duration)
+        if self._local_times is None or self._local_times[0] != key:
+            departs = self._departs.astimezone(get_airport_timezone(self._embarkation))
+            arrives = (self._departs + self._duration).astimezone(get_airport_timezone(self._destination))
+            self._local_times = (key, departs, arrives, {})
+        return self._local_times
+
+    def _format_local_time(self, arrival, time_format):
+        """
+        Return the local departure or arrival time formatted using the specified format, caching the result
+
+        :param arrival: True to format the local arrival time, False to format the local departure time
+        :param time_format: strftime() format string
+        :return: The formatted local time
+        """
+        _, departs, arrives, formatted = self._get_local_times()
+        try:
+            return formatted[(arrival, time_format)]
+        except KeyError:
+            text = formatted[(arrival, time_format)] = (arrives if arrival else departs).strftime(time_format)
+            return text
+
+    def _get_free_runs(self):
+        """
+        Return the index of runs of adjacent unallocated seats, building it if necessary
+
+        :return: The free run index
+        """
+        if self._free_runs is None:
+            self._free_runs = build_free_run_index(self._seating)
+        return self._free_runs
+
+    def _update_free_runs(self, seat_number, is_free):
+        """
+        Update the index of runs of adjacent unallocated seats, if it's been built, following a change to
+        the allocation of a seat
+
+        :param seat_number: The seat number e.g. 3A
+        :param is_free: True if the seat has become unallocated, False if it has been allocated
+        """
+        if self._free_runs is not None:
+            update_free_run_index(self._free_runs, seat_number, is_free)
+
+    @timed("flight.to_json")
     def to_json(self):
         """
         Convert the core flight data, passenger list and seating plan to JSON
@@ -426,29 +698,59 @@ class Flight:
 
         # Construct the JSON, reload it and pretty-print it
         json_data = '{' + f'"details": {details_json}, ' \
-                          f'"passengers": {json.dumps(self._passengers)}, ' \
-                          f'"seating": {json.dumps(self._seating)} ' + '} '
+                          f'"passengers": {json.dumps(self._passengers, default=_to_serialisable)}, ' \
+                          f'"seating": {json.dumps(self._seating, default=_to_serialisable)} ' + '} '
         loaded = json.loads(json_data)
         return json.dumps(loaded, indent=3, sort_keys=False)
 
+    @timed("flight.save")
     def save(self):
         """
-        Write the flight data to a data file in JSON format
+        Write the flight data to a data file in JSON format, replacing any existing data file atomically
         """
         file_path = get_flight_file_path(self._number, self._departs)
-        print(file_path)
-        with open(file_path, mode="wt", encoding="utf-8") as f:
-            f.write(self.to_json())
 
-    def generate_boarding_cards(self, card_format, gate):
+        # Write to a temporary file and then replace the flight data file, so the data file is never left
+        # partially written
+        temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_file_path, mode="wt", encoding="utf-8") as f:
+                f.write(self.to_json())
+            os.replace(temporary_file_path, file_path)
+        finally:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+
+    def create_card_context(self, card_format, gate):
         """
-        Generate boarding cards in the specified format
+        Create the context for generating boarding cards for this flight, holding the card details that are
+        the same for every passenger
+
+        :param card_format: The format for the generated card data files
+        :param gate: The gate number the flight will depart from
+        :return: An instance of the BoardingCardContext class
+        """
+        return BoardingCardContext({
+            "gate": gate,
+            "airline": self._airline,
+            "embarkation_name": self._embarkation["name"],
+            "embarkation": self._embarkation["code"],
+            "departs": self._format_local_time(False, "%I:%M %p"),
+            "destination_name": self._destination["name"],
+            "destination": self._destination["code"],
+            "arrives": self._format_local_time(True, "%I:%M %p")
+        }, self._number, self._departs, card_format)
+
+    def _get_card_generator(self, card_format, gate):
+        """
+        Check boarding cards can be generated and return the seat allocations and the card generator
 
         :param card_format: The format for the generated card data file
         :param gate: The gate number the flight will depart from
         :raises ValueError: If the gate is None or blank
         :raises InvalidOperationError: If a seating plan has not been loaded
         :raises MissingBoardingCardPluginError: If there is no plugin available for the requested format
+        :return: Tuple of the seat allocations and the card generator function
         """
         if not gate:
             raise ValueError("Gate must be specified to print boarding cards")
@@ -466,56 +768,93 @@ class Flight:
                 card_format=card_format
             ) from e
 
-        for seat_number, passenger in allocations:
-            # Construct the card details for this passenger and generate the card
-            card_data = generator({
-                "gate": gate,
-                "airline": self._airline,
-                "embarkation_name": self._embarkation["name"],
-                "embarkation": self._embarkation["code"],
-                "departs": self.departs_localtime.strftime("%I:%M %p"),
-                "destination_name": self._destination["name"],
-                "destination": self._destination["code"],
-                "arrives": self.arrives_localtime.strftime("%I:%M %p"),
-                "name": passenger["name"],
-                "seat_number": seat_number
-            })
-
-            # Write the card to a file
-            card_file_path = get_boarding_card_path(self._number, seat_number, self._departs, card_format)
-            if isinstance(card_data, str):
-                with open(card_file_path, mode="wt", encoding="utf-8") as f:
-                    f.write(card_data)
-            else:
-                with open(card_file_path, mode="wb") as f:
-                    f.write(card_data)
+        return allocations, generator
+
+    def generate_boarding_cards(self, card_format, gate, force=False):
+        """
+        Generate boarding cards in the specified format. Only cards whose details have changed since they were
+        last generated are rendered and cards for seats that are no longer allocated are deleted
+
+        :param card_format: The format for the generated card data file
+        :param gate: The gate number the flight will depart from
+        :param force: If True, all cards are generated regardless of whether they've changed
+        :raises ValueError: If the gate is None or blank
+        :raises InvalidOperationError: If a seating plan has not been loaded
+        :raises MissingBoardingCardPluginError: If there is no plugin available for the requested format
+        :return: Dictionary of lists of the seat numbers for generated, unchanged and deleted cards
+        """
+        allocations, generator = self._get_card_generator(card_format, gate)
+        return generate_cards(self.create_card_context(card_format, gate), generator, allocations, force=force)
+
+    async def generate_boarding_cards_async(self, card_format, gate, max_concurrency=4, queue_size=None,
+                                            executor=None, force=False):
+        """
+        Generate boarding cards in the specified format asynchronously, rendering the cards in an executor and
+        pipelining the writes through a bounded queue. Only cards whose details have changed since they were
+        last generated are rendered and cards for seats that are no longer allocated are deleted
+
+        :param card_format: The format for the generated card data file
+        :param gate: The gate number the flight will depart from
+        :param max_concurrency: Maximum number of cards being rendered at once and the number of writer tasks
+        :param queue_size: Maximum number of rendered cards waiting to be written. Defaults to twice the concurrency
+        :param executor: Executor for rendering and writing the cards or None for the event loop's default executor
+        :param force: If True, all cards are generated regardless of whether they've changed
+        :raises ValueError: If the gate is None or blank or the concurrency or queue size is less than 1
+        :raises InvalidOperationError: If a seating plan has not been loaded
+        :raises MissingBoardingCardPluginError: If there is no plugin available for the requested format
+        :return: Dictionary of lists of the seat numbers for generated, unchanged and deleted cards
+        """
+        allocations, generator = self._get_card_generator(card_format, gate)
+        return await generate_cards_async(self.create_card_context(card_format, gate),
+                                          generator,
+                                          allocations,
+                                          max_concurrency=max_concurrency,
+                                          queue_size=queue_size,
+                                          executor=executor,
+                                          force=force)
 
     @staticmethod
-    def load_flight(number, departs):
+    def load_flight(number, departs, columnar_passengers=False):
         """
         Load a previously saved flight data file
 
         :param number: The flight number
         :param departs: The departure date and time for the flight
+        :param columnar_passengers: If True, passengers are held in a columnar PassengerStore rather than a dictionary
+        :return: A new Flight instance initialised from the data in the flight data file
+        """
+        return Flight.load_flight_file(get_flight_file_path(number, departs), columnar_passengers)
+
+    @staticmethod
+    @timed("flight.load_flight")
+    def load_flight_file(file_path, columnar_passengers=False):
+        """
+        Load a previously saved flight data file, given its path
+
+        :param file_path: Full path to the flight data file
+        :param columnar_passengers: If True, passengers are held in a columnar PassengerStore rather than a dictionary
         :return: A new Flight instance initialised from the data in the flight data file
         """
         # Read the JSON file
-        file_path = get_flight_file_path(number, departs)
         with open(file_path, mode="rt", encoding="utf-8") as f:
             json_data = json.load(f)
 
-        # Create a new flight
-        flight = Flight(
-            airline=json_data["details"]["airline"],
-            number=json_data["details"]["number"],
-            embarkation=json_data["details"]["embarkation"],
-            destination=json_data["details"]["destination"],
-            departs=datetime.datetime.strptime(json_data["details"]["departs"], DEPARTURE_DATE_FORMAT),
-            duration=datetime.timedelta(seconds=int(json_data["details"]["duration"]))
+        if columnar_passengers:
+            passengers = PassengerStore(json_data["passengers"].values())
+        else:
+            passengers = {passenger_id: PassengerRecord.from_dict(passenger)
+                          for passenger_id, passenger in json_data["passengers"].items()}
+
+        # The departure time is saved in UTC, so the flight is created from the normalised data rather than
+        # converting the departure time from the embarkation airport's local time
+        details = json_data["details"]
+        return Flight.from_normalised(
+            embarkation=get_airport(details["embarkation"]),
+            destination=get_airport(details["destination"]),
+            airline=details["airline"],
+            number=details["number"],
+            departs=_parse_departure_date(details["departs"]),
+            duration=datetime.timedelta(seconds=int(details["duration"])),
+            passengers=passengers,
+            seating=json_data["seating"]
         )
-
-        # Assign the passenger list and the seating plan
-        flight._passengers = json_data["passengers"]
-        flight._seating = json_data["seating"]
-
-        return flight
@@ -0,0 +1,334 @@
+"""
+This module provides instrumentation hooks for the flight booking package. Named timers and counters are placed
+around the operations where time is spent, such as reading seating plans, allocating seats, serialising and loading
+flights, calling boarding card plugins and writing boarding card files, and the measurements are passed to any sinks
+that have been registered.
+
+When no sinks are registered, instrumentation is disabled and the cost of a timed call is a check of the sink list,
+so the hooks can be left in place in production code.
+
+A sink is any object with the following methods:
+
++-------------------------+-------------------------------------------------------------------------------------------+
+| timing(name, seconds)   | Called with the name of a timed operation and its duration in seconds                     |
++-------------------------+-------------------------------------------------------------------------------------------+
+| count(name, value)      | Called with the name of a counter and the amount by which it's been incremented           |
++-------------------------+-------------------------------------------------------------------------------------------+
+
+The following sinks are provided:
+
++-----------------+-------------------------------------------------------------------------------------------------+
+| LogSink         | Writes each measurement to a logger                                                             |
++-----------------+-------------------------------------------------------------------------------------------------+
+| HistogramSink   | Holds the measurements in memory, as histograms of durations and counter totals, and produces a |
+|                 | per-operation summary report                                                                    |
++-----------------+-------------------------------------------------------------------------------------------------+
+| StatsdSink      | Sends each measurement to a statsd-style listener over UDP                                      |
++-----------------+-------------------------------------------------------------------------------------------------+
+
+For example, to collect and print timings for a batch of work:
+
+::
+
+    sink = HistogramSink()
+    add_sink(sink)
+    try:
+        ...
+    finally:
+        remove_sink(sink)
+    print(sink.report())
+
+Measurements are made in the process and thread in which the operation runs. Boarding cards rendered in a process
+pool, for example, are not timed unless sinks are also registered in the worker processes.
+"""
+
+import functools
+import logging
+import math
+import socket
+import threading
+import time
+
+# Registered sinks. This is replaced, rather than modified, when sinks are added or removed so measurements being
+# reported in other threads see a consistent list
+_sinks = ()
+_sinks_lock = threading.Lock()
+
+
+def add_sink(sink):
+    """
+    Register a sink to receive measurements
+
+    :param sink: Object with timing(name, seconds) and count(name, value) methods
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink):
+    """
+    Unregister a sink. Removing a sink that isn't registered has no effect
+
+    :param sink: Previously registered sink
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def clear_sinks():
+    """
+    Unregister all sinks, disabling instrumentation
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = ()
+
+
+def is_enabled():
+    """
+    Return True if any sinks are registered
+
+    :return: True if instrumentation is enabled
+    """
+    return len(_sinks) > 0
+
+
+def record_timing(name, seconds):
+    """
+    Pass a timing to the registered sinks
+
+    :param name: Name of the timed operation
+    :param seconds: Duration of the operation in seconds
+    """
+    for sink in _sinks:
+        sink.timing(name, seconds)
+
+
+def increment(name, value=1):
+    """
+    Increment a named counter
+
+    :param name: Name of the counter
+    :param value: Amount by which to increment the counter
+    """
+    for sink in _sinks:
+        sink.count(name, value)
+
+
+class _Timer:
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name):
+        """
+        Initialise a timer for a block of code
+
+        :param name: Name of the timed operation
+        """
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        record_timing(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_null_timer = _NullTimer()
+
+
+def timer(name):
+    """
+    Return a context manager that times the block it contains. If instrumentation is disabled, a shared no-op
+    context manager is returned
+
+    :param name: Name of the timed operation
+    :return: Context manager
+    """
+    return _Timer(name) if _sinks else _null_timer
+
+
+def timed(name):
+    """
+    Decorator that times each call to the decorated function
+
+    :param name: Name of the timed operation
+    :return: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class LogSink:
+    def __init__(self, logger=None, level=logging.DEBUG):
+        """
+        Initialise a sink that writes measurements to a logger
+
+        :param logger: Logger to write to or None for the flight_booking.instrumentation logger
+        :param level: Logging level for the measurements
+        """
+        self._logger = logger or logging.getLogger(__name__)
+        self._level = level
+
+    def timing(self, name, seconds):
+        self._logger.log(self._level, "%s took %.3f ms", name, seconds * 1000)
+
+    def count(self, name, value):
+        self._logger.log(self._level, "%s incremented by %d", name, value)
+
+
+class HistogramSink:
+    # Durations are counted in buckets whose upper bounds increase by a factor of 2, starting at 1 microsecond
+    BUCKET_BASE = 0.000001
+
+    def __init__(self):
+        """
+        Initialise a sink that holds histograms of durations and counter totals in memory
+        """
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+
+    def timing(self, name, seconds):
+        bucket = max(0, math.ceil(math.log2(seconds / self.BUCKET_BASE))) if seconds > 0 else 0
+        with self._lock:
+            histogram = self._timings.get(name)
+            if histogram is None:
+                histogram = self._timings[name] = {"count": 0, "total": 0.0, "min": seconds, "max": seconds,
+                                                   "buckets": {}}
+            histogram["count"] += 1
+            histogram["total"] += seconds
+            histogram["min"] = min(histogram["min"], seconds)
+            histogram["max"] = max(histogram["max"], seconds)
+            histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+
+    def count(self, name, value):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        """
+        Discard all measurements
+        """
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def _get_percentile(self, histogram, percentile):
+        """
+        Return an estimate of a percentile of the durations in a histogram, as the upper bound of the bucket
+        containing it, limited to the maximum duration
+
+        :param histogram: Histogram dictionary
+        :param percentile: Percentile to estimate, between 0 and 100
+        :return: Estimated duration in seconds
+        """
+        target = histogram["count"] * percentile / 100
+        cumulative = 0
+        for bucket in sorted(histogram["buckets"]):
+            cumulative += histogram["buckets"][bucket]
+            if cumulative >= target:
+                return min(self.BUCKET_BASE * 2 ** bucket, histogram["max"])
+        return histogram["max"]
+
+    def summary(self):
+        """
+        Return a summary of the measurements
+
+        :return: Dictionary with a "timings" key holding a dictionary of count, total, mean, min, max, p50 and p95
+            durations in seconds for each operation and a "counters" key holding a dictionary of counter totals
+        """
+        with self._lock:
+            timings = {
+                name: {
+                    "count": histogram["count"],
+                    "total": histogram["total"],
+                    "mean": histogram["total"] / histogram["count"],
+                    "min": histogram["min"],
+                    "max": histogram["max"],
+                    "p50": self._get_percentile(histogram, 50),
+                    "p95": self._get_percentile(histogram, 95)
+                }
+                for name, histogram in self._timings.items()
+            }
+            return {"timings": timings, "counters": dict(self._counters)}
+
+    def report(self):
+        """
+        Return a printable per-operation summary report, with durations in milliseconds. Percentiles are estimated
+        from the histograms
+
+        :return: Report as a string
+        """
+        summary = self.summary()
+        width = max([len(name) for name in list(summary["timings"]) + list(summary["counters"])] + [9])
+        lines = [f"{'Operation'.ljust(width)} {'Count':>8} {'Total':>10} {'Mean':>10} {'Min':>10} {'P50':>10} "
+                 f"{'P95':>10} {'Max':>10}"]
+        for name in sorted(summary["timings"]):
+            t = summary["timings"][name]
+            lines.append(f"{name.ljust(width)} {t['count']:8d} " +
+                         " ".join(f"{t[key] * 1000:10.3f}" for key in ["total", "mean", "min", "p50", "p95", "max"]))
+
+        for name in sorted(summary["counters"]):
+            lines.append(f"{name.ljust(width)} {summary['counters'][name]:8d}")
+
+        return "\n".join(lines)
+
+
+class StatsdSink:
+    def __init__(self, host="127.0.0.1", port=8125, prefix="flight_booking"):
+        """
+        Initialise a sink that sends measurements to a statsd-style listener over UDP. Sending is best-effort:
+        measurements that can't be sent are discarded
+
+        :param host: Host name or address of the listener
+        :param port: UDP port of the listener
+        :param prefix: Prefix added to each measurement name
+        """
+        self._address = (host, port)
+        self._prefix = f"{prefix}." if prefix else ""
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def _send(self, message):
+        try:
+            self._socket.sendto(message.encode("utf-8"), self._address)
+        except OSError:
+            pass
+
+    def timing(self, name, seconds):
+        self._send(f"{self._prefix}{name}:{seconds * 1000:.3f}|ms")
+
+    def count(self, name, value):
+        self._send(f"{self._prefix}{name}:{value}|c")
+
+    def close(self):
+        """
+        Close the UDP socket
+        """
+        self._socket.close()
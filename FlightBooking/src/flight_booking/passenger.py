@@ -1,15 +1,117 @@
 """
-This module contains methods for managing passengers. Each passenger is represented as a dictionary of properties. On
-creation, each passenger is allocated a unique identifier (GUID) that is assigned to their seat in the seating plan
-when the seat is allocated.
+This module contains methods for managing passengers. Each passenger is represented as a PassengerRecord, a compact
+record that behaves as a dictionary of properties. On creation, each passenger is allocated a unique identifier
+(GUID) that is assigned to their seat in the seating plan when the seat is allocated.
+
+A passenger record holds its properties in slots rather than in a per-instance dictionary and interns the properties
+that are shared by many passengers, such as nationality, so a large number of passengers uses significantly less
+memory than the equivalent dictionaries. The record supports reading and updating the properties using dictionary
+syntax, so existing code using passenger["name"] continues to work, but properties can't be added or removed. Records
+are converted to dictionaries, using to_dict(), for JSON serialisation.
 """
 
+import sys
 import uuid
+from collections.abc import MutableMapping
+
+# Passenger properties, in the order in which they're returned by a passenger record
+PASSENGER_FIELDS = ("id", "name", "gender", "dob", "nationality", "residency", "passport_number")
+
+# Properties with a small number of distinct values that are interned so passengers share the same string objects
+INTERNED_FIELDS = frozenset(("gender", "nationality", "residency"))
+
+_PASSENGER_FIELD_SET = frozenset(PASSENGER_FIELDS)
+
+
+def _intern(value):
+    """
+    Intern a property value if it's a string. Other values, such as None, are returned unchanged
+
+    :param value: Property value
+    :return: The interned string or the original value
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+class PassengerRecord(MutableMapping):
+    __slots__ = PASSENGER_FIELDS
+
+    def __init__(self, passenger_id, name, gender, dob, nationality, residency, passport_number):
+        """
+        Initialise a passenger record. Validation is performed by create_passenger(), rather than here, so records
+        can be created quickly from previously validated data
+
+        :param passenger_id: Unique identifier for the passenger
+        :param name: Full name of the passenger
+        :param gender: Passenger's gender
+        :param dob: Passenger's date of birth in the format YYYYMMDD
+        :param nationality: Passenger's nationality
+        :param residency: Passenger's country of residency
+        :param passport_number: Passenger's passport number
+        """
+        self.id = passenger_id
+        self.name = name
+        self.gender = _intern(gender)
+        self.dob = dob
+        self.nationality = _intern(nationality)
+        self.residency = _intern(residency)
+        self.passport_number = passport_number
+
+    @classmethod
+    def from_dict(cls, properties):
+        """
+        Create a passenger record from a dictionary of passenger properties, such as one read from a flight data file
+
+        :param properties: Dictionary of passenger properties
+        :raises KeyError: If any of the properties are missing
+        :return: A new PassengerRecord instance
+        """
+        return cls(*[properties[field] for field in PASSENGER_FIELDS])
+
+    def __repr__(self):
+        return f"{type(self).__name__}(" + ", ".join(f"{field}={getattr(self, field)!r}"
+                                                     for field in PASSENGER_FIELDS) + ")"
+
+    def __getitem__(self, key):
+        if key not in _PASSENGER_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _PASSENGER_FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+
+    def __delitem__(self, key):
+        raise TypeError("Properties cannot be removed from a passenger")
+
+    def __contains__(self, key):
+        return key in _PASSENGER_FIELD_SET
+
+    def __iter__(self):
+        return iter(PASSENGER_FIELDS)
+
+    def __len__(self):
+        return len(PASSENGER_FIELDS)
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in PASSENGER_FIELDS)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def to_dict(self):
+        """
+        Return the passenger properties as a dictionary
+
+        :return: Dictionary of passenger properties
+        """
+        return {field: getattr(self, field) for field in PASSENGER_FIELDS}
 
 
 def create_passenger(name, gender, dob, nationality, residency, passport_number):
     """
-    Create a dictionary representing a passenger given their details. The dictionary
+    Create a record representing a passenger given their details. The record
     includes a unique identifier
 
     :param name: Full name of the passenger
@@ -18,7 +120,7 @@ def create_passenger(name, gender, dob, nationality, residency, passport_number)
     :param nationality: Passenger's nationality
     :param residency: Passenger's country of residency
     :param passport_number: Passenger's passport number
-    :return: A dictionary representing the passenger
+    :return: A PassengerRecord representing the passenger
     """
     if not name:
         raise ValueError("Name is mandatory")
@@ -38,12 +140,10 @@ def create_passenger(name, gender, dob, nationality, residency, passport_number)
     if not passport_number:
         raise ValueError("Passport number is mandatory")
 
-    return {
-        "id": str(uuid.uuid4()),
-        "name": name,
-        "gender": gender,
-        "dob": dob.strftime("%Y%m%d"),
-        "nationality": nationality,
-        "residency": residency,
-        "passport_number": passport_number
-    }
+    return PassengerRecord(str(uuid.uuid4()),
+                           name,
+                           gender,
+                           dob.strftime("%Y%m%d"),
+                           nationality,
+                           residency,
+                           passport_number)
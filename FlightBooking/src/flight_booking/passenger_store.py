@@ -0,0 +1,425 @@
+"""
+This module defines a columnar store for the passengers on a flight, intended for flights with a large number of
+passengers and for operations that apply to the whole passenger list, such as filtering, sorting and exporting.
+
+Rather than holding one record per passenger, the store holds one column per passenger property, with the values for
+each passenger at the same position in every column:
+
++-----------------+-------------------------------------------------------------------------------------------------+
+| id              | List of passenger IDs                                                                           |
++-----------------+-------------------------------------------------------------------------------------------------+
+| name            | List of passenger names                                                                         |
++-----------------+-------------------------------------------------------------------------------------------------+
+| gender          | Array of codes indexing a table of the distinct values                                         |
++-----------------+-------------------------------------------------------------------------------------------------+
+| dob             | Array of dates of birth held as integers in the form YYYYMMDD                                   |
++-----------------+-------------------------------------------------------------------------------------------------+
+| nationality     | Array of codes indexing a table of the distinct values                                         |
++-----------------+-------------------------------------------------------------------------------------------------+
+| residency       | Array of codes indexing a table of the distinct values                                         |
++-----------------+-------------------------------------------------------------------------------------------------+
+| passport_number | List of passport numbers                                                                        |
++-----------------+-------------------------------------------------------------------------------------------------+
+
+The PassengerStore class is a mutable mapping of passenger ID to passenger, so it can be used in place of the
+dictionary of passengers held by a flight. The passengers it returns are views of a single row of the store that
+behave in the same way as passenger records. Passengers are held in the order in which they were added.
+
+The bulk operations work on whole columns, so filtering on a coded column compares integer codes rather than strings,
+for example, and return lists of passenger IDs that can be passed to the other operations.
+"""
+
+import csv
+from array import array
+from collections import Counter
+from collections.abc import MutableMapping
+from .passenger import PASSENGER_FIELDS
+
+
+class _ListColumn:
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        """
+        Initialise a column holding values in a list
+        """
+        self._values = []
+
+    def __getitem__(self, row):
+        return self._values[row]
+
+    def __setitem__(self, row, value):
+        self._values[row] = value
+
+    def __delitem__(self, row):
+        del self._values[row]
+
+    def append(self, value):
+        self._values.append(value)
+
+    def values(self):
+        return self._values
+
+    def find_rows(self, value):
+        return [row for row, v in enumerate(self._values) if v == value]
+
+    def sort_keys(self):
+        return self._values
+
+
+class _CodedColumn:
+    __slots__ = ("_codes", "_table", "_table_index")
+
+    def __init__(self):
+        """
+        Initialise a column holding values as codes indexing a table of the distinct values
+        """
+        self._codes = array("I")
+        self._table = []
+        self._table_index = {}
+
+    def _get_code(self, value):
+        code = self._table_index.get(value)
+        if code is None:
+            code = self._table_index[value] = len(self._table)
+            self._table.append(value)
+        return code
+
+    def __getitem__(self, row):
+        return self._table[self._codes[row]]
+
+    def __setitem__(self, row, value):
+        self._codes[row] = self._get_code(value)
+
+    def __delitem__(self, row):
+        del self._codes[row]
+
+    def append(self, value):
+        self._codes.append(self._get_code(value))
+
+    def values(self):
+        table = self._table
+        return [table[code] for code in self._codes]
+
+    def find_rows(self, value):
+        code = self._table_index.get(value)
+        if code is None:
+            return []
+        return [row for row, c in enumerate(self._codes) if c == code]
+
+    def sort_keys(self):
+        # Rank the distinct values once, so rows are sorted by comparing integers
+        ordered_codes = sorted(range(len(self._table)), key=self._table.__getitem__)
+        ranks = {code: rank for rank, code in enumerate(ordered_codes)}
+        return [ranks[code] for code in self._codes]
+
+
+class _DateColumn:
+    __slots__ = ("_dates",)
+
+    def __init__(self):
+        """
+        Initialise a column holding dates in the format YYYYMMDD as integers
+        """
+        self._dates = array("I")
+
+    @staticmethod
+    def encode(value):
+        try:
+            date = int(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{value!r} is not a date in the format YYYYMMDD") from e
+
+        if not 0 <= date <= 99991231:
+            raise ValueError(f"{value!r} is not a date in the format YYYYMMDD")
+        return date
+
+    def __getitem__(self, row):
+        return str(self._dates[row])
+
+    def __setitem__(self, row, value):
+        self._dates[row] = self.encode(value)
+
+    def __delitem__(self, row):
+        del self._dates[row]
+
+    def append(self, value):
+        self._dates.append(self.encode(value))
+
+    def values(self):
+        return [str(date) for date in self._dates]
+
+    def find_rows(self, value):
+        date = self.encode(value)
+        return [row for row, d in enumerate(self._dates) if d == date]
+
+    def sort_keys(self):
+        return self._dates
+
+
+class PassengerStore(MutableMapping):
+    def __init__(self, passengers=None):
+        """
+        Initialise a passenger store
+
+        :param passengers: Optional iterable of passengers, as passenger records or dictionaries, to add to the store
+        """
+        self._columns = {
+            "id": _ListColumn(),
+            "name": _ListColumn(),
+            "gender": _CodedColumn(),
+            "dob": _DateColumn(),
+            "nationality": _CodedColumn(),
+            "residency": _CodedColumn(),
+            "passport_number": _ListColumn()
+        }
+
+        # Map of passenger ID to row, rebuilt on demand after a passenger is removed
+        self._rows = {}
+
+        if passengers is not None:
+            self.extend(passengers)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(passengers={len(self)})"
+
+    def _get_rows(self):
+        if self._rows is None:
+            self._rows = {passenger_id: row for row, passenger_id in enumerate(self._columns["id"].values())}
+        return self._rows
+
+    def _get_row(self, passenger_id):
+        try:
+            return self._get_rows()[passenger_id]
+        except (KeyError, TypeError) as e:
+            raise KeyError(passenger_id) from e
+
+    def __getitem__(self, passenger_id):
+        self._get_row(passenger_id)
+        return _PassengerRow(self, passenger_id)
+
+    def __setitem__(self, passenger_id, passenger):
+        if passenger["id"] != passenger_id:
+            raise ValueError(f"Passenger ID {passenger['id']} does not match the key {passenger_id}")
+
+        # Read and check all the properties first, so an invalid passenger isn't partially stored
+        values = [passenger[field] for field in PASSENGER_FIELDS]
+        self._columns["dob"].encode(passenger["dob"])
+        rows = self._get_rows()
+        row = rows.get(passenger_id)
+        if row is None:
+            rows[passenger_id] = len(rows)
+            for field, value in zip(PASSENGER_FIELDS, values):
+                self._columns[field].append(value)
+        else:
+            for field, value in zip(PASSENGER_FIELDS, values):
+                self._columns[field][row] = value
+
+    def __delitem__(self, passenger_id):
+        row = self._get_row(passenger_id)
+        for column in self._columns.values():
+            del column[row]
+        self._rows = None
+
+    def __contains__(self, passenger_id):
+        try:
+            return passenger_id in self._get_rows()
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(list(self._columns["id"].values()))
+
+    def __len__(self):
+        return len(self._columns["id"].values())
+
+    def extend(self, passengers):
+        """
+        Add passengers to the store
+
+        :param passengers: Iterable of passengers, as passenger records or dictionaries
+        """
+        for passenger in passengers:
+            self[passenger["id"]] = passenger
+
+    def get_value(self, passenger_id, field):
+        """
+        Return a single property for a passenger
+
+        :param passenger_id: Unique identifier for the passenger
+        :param field: Name of the passenger property
+        :raises KeyError: If the passenger or property doesn't exist
+        :return: The property value
+        """
+        return self._columns[field][self._get_row(passenger_id)]
+
+    def set_value(self, passenger_id, field, value):
+        """
+        Set a single property for a passenger
+
+        :param passenger_id: Unique identifier for the passenger
+        :param field: Name of the passenger property
+        :param value: The new property value
+        :raises KeyError: If the passenger or property doesn't exist
+        :raises ValueError: If the passenger ID is changed
+        """
+        if field == "id":
+            raise ValueError("The passenger ID cannot be changed")
+        self._columns[field][self._get_row(passenger_id)] = value
+
+    def column(self, field):
+        """
+        Return the values of a passenger property for all passengers, in the order in which they were added
+
+        :param field: Name of the passenger property
+        :raises KeyError: If the property doesn't exist
+        :return: List of property values
+        """
+        return list(self._columns[field].values())
+
+    def contains_value(self, field, value):
+        """
+        Return True if any passenger has the specified value for a property
+
+        :param field: Name of the passenger property
+        :param value: Value to look for
+        :raises KeyError: If the property doesn't exist
+        :return: True if the value is present
+        """
+        return len(self._columns[field].find_rows(value)) > 0
+
+    def filter(self, **criteria):
+        """
+        Return the IDs of the passengers whose properties match all the criteria e.g. nationality="Spain"
+
+        :param criteria: Property values to match, as keyword arguments
+        :raises KeyError: If any of the properties don't exist
+        :return: List of passenger IDs, in the order in which the passengers were added
+        """
+        rows = None
+        for field, value in criteria.items():
+            matches = self._columns[field].find_rows(value)
+            if rows is None:
+                rows = matches
+            else:
+                matched = set(matches)
+                rows = [row for row in rows if row in matched]
+
+        ids = self._columns["id"].values()
+        return list(ids) if rows is None else [ids[row] for row in rows]
+
+    def sort(self, field, reverse=False, passenger_ids=None):
+        """
+        Return passenger IDs sorted by a passenger property
+
+        :param field: Name of the passenger property to sort by
+        :param reverse: If True, sort in descending order
+        :param passenger_ids: IDs of the passengers to sort, or None to sort all passengers
+        :raises KeyError: If the property or any of the passengers don't exist
+        :return: Sorted list of passenger IDs
+        """
+        keys = self._columns[field].sort_keys()
+        rows = range(len(self)) if passenger_ids is None else [self._get_row(pid) for pid in passenger_ids]
+        ids = self._columns["id"].values()
+        return [ids[row] for row in sorted(rows, key=keys.__getitem__, reverse=reverse)]
+
+    def find_duplicates(self, field):
+        """
+        Return the values of a passenger property that are shared by more than one passenger
+
+        :param field: Name of the passenger property e.g. passport_number
+        :raises KeyError: If the property doesn't exist
+        :return: Dictionary of lists of passenger IDs, keyed by the duplicated value
+        """
+        values = self._columns[field].values()
+        counts = Counter(values)
+        ids = self._columns["id"].values()
+        duplicates = {}
+        for row, value in enumerate(values):
+            if counts[value] > 1:
+                duplicates.setdefault(value, []).append(ids[row])
+        return duplicates
+
+    def export(self, fields=None, passenger_ids=None):
+        """
+        Export passenger properties as columns
+
+        :param fields: Names of the properties to export or None to export all properties
+        :param passenger_ids: IDs of the passengers to export, or None to export all passengers
+        :raises KeyError: If any of the properties or passengers don't exist
+        :return: Dictionary of lists of property values, keyed by property name
+        """
+        fields = PASSENGER_FIELDS if fields is None else fields
+        if passenger_ids is None:
+            return {field: self.column(field) for field in fields}
+
+        rows = [self._get_row(passenger_id) for passenger_id in passenger_ids]
+        return {field: [self._columns[field][row] for row in rows] for field in fields}
+
+    def export_csv(self, file_path, fields=None, passenger_ids=None):
+        """
+        Export passenger properties to a CSV file with a header row
+
+        :param file_path: Full path to the CSV file
+        :param fields: Names of the properties to export or None to export all properties
+        :param passenger_ids: IDs of the passengers to export, or None to export all passengers
+        :raises KeyError: If any of the properties or passengers don't exist
+        """
+        fields = PASSENGER_FIELDS if fields is None else fields
+        columns = self.export(fields, passenger_ids)
+        with open(file_path, mode="wt", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            writer.writerows(zip(*[columns[field] for field in fields]))
+
+    def to_dict(self):
+        """
+        Return the passengers as a dictionary of dictionaries of passenger properties, keyed by passenger ID
+
+        :return: Dictionary of passengers
+        """
+        columns = [self._columns[field].values() for field in PASSENGER_FIELDS]
+        return {values[0]: dict(zip(PASSENGER_FIELDS, values)) for values in zip(*columns)}
+
+
+class _PassengerRow(MutableMapping):
+    __slots__ = ("_store", "_passenger_id")
+
+    def __init__(self, store, passenger_id):
+        """
+        Initialise a view of a single passenger in a passenger store
+
+        :param store: The passenger store
+        :param passenger_id: Unique identifier for the passenger
+        """
+        self._store = store
+        self._passenger_id = passenger_id
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getitem__(self, key):
+        return self._store.get_value(self._passenger_id, key)
+
+    def __setitem__(self, key, value):
+        self._store.set_value(self._passenger_id, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Properties cannot be removed from a passenger")
+
+    def __contains__(self, key):
+        return key in PASSENGER_FIELDS
+
+    def __iter__(self):
+        return iter(PASSENGER_FIELDS)
+
+    def __len__(self):
+        return len(PASSENGER_FIELDS)
+
+    def to_dict(self):
+        """
+        Return the passenger properties as a dictionary
+
+        :return: Dictionary of passenger properties
+        """
+        return {field: self[field] for field in PASSENGER_FIELDS}
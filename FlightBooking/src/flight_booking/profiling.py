@@ -0,0 +1,229 @@
+"""
+This module provides an opt-in profiling mode for the console and web applications. An operation is profiled using
+cProfile and the output is written to the "profiles" folder under the data folder, with one pair of files per
+profiled operation, named after the operation and the time it started:
+
++------------+--------------------------------------------------------------------------------------------------------+
+| .pstats    | The profile statistics, which can be loaded using the pstats module or a viewer such as snakeviz        |
++------------+--------------------------------------------------------------------------------------------------------+
+| .collapsed | Collapsed stacks, one line per call path with the time in microseconds, for use with flame graph tools |
++------------+--------------------------------------------------------------------------------------------------------+
+
+cProfile records the callers of each function rather than complete stacks, so the collapsed stacks are reconstructed
+from the call graph, dividing the time for a function that has more than one caller between the callers in proportion
+to the time spent in the function when called from each of them. The result is exact for functions with a single
+caller and an approximation otherwise. The number of call paths is limited, so reconstructing the stacks for a large
+profile takes a bounded amount of time, and the web application writes them on a background thread.
+
+Profiling is enabled by setting the FLIGHT_BOOKING_PROFILE environment variable to 1, true or yes, or by the
+applications' own options.
+"""
+
+import cProfile
+import datetime
+import os
+import pstats
+import re
+import threading
+from .utils import get_data_folder
+
+PROFILE_ENV = "FLIGHT_BOOKING_PROFILE"
+
+# Maximum depth of the reconstructed call paths written to the collapsed stack files
+MAX_STACK_DEPTH = 64
+
+# Maximum number of call paths written to a collapsed stack file and the minimum time, in seconds, for a
+# callee to be given its own call path
+MAX_STACK_PATHS = 20000
+MIN_STACK_TIME = 0.000001
+
+
+def is_profiling_requested():
+    """
+    Return True if profiling has been requested using the environment variable
+
+    :return: True if the FLIGHT_BOOKING_PROFILE environment variable is set to 1, true or yes
+    """
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _format_function(function):
+    """
+    Format a pstats function key for display
+
+    :param function: Tuple of file name, line number and function name
+    :return: Formatted function e.g. flight.py:123(add_passenger)
+    """
+    file_name, line_number, function_name = function
+    if file_name == "~":
+        # Built-in functions have no file
+        return function_name
+    return f"{os.path.basename(file_name)}:{line_number}({function_name})"
+
+
+def get_hotspots(stats, limit=10):
+    """
+    Return the functions with the highest internal time from a set of profile statistics
+
+    :param stats: pstats.Stats instance
+    :param limit: Maximum number of functions to return
+    :return: List of dictionaries containing the function, number of calls, internal time and cumulative time
+    """
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            "function": _format_function(function),
+            "calls": number_of_calls,
+            "tottime": internal_time,
+            "cumtime": cumulative_time
+        }
+        for function, (_, number_of_calls, internal_time, cumulative_time, _) in entries
+    ]
+
+
+def format_hotspots(hotspots):
+    """
+    Format a list of hotspots, as returned by get_hotspots(), as a printable table
+
+    :param hotspots: List of hotspot dictionaries
+    :return: Table as a string, with times in milliseconds
+    """
+    lines = [f"{'Calls':>10} {'Internal':>12} {'Cumulative':>12}  Function"]
+    for hotspot in hotspots:
+        lines.append(f"{hotspot['calls']:10d} {hotspot['tottime'] * 1000:12.3f} {hotspot['cumtime'] * 1000:12.3f}  "
+                     f"{hotspot['function']}")
+    return "\n".join(lines)
+
+
+def write_collapsed_stacks(stats, file_path, max_paths=MAX_STACK_PATHS):
+    """
+    Write collapsed stacks reconstructed from the call graph in a set of profile statistics. The number of call paths
+    in a deep call graph with many callers per function grows exponentially, so the paths are explored largest first
+    and at most max_paths are written. The time for callees that aren't given their own path, because the limit has
+    been reached, the path is at the maximum depth or the callee's share of the time is less than a microsecond, is
+    attributed to the caller so the total time is preserved
+
+    :param stats: pstats.Stats instance
+    :param file_path: Full path to the output file
+    :param max_paths: Maximum number of call paths to write
+    """
+    # Build the callees for each function with the cumulative time spent in the callee when called from it, largest
+    # first, and the formatted name of each function, once per function rather than once per path
+    names = {function: _format_function(function) for function in stats.stats}
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            # Recursive calls are folded into the caller, as their time is already included in its total
+            if caller != function:
+                callees.setdefault(caller, []).append((function, cumulative_time))
+    for function_callees in callees.values():
+        function_callees.sort(key=lambda callee: callee[1], reverse=True)
+
+    samples = {}
+    roots = [function for function, (_, _, _, _, callers) in stats.stats.items() if not callers]
+    pending = [((root,), stats.stats[root][3]) for root in roots]
+    number_of_paths = len(pending)
+    while pending:
+        path, time_in_path = pending.pop()
+        function = path[-1]
+        _, _, internal_time, cumulative_time, _ = stats.stats[function]
+        scale = time_in_path / cumulative_time if cumulative_time > 0 else 0
+        self_time = internal_time * scale
+
+        children = []
+        for callee, callee_time in callees.get(function, []):
+            if callee in path:
+                continue
+            time_in_callee = callee_time * scale
+            if number_of_paths < max_paths and len(path) < MAX_STACK_DEPTH and time_in_callee >= MIN_STACK_TIME:
+                children.append((path + (callee,), time_in_callee))
+                number_of_paths += 1
+            else:
+                self_time += time_in_callee
+
+        # Pushed in reverse so the largest callee is expanded first
+        pending.extend(reversed(children))
+
+        key = ";".join(names[f] for f in path)
+        samples[key] = samples.get(key, 0) + self_time
+
+    with open(file_path, mode="wt", encoding="utf-8") as f:
+        for stack, seconds in samples.items():
+            microseconds = round(seconds * 1000000)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+
+class OperationProfiler:
+    def __init__(self, name, limit=10, background=False):
+        """
+        Initialise a profiler for a single operation, used as a context manager. The profile is written when the
+        context exits, whether or not the operation succeeded, and the report is then available from the report
+        property
+
+        :param name: Name of the operation, used in the output file names
+        :param limit: Number of hotspots to include in the report
+        :param background: If True, the collapsed stacks are written on a background thread, so the caller isn't
+            held up reconstructing them. Call wait() to wait for the file to be written
+        """
+        self._name = name
+        self._limit = limit
+        self._background = background
+        self._profile = None
+        self._report = None
+        self._writer = None
+
+    @property
+    def report(self):
+        """
+        The profiling report
+
+        :return: Dictionary with "pstats" and "collapsed" keys holding the paths to the output files and a "hotspots"
+            key holding the list returned by get_hotspots() or None if the operation hasn't been profiled
+        """
+        return self._report
+
+    def __enter__(self):
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *_):
+        self._profile.disable()
+        self._report = self._write_output()
+        return False
+
+    def wait(self, timeout=None):
+        """
+        Wait for the collapsed stacks to be written, if they're being written on a background thread
+
+        :param timeout: Maximum time to wait, in seconds, or None to wait until they've been written
+        """
+        if self._writer is not None:
+            self._writer.join(timeout)
+
+    def _write_output(self):
+        """
+        Write the profile statistics and collapsed stacks to the profiles folder
+
+        :return: Profiling report dictionary
+        """
+        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        file_name = re.sub("\\W", "_", f"{self._name}_{timestamp}").lower()
+        file_path = os.path.join(get_data_folder("profiles"), file_name)
+
+        stats = pstats.Stats(self._profile)
+        stats.dump_stats(f"{file_path}.pstats")
+        if self._background:
+            self._writer = threading.Thread(target=write_collapsed_stacks,
+                                            args=(stats, f"{file_path}.collapsed"),
+                                            name=f"profile-writer-{file_name}")
+            self._writer.start()
+        else:
+            write_collapsed_stacks(stats, f"{file_path}.collapsed")
+
+        return {
+            "pstats": f"{file_path}.pstats",
+            "collapsed": f"{file_path}.collapsed",
+            "hotspots": get_hotspots(stats, self._limit)
+        }
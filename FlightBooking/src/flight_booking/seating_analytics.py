@@ -0,0 +1,275 @@
+"""
+This module provides vectorised analysis of seating plans using NumPy, which is an optional dependency of the
+flight_booking package and is only required if this module is used.
+
+A seating plan is converted to an occupancy matrix, a 2-dimensional boolean array with one row per row in the seating
+plan and one column per seat letter, that is True where a seat is allocated to a passenger. The layout of the matrix
+is described by a seat grid, which is derived once per plan template and holds:
+
++--------------+------------------------------------------------------------------------------------------------+
+| row_numbers  | Tuple of row numbers, in seating plan order, corresponding to the rows of the matrix           |
++--------------+------------------------------------------------------------------------------------------------+
+| seat_letters | Tuple of seat letters corresponding to the columns of the matrix                               |
++--------------+------------------------------------------------------------------------------------------------+
+| seat_exists  | Boolean matrix that is True where the seating plan contains a seat                             |
++--------------+------------------------------------------------------------------------------------------------+
+| class_names  | Tuple of the seating classes from the "Class" column of the seating plan file                  |
++--------------+------------------------------------------------------------------------------------------------+
+| class_codes  | Integer matrix holding the index into class_names of the class for each seat or -1 for no seat |
++--------------+------------------------------------------------------------------------------------------------+
+| positions    | Integer array mapping each seat in the plan template's seat ordering table to a matrix cell    |
++--------------+------------------------------------------------------------------------------------------------+
+
+The query functions accept either a single occupancy matrix or a stack of matrices for a batch of flights with the
+same aircraft and layout, as returned by occupancy_matrices(), and return results with a corresponding leading
+dimension.
+"""
+
+from collections import namedtuple, OrderedDict
+from .compact_seating_plan import CompactSeatingPlan
+from .seating_plan import get_plan_template
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+SeatGrid = namedtuple("SeatGrid", ["row_numbers", "seat_letters", "seat_exists", "class_names", "class_codes",
+                                   "positions"])
+
+# Cache of seat grids, holding at most MAX_SEAT_GRIDS grids with the least recently used discarded first. The key is
+# an (airline, aircraft, layout) tuple and the value is a tuple of the plan template the grid was built from and the
+# grid. If the template has since been replaced, because the seating plan file changed, the grid is rebuilt
+MAX_SEAT_GRIDS = 64
+seat_grids = OrderedDict()
+
+
+def _check_numpy():
+    """
+    Check that NumPy is available
+
+    :raises ImportError: If NumPy isn't installed
+    """
+    if np is None:
+        raise ImportError("NumPy must be installed to use the seating analytics module")
+
+
+def _get_template(plan):
+    """
+    Return the plan template for a seating plan
+
+    :param plan: Seating plan
+    :return: An instance of the PlanTemplate named tuple
+    """
+    if isinstance(plan, CompactSeatingPlan):
+        return plan.template
+    return get_plan_template(plan["airline"], plan["aircraft"], plan["layout"])
+
+
+def _build_seat_grid(template):
+    """
+    Build the seat grid for a plan template
+
+    :param template: An instance of the PlanTemplate named tuple
+    :return: An instance of the SeatGrid named tuple
+    """
+    # Columns are the seat letters, in the order in which they're first encountered in the plan
+    seat_letters = tuple(dict.fromkeys(letter for _, _, letters, _ in template.rows for letter in letters))
+    column_index = {letter: i for i, letter in enumerate(seat_letters)}
+    class_names = tuple(dict.fromkeys(seat_class for _, seat_class, _, _ in template.rows))
+
+    row_numbers = tuple(row_number for row_number, _, _, _ in template.rows)
+    shape = (len(row_numbers), len(seat_letters))
+    class_codes = np.full(shape, -1, dtype=np.int16)
+    positions = np.empty(template.capacity, dtype=np.intp)
+
+    position = 0
+    for row, (_, seat_class, letters, _) in enumerate(template.rows):
+        for letter in letters:
+            column = column_index[letter]
+            class_codes[row, column] = class_names.index(seat_class)
+            positions[position] = row * len(seat_letters) + column
+            position += 1
+
+    return SeatGrid(row_numbers, seat_letters, class_codes >= 0, class_names, class_codes, positions)
+
+
+def get_seat_grid(plan):
+    """
+    Return the seat grid describing the layout of the occupancy matrix for a seating plan
+
+    :param plan: Seating plan
+    :raises ImportError: If NumPy isn't installed
+    :return: An instance of the SeatGrid named tuple
+    """
+    _check_numpy()
+    template = _get_template(plan)
+    key = (template.airline, template.aircraft, template.layout)
+    cached = seat_grids.get(key)
+    if cached is not None and cached[0] is template:
+        seat_grids.move_to_end(key)
+        return cached[1]
+
+    grid = _build_seat_grid(template)
+    seat_grids[key] = (template, grid)
+    seat_grids.move_to_end(key)
+    while len(seat_grids) > MAX_SEAT_GRIDS:
+        seat_grids.popitem(last=False)
+    return grid
+
+
+def _get_occupied_seats(plan, template):
+    """
+    Return a flat boolean array that is True for each allocated seat, in seat ordering table order
+
+    :param plan: Seating plan
+    :param template: The plan template for the seating plan
+    :raises ValueError: If the seating plan doesn't match the layout of the plan template
+    :return: Flat boolean array of allocated seats
+    """
+    if isinstance(plan, CompactSeatingPlan):
+        return np.frombuffer(plan.seat_slots, dtype=np.uint16) != 0
+
+    try:
+        occupied = np.fromiter((passenger_id is not None
+                                for row_number, _, _, _ in template.rows
+                                for passenger_id in plan[row_number]["seats"].values()),
+                               dtype=bool,
+                               count=template.capacity)
+    except (KeyError, ValueError) as e:
+        raise ValueError("The seating plan does not match the current layout for the aircraft") from e
+
+    return occupied
+
+
+def occupancy_matrix(plan):
+    """
+    Convert a seating plan to an occupancy matrix
+
+    :param plan: Seating plan
+    :raises ImportError: If NumPy isn't installed
+    :return: Tuple of the seat grid and a boolean matrix that is True for allocated seats
+    """
+    grid = get_seat_grid(plan)
+    matrix = np.zeros(grid.seat_exists.shape, dtype=bool)
+    matrix.flat[grid.positions] = _get_occupied_seats(plan, _get_template(plan))
+    return grid, matrix
+
+
+def occupancy_matrices(plans):
+    """
+    Convert a batch of seating plans with the same aircraft and layout to a stack of occupancy matrices
+
+    :param plans: Sequence of seating plans
+    :raises ImportError: If NumPy isn't installed
+    :raises ValueError: If the sequence is empty or the plans don't all have the same aircraft and layout
+    :return: Tuple of the seat grid and a 3-dimensional array of occupancy matrices, one per plan
+    """
+    if not plans:
+        raise ValueError("At least one seating plan must be supplied")
+
+    grid = get_seat_grid(plans[0])
+    template = _get_template(plans[0])
+    occupied = np.empty((len(plans), template.capacity), dtype=bool)
+    for i, plan in enumerate(plans):
+        if _get_template(plan) is not template:
+            raise ValueError("All seating plans in a batch must have the same aircraft and layout")
+        occupied[i] = _get_occupied_seats(plan, template)
+
+    matrices = np.zeros((len(plans), grid.seat_exists.size), dtype=bool)
+    matrices[:, grid.positions] = occupied
+    return grid, matrices.reshape((len(plans),) + grid.seat_exists.shape)
+
+
+def class_mask(grid, seat_class):
+    """
+    Return a mask that is True for seats in the specified seating class
+
+    :param grid: Seat grid
+    :param seat_class: Seating class e.g. Economy
+    :raises ValueError: If the seating class isn't present in the seat grid
+    :return: Boolean matrix that is True for seats in the seating class
+    """
+    try:
+        return grid.class_codes == grid.class_names.index(seat_class)
+    except ValueError as e:
+        raise ValueError(f"Seating class {seat_class} is not present in the seating plan") from e
+
+
+def occupancy_by_class(grid, occupancy):
+    """
+    Return the number of allocated seats, the capacity and the load factor for each seating class
+
+    :param grid: Seat grid
+    :param occupancy: Occupancy matrix or stack of occupancy matrices
+    :return: Dictionary keyed by seating class of (allocated, capacity, load factor) tuples
+    """
+    results = {}
+    for seat_class in grid.class_names:
+        mask = class_mask(grid, seat_class)
+        capacity = int(mask.sum())
+        allocated = (occupancy & mask).sum(axis=(-2, -1))
+        results[seat_class] = (allocated, capacity, allocated / capacity)
+    return results
+
+
+def free_seats_per_row(grid, occupancy):
+    """
+    Return the number of unallocated seats in each row
+
+    :param grid: Seat grid
+    :param occupancy: Occupancy matrix or stack of occupancy matrices
+    :return: Array of counts with a final dimension matching the row numbers in the seat grid
+    """
+    return (grid.seat_exists & ~occupancy).sum(axis=-1)
+
+
+def free_block_starts(grid, occupancy, block_size):
+    """
+    Return a mask of the positions at which a block of adjacent unallocated seats of the specified size starts.
+    Seats are adjacent if they're in the same row and there's no gap in the seat letters between them
+
+    :param grid: Seat grid
+    :param occupancy: Occupancy matrix or stack of occupancy matrices
+    :param block_size: Number of adjacent seats required
+    :raises ValueError: If the block size is less than 1
+    :return: Boolean array with a final dimension of one entry per starting seat letter
+    """
+    if block_size < 1:
+        raise ValueError("The block size must be at least 1")
+
+    # A running count of free seats along each row allows the number of free seats in each window
+    # of the required size to be calculated by subtraction
+    free = (grid.seat_exists & ~occupancy).astype(np.int32)
+    padding = [(0, 0)] * (free.ndim - 1) + [(1, 0)]
+    running = np.pad(np.cumsum(free, axis=-1), padding)
+    window_counts = running[..., block_size:] - running[..., :-block_size]
+    return window_counts == block_size
+
+
+def count_free_blocks(grid, occupancy, block_size):
+    """
+    Return the number of (possibly overlapping) blocks of adjacent unallocated seats of the specified size
+
+    :param grid: Seat grid
+    :param occupancy: Occupancy matrix or stack of occupancy matrices
+    :param block_size: Number of adjacent seats required
+    :return: The count of blocks, as an array for a stack of occupancy matrices
+    """
+    return free_block_starts(grid, occupancy, block_size).sum(axis=(-2, -1))
+
+
+def find_free_blocks(grid, occupancy, block_size):
+    """
+    Return the seat numbers for each block of adjacent unallocated seats of the specified size in a single plan
+
+    :param grid: Seat grid
+    :param occupancy: Occupancy matrix
+    :param block_size: Number of adjacent seats required
+    :return: List of lists of seat numbers, one per block, from front to back
+    """
+    rows, columns = np.nonzero(free_block_starts(grid, occupancy, block_size))
+    return [
+        [f"{grid.row_numbers[row]}{letter}" for letter in grid.seat_letters[column:column + block_size]]
+        for row, column in zip(rows.tolist(), columns.tolist())
+    ]
@@ -28,64 +28,186 @@ For example, if row number 28 of a seating plan contains 6 economy class seats w
 CSV row would be:
 
 28,Economy,ABCDEF
+
+As many flights share the same aircraft and layout, each file is parsed once into an immutable plan template that is
+cached for the lifetime of the process. New, empty seating plans are created by copying the template, so the cost of
+loading seating for a large number of flights is dominated by copying rather than by parsing the CSV file. A cached
+template is discarded and the file re-parsed if the file's modification time or size changes.
+
+Where a large number of flights are held in memory, a seating plan can instead be created as a CompactSeatingPlan (see
+the compact_seating_plan module). This presents the same nested dictionary structure as a view over a compact array of
+seat allocations and can be passed to any of the functions in this module.
+
+To support allocation of adjacent seats to groups of passengers, a free run index can be built from a seating plan,
+recording the runs of adjacent unallocated seats in each row. The index is updated incrementally as individual seats
+are allocated and cleared, so finding a block of seats doesn't require a scan of the whole plan.
 """
 
 import csv
 import os
+from collections import namedtuple
+from types import MappingProxyType
+from .compact_seating_plan import CompactSeatingPlan
 from .utils import get_seating_file_path
 from .exceptions import SeatingPlanNotFoundError
+from .instrumentation import timed, increment
 
 ROW_NUMBER_COLUMN = 0
 CLASS_COLUMN = 1
 SEAT_LETTERS_COLUMN = 2
 
-
-def read_plan(airline, aircraft, layout=None):
+# A plan template is the parsed, immutable form of a seating plan file. The rows are a tuple of
+# (row number, seating class, seat letters, seat numbers) tuples, in the order they appear in the file.
+# The template also holds the seat ordering table: a tuple of all seat numbers, front to back, a
+# lookup of seat number to position in that tuple, a lookup of row number to the range of
+# positions occupied by that row and a lookup of row number to seating class
+PlanTemplate = namedtuple("PlanTemplate", ["airline",
+                                           "aircraft",
+                                           "layout",
+                                           "rows",
+                                           "capacity",
+                                           "seat_numbers",
+                                           "seat_index",
+                                           "row_ranges",
+                                           "row_classes"])
+
+# Process-wide cache of plan templates. The key is an (airline, aircraft, layout) tuple and the value is a
+# tuple of the file path, the file modification time and size when it was parsed and the parsed template
+plan_templates = {}
+
+
+def _parse_plan_template(file_path, airline, aircraft, layout):
     """
-    Read and return an empty seating plan
+    Read a seating plan file and return the parsed template
 
+    :param file_path: Full path to the seating plan file
     :param airline: Name of the airline
     :param aircraft: Aircraft model e.g. A320
     :param layout: Optional airline-specific layout name
-    :return: A dictionary of rows where the row number is the key
+    :return: An instance of the PlanTemplate named tuple
     """
+    with open(file_path, mode="rt", encoding="utf-8") as f:
+        # Initialise the CSV reader and skip the (mandatory) headers
+        reader = csv.reader(f)
+        next(reader, None)
 
-    # Construct the path to the seating plan file
+        rows = tuple(
+            (
+                row[ROW_NUMBER_COLUMN],
+                row[CLASS_COLUMN],
+                row[SEAT_LETTERS_COLUMN],
+                tuple(f"{row[ROW_NUMBER_COLUMN]}{seat}" for seat in row[SEAT_LETTERS_COLUMN])
+            )
+            for row in reader
+        )
+
+    # Build the seat ordering table
+    seat_numbers = tuple(seat_number for _, _, _, row_seat_numbers in rows for seat_number in row_seat_numbers)
+    seat_index = MappingProxyType({seat_number: i for i, seat_number in enumerate(seat_numbers)})
+    row_ranges = {}
+    start = 0
+    for row_number, _, _, row_seat_numbers in rows:
+        row_ranges[row_number] = range(start, start + len(row_seat_numbers))
+        start += len(row_seat_numbers)
+
+    return PlanTemplate(airline,
+                        aircraft,
+                        layout,
+                        rows,
+                        len(seat_numbers),
+                        seat_numbers,
+                        seat_index,
+                        MappingProxyType(row_ranges),
+                        MappingProxyType({row_number: seat_class for row_number, seat_class, _, _ in rows}))
+
+
+def get_plan_template(airline, aircraft, layout=None):
+    """
+    Return the parsed template for a seating plan. Templates are cached for the lifetime of the process and
+    the seating plan file is only re-parsed if its modification time or size changes
+
+    :param airline: Name of the airline
+    :param aircraft: Aircraft model e.g. A320
+    :param layout: Optional airline-specific layout name
+    :raises SeatingPlanNotFoundError: If the seating plan file doesn't exist
+    :return: An instance of the PlanTemplate named tuple
+    """
     file_path = get_seating_file_path(airline, aircraft, layout)
-    if not os.path.exists(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError as e:
         raise SeatingPlanNotFoundError(f"Seating plan not found for aircraft {aircraft}, layout {layout}",
                                        aircraft=aircraft,
-                                       layout=layout)
+                                       layout=layout) from e
 
-    # Read the rows, throwing away the (mandatory) headers
-    with open(file_path, mode="rt", encoding="utf-8") as f:
-        # Initialise the CSV reader and skip the headers
-        reader = csv.reader(f)
-        next(reader, None)
+    # The file path forms part of the validity check as well as the key as the data folder
+    # can be changed using an environment variable
+    key = (airline, aircraft, layout)
+    signature = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    cached = plan_templates.get(key)
+    if cached is not None and cached[0] == signature:
+        increment("seating_plan.template_cache_hits")
+        return cached[1]
+
+    increment("seating_plan.template_cache_misses")
+    template = _parse_plan_template(file_path, airline, aircraft, layout)
+    plan_templates[key] = (signature, template)
+    return template
+
+
+def clear_plan_template_cache():
+    """
+    Discard all cached seating plan templates
+    """
+    plan_templates.clear()
+
+
+def create_plan_from_template(template):
+    """
+    Create a new, empty seating plan from a plan template
 
-        # The seating plan is a dictionary initialised with keys for the airline, aircraft model
-        # and layout to which the plan applies
-        seating_plan = {
-            "airline": airline,
-            "aircraft": aircraft,
-            "layout": layout
+    :param template: An instance of the PlanTemplate named tuple
+    :return: A dictionary of rows where the row number is the key
+    """
+    # The seating plan is a dictionary initialised with keys for the airline, aircraft model
+    # and layout to which the plan applies
+    seating_plan = {
+        "airline": template.airline,
+        "aircraft": template.aircraft,
+        "layout": template.layout
+    }
+
+    # The seating plan is then updated with keys holding the details for each row. The key is
+    # the row number and the value is a dictionary containing the class and the seats. The
+    # seats are a dictionary where the key is the seat number and the value is the passenger ID,
+    # initialised to None here
+    seating_plan.update({
+        row_number: {
+            "class": seat_class,
+            "seats": dict.fromkeys(seat_numbers)
         }
+        for row_number, seat_class, _, seat_numbers in template.rows
+    })
 
-        # The seating plan is then updated with keys holding the details for each row. The key is
-        # the row number and the value is a dictionary containing the class and the seats. The
-        # seats are a dictionary where the key is the seat number and the value is the passenger ID,
-        # initialised to None here
-        seating_plan.update({
-            row[ROW_NUMBER_COLUMN]: {
-                "class": row[CLASS_COLUMN],
-                "seats": {f"{row[ROW_NUMBER_COLUMN]}{seat}": None for seat in row[SEAT_LETTERS_COLUMN]}
-            }
-            for row in reader
-        })
+    seating_plan["capacity"] = template.capacity
+    return seating_plan
 
-        # Now work out the total capacity and store that in the dictionary
-        seating_plan["capacity"] = len(get_unallocated_seats(seating_plan))
-        return seating_plan
+
+@timed("seating_plan.read_plan")
+def read_plan(airline, aircraft, layout=None, compact=False):
+    """
+    Return an empty seating plan. The seating plan file is parsed once and cached as a template, from
+    which a fresh copy of the plan is created on each call
+
+    :param airline: Name of the airline
+    :param aircraft: Aircraft model e.g. A320
+    :param layout: Optional airline-specific layout name
+    :param compact: If True, return a CompactSeatingPlan rather than a dictionary
+    :raises SeatingPlanNotFoundError: If the seating plan file doesn't exist
+    :return: A dictionary of rows where the row number is the key or a CompactSeatingPlan with the same structure
+    """
+    template = get_plan_template(airline, aircraft, layout)
+    return CompactSeatingPlan(template) if compact else create_plan_from_template(template)
 
 
 def get_seating_row(plan, seat_number):
@@ -109,6 +231,7 @@ def get_seating_row(plan, seat_number):
     return row
 
 
+@timed("seating_plan.allocate_seat")
 def allocate_seat(plan, seat_number, passenger_id):
     """
     Associate the identifying data for a passenger with a seat. If the passenger
@@ -118,6 +241,7 @@ def allocate_seat(plan, seat_number, passenger_id):
     :param seat_number: The seat number e.g. 3A
     :raises ValueError: If the seating plan is None or the seat is already allocated to another passenger
     :param passenger_id: The unique identifying data for a passenger
+    :return: The seat number previously allocated to the passenger or None if they had no seat
     """
     if plan is None:
         raise ValueError("Seating plan is None")
@@ -136,6 +260,7 @@ def allocate_seat(plan, seat_number, passenger_id):
 
     # Allocate the seat to the passenger
     row["seats"][seat_number] = passenger_id
+    return current_seat_number
 
 
 def clear_allocation(plan, seat_number):
@@ -157,6 +282,9 @@ def get_allocated_seat(plan, passenger_id):
     :param passenger_id: Unique passenger identifier
     :return: Seat number e.g. 3A if the passenger has a seat, otherwise None
     """
+    if isinstance(plan, CompactSeatingPlan):
+        return plan.get_allocated_seat(passenger_id)
+
     matches = [
         seat_number
         for row in plan.keys() if row.isnumeric()
@@ -175,6 +303,9 @@ def get_unallocated_seats(plan):
     :param plan: The seating plan for which to return the seats
     :return: A list of unallocated seat numbers
     """
+    if isinstance(plan, CompactSeatingPlan):
+        return plan.get_unallocated_seats()
+
     return [
         seat_number
         for row in plan.keys() if row.isnumeric()
@@ -190,6 +321,9 @@ def get_seat_allocations(plan):
     :param plan: Seating plan
     :return: A list of (seat number, passenger ID) tuples for allocated seats
     """
+    if isinstance(plan, CompactSeatingPlan):
+        return plan.get_seat_allocations()
+
     return [
         (seat_number, plan[row]["seats"][seat_number])
         for row in plan.keys() if row.isnumeric()
@@ -210,42 +344,240 @@ def get_passengers_with_no_seat(plan, passenger_ids):
     return [pid for pid in passenger_ids if pid not in passenger_ids_with_seats]
 
 
-def copy_seat_allocations(from_plan, to_plan):
+def copy_seat_allocations(from_plan, to_plan, class_aware=False):
+    """
+    Migrate seat allocations between two seating plans, as migrate_seat_allocations(), returning the passengers
+    that couldn't be allocated a seat in the target plan. Use migrate_seat_allocations() for a report of the
+    passengers that were kept in the same seat and those that were moved
+
+    :param from_plan: Plan to migrate allocations from
+    :param to_plan: Plan to migrate allocations to
+    :param class_aware: If True, prefer seats in the same seating class when migrating allocations
+    :return: A list of the IDs of passengers that couldn't be allocated a seat or None if there were no allocations
+    """
+    report = migrate_seat_allocations(from_plan, to_plan, class_aware=class_aware)
+    if not any(report.values()):
+        return None
+    return [passenger_id for passenger_id, _ in report["unplaced"]]
+
+
+def migrate_seat_allocations(from_plan, to_plan, class_aware=False):
     """
-    Migrate seat allocations between two seating plans
+    Migrate seat allocations between two seating plans in a single pass over each plan. Passengers are kept
+    in the same seat if it exists and is unallocated in the target plan. Otherwise, they're moved to the next
+    unallocated seat, from front to back. In class-aware mode, passengers are only kept in the same seat if it
+    has the same seating class in the target plan and are preferentially moved to seats in the same class
 
     :param from_plan: Plan to migrate allocations from
     :param to_plan: Plan to migrate allocations to
+    :param class_aware: If True, prefer seats in the same seating class when migrating allocations
+    :return: A dictionary with a "kept" key holding a list of (passenger ID, seat number) tuples, a "moved"
+        key holding a list of (passenger ID, original seat number, new seat number) tuples and an "unplaced"
+        key holding a list of (passenger ID, original seat number) tuples for passengers that couldn't be
+        allocated a seat
+    """
+    report = {"kept": [], "moved": [], "unplaced": []}
+
+    # Single pass over the target plan to build a lookup of seat number to the seats in its row and its
+    # class, lists of unallocated seats (overall and per class) in front to back order and a lookup of the
+    # existing allocations
+    target_seats = {}
+    free_seats = []
+    free_seats_by_class = {}
+    existing_allocations = {}
+    for row in to_plan.keys():
+        if row.isnumeric():
+            seat_class = to_plan[row]["class"]
+            seats = to_plan[row]["seats"]
+            class_free_seats = free_seats_by_class.setdefault(seat_class, [])
+            for seat_number, passenger_id in seats.items():
+                target_seats[seat_number] = (seats, seat_class)
+                if passenger_id is None:
+                    free_seats.append(seat_number)
+                    class_free_seats.append(seat_number)
+                else:
+                    existing_allocations[passenger_id] = seat_number
+
+    def assign(seat_number, passenger_id):
+        # Release any seat the passenger already has in the target plan, as allocate_seat() would
+        current_seat_number = existing_allocations.pop(passenger_id, None)
+        if current_seat_number is not None and current_seat_number != seat_number:
+            target_seats[current_seat_number][0][current_seat_number] = None
+        target_seats[seat_number][0][seat_number] = passenger_id
+
+    # First pass keeps passengers in the same seat where possible, on the basis that any seating swap is
+    # likely to be to a roughly equivalent layout rather than a totally different one
+    pending = []
+    for seat_number, passenger_id in get_seat_allocations(from_plan):
+        seat_class = from_plan[seat_number[:-1]]["class"] if class_aware else None
+        target = target_seats.get(seat_number)
+        if target is not None and \
+                target[0][seat_number] in (None, passenger_id) and \
+                (not class_aware or target[1] == seat_class):
+            assign(seat_number, passenger_id)
+            report["kept"].append((passenger_id, seat_number))
+        else:
+            pending.append((seat_number, passenger_id, seat_class))
+
+    # Second pass puts the remaining passengers in unallocated seats. Seats taken in the first pass are
+    # skipped as the lists are consumed, so each seat is examined at most once per list
+    positions = {}
+
+    def next_free_seat(candidates, key):
+        position = positions.get(key, 0)
+        while position < len(candidates) and target_seats[candidates[position]][0][candidates[position]] is not None:
+            position += 1
+        positions[key] = position
+        return candidates[position] if position < len(candidates) else None
+
+    for seat_number, passenger_id, seat_class in pending:
+        new_seat_number = None
+        if class_aware:
+            new_seat_number = next_free_seat(free_seats_by_class.get(seat_class, []), seat_class)
+        if new_seat_number is None:
+            new_seat_number = next_free_seat(free_seats, None)
+
+        if new_seat_number is None:
+            report["unplaced"].append((passenger_id, seat_number))
+        else:
+            assign(new_seat_number, passenger_id)
+            report["moved"].append((passenger_id, seat_number, new_seat_number))
+
+    return report
+
+
+def build_free_run_index(plan):
+    """
+    Build an index of the runs of adjacent unallocated seats in each row of a seating plan. The index is a
+    dictionary keyed by row number. Each value is a dictionary containing a "seats" key, holding a tuple of
+    the seat numbers in the row in seat letter order, and a "runs" key, holding a list of (start, stop)
+    tuples giving the positions in that tuple of each run of adjacent unallocated seats
+
+    :param plan: Seating plan
+    :return: The free run index
+    """
+    index = {}
+    for row in plan.keys():
+        if row.isnumeric():
+            seats = plan[row]["seats"]
+            runs = []
+            start = None
+            for position, passenger_id in enumerate(seats.values()):
+                if passenger_id is None and start is None:
+                    start = position
+                elif passenger_id is not None and start is not None:
+                    runs.append((start, position))
+                    start = None
+
+            if start is not None:
+                runs.append((start, len(seats)))
+
+            index[row] = {"seats": tuple(seats), "runs": runs}
+
+    return index
+
+
+def update_free_run_index(index, seat_number, is_free):
+    """
+    Update a free run index to reflect a change to the allocation of a single seat
+
+    :param index: Free run index
+    :param seat_number: The seat number e.g. 3A
+    :param is_free: True if the seat has become unallocated, False if it has been allocated
+    """
+    entry = index[seat_number[:-1]]
+    position = entry["seats"].index(seat_number)
+    runs = entry["runs"]
+
+    if is_free:
+        # Merge the seat with the runs immediately before and after it, if there are any
+        start, stop = position, position + 1
+        remaining = []
+        for run_start, run_stop in runs:
+            if run_stop == start:
+                start = run_start
+            elif run_start == stop:
+                stop = run_stop
+            elif run_start <= position < run_stop:
+                # The seat is already in a free run so there's nothing to do
+                return
+            else:
+                remaining.append((run_start, run_stop))
+        remaining.append((start, stop))
+        entry["runs"] = sorted(remaining)
+    else:
+        # Split the run containing the seat, if there is one
+        for i, (run_start, run_stop) in enumerate(runs):
+            if run_start <= position < run_stop:
+                runs[i:i + 1] = [run for run in [(run_start, position), (position + 1, run_stop)] if run[0] < run[1]]
+                break
+
+
+def get_first_free_seat(index):
+    """
+    Return the first unallocated seat in a free run index, filling the plane row by row from front to back
+
+    :param index: Free run index
+    :return: The seat number or None if there are no unallocated seats
     """
+    for entry in index.values():
+        if entry["runs"]:
+            return entry["seats"][entry["runs"][0][0]]
+    return None
+
 
-    matches = get_seat_allocations(from_plan)
-    if len(matches) > 0:
-        # First pass tries to put passengers in the same seats, on the basis that
-        # any seating swap is likely to be to a roughly equivalent layout rather
-        # than a totally different one (so seating class is deemed not to be an
-        # issue)
-        unallocated_passengers = []
-        for seat_number, passenger_id in matches:
-            try:
-                allocate_seat(to_plan, seat_number, passenger_id)
-            except ValueError:
-                unallocated_passengers.append(passenger_id)
-
-        # Second pass now uses a local function to put unallocated passengers
-        # in unallocated seats and then calls it using map, passing the lists
-        # of un-allocated seats and passengers
-        def allocate_unallocated_passenger(number, unallocated_passenger_id):
-            try:
-                allocate_seat(to_plan, number, unallocated_passenger_id)
-                return None
-            except ValueError:
-                # If we can't allocate a seat, return the passenger ID
-                return unallocated_passenger_id
-
-        # Note that the map() function is lazy evaluated so we need to force it to
-        # be evaluated in order to process the allocations - this will happen as a
-        # result of the comprehension
-        unallocated_seats = get_unallocated_seats(to_plan)
-        return [passenger_id
-                for passenger_id in map(allocate_unallocated_passenger, unallocated_seats, unallocated_passengers)
-                if passenger_id is not None]
+def find_seat_block(index, number_of_seats):
+    """
+    Find the best block of unallocated seats for a group of passengers using a free run index. The smallest
+    run of adjacent seats in a single row that will hold the whole group is preferred, with ties resolved in
+    favour of the front of the plane. If there is no such run, the group is split across the fewest adjacent
+    rows possible, using the longest run in each row
+
+    :param index: Free run index
+    :param number_of_seats: The number of seats required
+    :return: A list of seat numbers or None if there is no suitable block of seats
+    """
+    # Look for the best run in a single row
+    best = None
+    for entry in index.values():
+        for start, stop in entry["runs"]:
+            if stop - start >= number_of_seats and (best is None or stop - start < best[2] - best[1]):
+                best = (entry, start, stop)
+
+    if best is not None:
+        entry, start, _ = best
+        return list(entry["seats"][start:start + number_of_seats])
+
+    # Look for the smallest window of adjacent rows whose longest runs will hold the group between them, sliding
+    # the window from front to back and keeping a running total of the seats in it, so each row is added to and
+    # removed from the window at most once. A row with no unallocated seats can't be part of a window
+    rows = list(index.values())
+    longest_runs = [max(entry["runs"], key=lambda run: run[1] - run[0], default=(0, 0)) for entry in rows]
+    run_lengths = [stop - start for start, stop in longest_runs]
+    best = None
+    first = 0
+    total = 0
+    for last, run_length in enumerate(run_lengths):
+        if not run_length:
+            first, total = last + 1, 0
+            continue
+
+        # Drop rows from the front of the window while the rest of it will still hold the group
+        total += run_length
+        while total - run_lengths[first] >= number_of_seats:
+            total -= run_lengths[first]
+            first += 1
+
+        if total >= number_of_seats and (best is None or last - first < best[1] - best[0]):
+            best = (first, last)
+
+    if best is not None:
+        first, last = best
+        seat_numbers = [
+            seat_number
+            for entry, (start, stop) in zip(rows[first:last + 1], longest_runs[first:last + 1])
+            for seat_number in entry["seats"][start:stop]
+        ]
+        return seat_numbers[:number_of_seats]
+
+    return None
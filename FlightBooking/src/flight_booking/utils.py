@@ -71,6 +71,36 @@ def get_seating_file_path(airline, aircraft, layout=None):
     return os.path.join(plan_folder, file_name.lower())
 
 
+def get_boarding_card_file_name_parts(flight_number, departure_date, card_format):
+    """
+    Return the folder and the parts of the file name that are the same for all boarding cards for a flight, so
+    the path to each card can be constructed by inserting the formatted seat number between the prefix and suffix
+
+    :param flight_number: Flight number
+    :param departure_date: Departure date and time
+    :param card_format: Boarding card format, used as the file extension
+    :return: Tuple of the boarding card folder, file name prefix and file name suffix
+    """
+    # Boarding card file names are flight-number_seat-number_date.format
+    card_folder = get_data_folder("boarding_cards")
+    prefix = re.sub("\\W", "_", f"{flight_number}_").lower()
+    suffix = re.sub("\\W", "_", f"_{departure_date.strftime('%Y%m%d')}").lower() + "." + card_format
+    return card_folder, prefix, suffix
+
+
+def format_seat_number_for_file_name(seat_number):
+    """
+    Format a seat number for inclusion in a boarding card file name
+
+    :param seat_number: Seat number e.g. 3A
+    :return: Seat number with non-alphanumeric characters replaced with underscores, in lower case
+    """
+    # Seat numbers are normally alphanumeric, in which case the regular expression isn't needed
+    if seat_number.isascii() and seat_number.isalnum():
+        return seat_number.lower()
+    return re.sub("\\W", "_", seat_number).lower()
+
+
 def get_boarding_card_path(flight_number, seat_number, departure_date, card_format):
     """
     Construct the path to a boarding card file
@@ -81,13 +111,8 @@ def get_boarding_card_path(flight_number, seat_number, departure_date, card_form
     :param card_format: Boarding card format, used as the file extension
     :return:
     """
-    # Boarding card file names are flight-number_seat-number_date.csv
-    card_folder = get_data_folder("boarding_cards")
-    file_name = "_".join([flight_number, seat_number, departure_date.strftime("%Y%m%d")])
-
-    # Replace non-alphanumeric characters with underscores
-    file_name = re.sub("\\W", "_", file_name).lower()
-    return os.path.join(card_folder, file_name.lower() + "." + card_format)
+    card_folder, prefix, suffix = get_boarding_card_file_name_parts(flight_number, departure_date, card_format)
+    return os.path.join(card_folder, prefix + format_seat_number_for_file_name(seat_number) + suffix)
 
 
 def get_lookup_file_path(file_name):
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.booking_app.batch import parse_command, parse_batch_file, run_commands
+from src.booking_app.booking_app_main import main
+from tests.helpers import binary_card_generator, remove_files, get_flight_boarding_card_file_path
+
+CREATE_COMMAND = ["create", "LGW", "RMU", "EasyJet", "U28549", "20/11/2099", "10:45", "2:35"]
+
+
+def commands(*lines):
+    return [(" ".join(words), parse_command(words)) for words in lines]
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self._folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._folder.cleanup()
+        remove_files("flights")
+
+    def _write_file(self, file_name, content):
+        file_path = os.path.join(self._folder.name, file_name)
+        with open(file_path, mode="wt", encoding="utf-8") as f:
+            f.write(content)
+        return file_path
+
+    def test_invalid_command_is_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_command(["not-a-command"])
+
+    def test_missing_arguments_are_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_command(["seating"])
+
+    @patch("builtins.print")
+    def test_can_run_commands(self, _):
+        flight, failures = run_commands(commands(
+            CREATE_COMMAND,
+            ["seating", "A321", "neo"],
+            ["add-passenger", "Some Passenger", "M", "01/02/1970", "England", "UK", "1234567890", "--seat", "1A"],
+            ["add-passenger", "Another Passenger", "F", "19800304", "England", "UK", "0987654321"],
+            ["allocate", "0987654321", "1B"],
+            ["remove-passenger", "1234567890"]
+        ))
+        self.assertEqual(0, failures)
+        self.assertEqual("U28549", flight.number)
+        self.assertEqual("A321", flight.aircraft)
+        self.assertEqual(1, len(flight.passengers))
+        passenger = list(flight.passengers.values())[0]
+        self.assertEqual("19800304", passenger["dob"])
+        self.assertEqual("1B", flight.get_allocated_seat(passenger["id"]))
+
+    @patch("builtins.print")
+    def test_can_import_passengers(self, _):
+        file_path = self._write_file("passengers.csv", "name,gender,dob,nationality,residency,passport_number\n"
+                                                       "Some Passenger,M,01/02/1970,England,UK,1234567890\n"
+                                                       "Another Passenger,f,19800304,England,UK,0987654321\n")
+        flight, failures = run_commands(commands(
+            CREATE_COMMAND,
+            ["seating", "A321", "neo"],
+            ["import-passengers", file_path, "--allocate"]
+        ))
+        self.assertEqual(0, failures)
+        self.assertEqual(2, len(flight.passengers))
+        self.assertEqual(2, flight.capacity - flight.available_capacity)
+
+    @patch("builtins.print")
+    def test_import_requires_passenger_columns(self, mock_print):
+        file_path = self._write_file("passengers.csv", "name,gender\nSome Passenger,M\n")
+        _, failures = run_commands(commands(CREATE_COMMAND, ["import-passengers", file_path]))
+        self.assertEqual(1, failures)
+        self.assertIn("missing the columns dob", mock_print.call_args.args[0])
+
+    @patch("builtins.print")
+    def test_command_requires_flight(self, mock_print):
+        _, failures = run_commands(commands(["details"]))
+        self.assertEqual(1, failures)
+        self.assertIn("requires a valid flight", mock_print.call_args.args[0])
+
+    @patch("builtins.print")
+    def test_stops_at_first_failure(self, _):
+        flight, failures = run_commands(commands(["details"], CREATE_COMMAND))
+        self.assertEqual(1, failures)
+        self.assertIsNone(flight)
+
+    @patch("builtins.print")
+    def test_can_keep_going_after_failure(self, _):
+        flight, failures = run_commands(commands(["details"], CREATE_COMMAND), keep_going=True)
+        self.assertEqual(1, failures)
+        self.assertEqual("U28549", flight.number)
+
+    @patch("flight_booking.flight.card_generator_map", {"pdf": binary_card_generator})
+    @patch("builtins.print")
+    def test_can_generate_boarding_cards(self, _):
+        remove_files("boarding_cards")
+        flight, failures = run_commands(commands(
+            CREATE_COMMAND,
+            ["seating", "A321", "neo"],
+            ["add-passenger", "Some Passenger", "M", "01/02/1970", "England", "UK", "1234567890", "--seat", "5D"],
+            ["boarding-cards", "28A"]
+        ))
+        self.assertEqual(0, failures)
+        self.assertTrue(os.path.exists(get_flight_boarding_card_file_path(flight, "5D", "pdf")))
+        remove_files("boarding_cards")
+
+    def test_batch_file_errors_report_line(self):
+        file_path = self._write_file("batch.txt", "# Comment\n\nseating\n")
+        with self.assertRaises(ValueError) as e:
+            parse_batch_file(file_path)
+        self.assertIn(f"{file_path}:3:", str(e.exception))
+
+    @patch("builtins.print")
+    def test_can_run_batch_files(self, _):
+        file_path = self._write_file("batch.txt", " ".join(CREATE_COMMAND) + "\n"
+                                                  "seating A321 neo  # Comment\n"
+                                                  "add-passenger 'Some Passenger' M 01/02/1970 England UK 1234567890\n"
+                                                  "save\n")
+        self.assertEqual(0, main(["--timings", "run", file_path]))
+
+        flight, failures = run_commands(commands(["load", "U28549", "20/11/2099"]))
+        self.assertEqual(0, failures)
+        self.assertEqual(1, len(flight.passengers))
+
+    @patch("builtins.print")
+    def test_can_run_command_on_saved_flight(self, _):
+        self.assertEqual(0, main(["--save"] + CREATE_COMMAND))
+        self.assertEqual(0, main(["--flight", "U28549", "20/11/2099", "--save", "seating", "A321", "neo"]))
+
+        flight, _ = run_commands(commands(["load", "U28549", "20/11/2099"]))
+        self.assertEqual("A321", flight.aircraft)
+
+    @patch("builtins.print")
+    def test_failed_command_sets_exit_code(self, _):
+        self.assertEqual(1, main(["details"]))
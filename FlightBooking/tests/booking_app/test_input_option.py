@@ -1,7 +1,8 @@
 import unittest
+import os
 from unittest.mock import patch
 from src.booking_app.option_handler import input_option, call_option_function
-from tests.helpers import create_test_flight
+from tests.helpers import create_test_flight, remove_files
 
 
 def create_flight():
@@ -90,3 +91,19 @@ class TestInputOption(unittest.TestCase):
         self.assertEqual("RMU", result.destination_airport_code)
         self.assertEqual("EasyJet", result.airline)
         self.assertEqual("U28549", result.number)
+
+    @patch("builtins.print")
+    def test_call_function_with_profiling(self, mock_print):
+        option = {
+            "description": "Test Option",
+            "has_flight_parameter": False,
+            "function": dummy_function_4
+        }
+        result = call_option_function(option, None, profile=True)
+        self.assertEqual("U28549", result.number)
+
+        printed = [str(call.args[0]) for call in mock_print.call_args_list if call.args]
+        pstats_file = [line for line in printed if line.startswith("Profile written to ")][0][19:]
+        self.assertTrue(os.path.basename(pstats_file).startswith("test_option_"))
+        self.assertTrue(os.path.exists(pstats_file))
+        remove_files("profiles")
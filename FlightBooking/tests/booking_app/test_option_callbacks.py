@@ -2,6 +2,7 @@ import unittest
 import os
 from unittest.mock import patch
 from src.booking_app.option_callbacks import add_passenger_to_flight, \
+    add_passenger, \
     save_flight, \
     load_flight, \
     allocate_seat, \
@@ -37,6 +38,12 @@ class TestOptionCallbacks(unittest.TestCase):
         add_passenger_to_flight(self._flight)
         self.assertEqual(0, len(self._flight.passengers))
 
+    def test_can_add_passenger_with_seat(self):
+        self._flight.load_seating("A321", "neo")
+        add_passenger(self._flight, self._passenger, "5D")
+        self.assertEqual(1, len(self._flight.passengers))
+        self.assertEqual("5D", self._flight.get_allocated_seat(self._passenger["id"]))
+
     def test_can_save_flight(self):
         delete_flight_data_file(self._flight)
         save_flight(self._flight)
@@ -0,0 +1,231 @@
+import unittest
+from unittest.mock import patch
+import datetime
+from src.booking_web.booking import app, booking_model
+from src.booking_web.model import flight_cache
+from src.booking_web import api
+from src.flight_booking import Flight
+from tests.helpers import remove_files, text_card_generator
+
+FLIGHT_URL = "/api/flights/U29549/2099-11-20"
+
+
+def create_passenger_properties(index, **properties):
+    return dict({
+        "name": f"Passenger {index}",
+        "gender": "M" if index % 2 else "F",
+        "dob": "1980-01-01",
+        "nationality": "United Kingdom",
+        "residency": "United Kingdom",
+        "passport_number": str(index).zfill(6)
+    }, **properties)
+
+
+class TestApi(unittest.TestCase):
+    def setUp(self) -> None:
+        self.addCleanup(self._remove_flight)
+        self._client = app.test_client()
+        response = self._client.post("/api/flights", json={
+            "embarkation": "LGW",
+            "destination": "RMU",
+            "airline": "EasyJet",
+            "number": "U29549",
+            "departs": "2099-11-20T10:45",
+            "duration": "2:35",
+            "aircraft": "A321",
+            "layout": "neo"
+        })
+        self.assertEqual(201, response.status_code)
+
+    @staticmethod
+    def _remove_flight():
+        flight_cache.clear()
+        booking_model.close_flight()
+        remove_files("flights")
+        remove_files("boarding_cards")
+
+    def _add_passengers(self, count, **properties):
+        passengers = [create_passenger_properties(i, **properties) for i in range(count)]
+        response = self._client.post(f"{FLIGHT_URL}/passengers", json=passengers)
+        self.assertEqual(201, response.status_code)
+        return response.get_json()
+
+    def test_can_create_flight(self):
+        response = self._client.get(FLIGHT_URL)
+        self.assertEqual(200, response.status_code)
+        flight = response.get_json()
+        self.assertEqual("U29549", flight["number"])
+        self.assertEqual("2099-11-20T10:45", flight["departs"])
+        self.assertEqual("2:35", flight["duration"])
+        self.assertEqual(235, flight["capacity"])
+        self.assertEqual(0, flight["passengers"])
+
+    def test_cannot_create_existing_flight(self):
+        response = self._client.post("/api/flights", json={
+            "embarkation": "LGW",
+            "destination": "RMU",
+            "airline": "EasyJet",
+            "number": "U29549",
+            "departs": "2099-11-20T18:00",
+            "duration": "2:35"
+        })
+        self.assertEqual(409, response.status_code)
+
+    def test_cannot_create_flight_with_missing_property(self):
+        response = self._client.post("/api/flights", json={"number": "U28550"})
+        self.assertEqual(400, response.status_code)
+        self.assertIn("error", response.get_json())
+
+    def test_cannot_create_flight_with_invalid_property(self):
+        response = self._client.post("/api/flights", json={
+            "embarkation": "LGW",
+            "destination": "RMU",
+            "airline": "EasyJet",
+            "number": 1234,
+            "departs": "2099-11-20T10:45",
+            "duration": "2:35"
+        })
+        self.assertEqual(400, response.status_code)
+        self.assertEqual("Property number must be a string", response.get_json()["error"])
+
+    def test_unexpected_error_is_not_a_client_error(self):
+        for error in [KeyError("capacity"), ValueError("Unexpected")]:
+            with patch("src.booking_web.api._flight_to_dict", side_effect=error):
+                response = self._client.get(FLIGHT_URL)
+            self.assertEqual(500, response.status_code)
+
+    def test_unknown_passenger_is_not_found(self):
+        response = self._client.delete(f"{FLIGHT_URL}/passengers/unknown")
+        self.assertEqual(404, response.status_code)
+        response = self._client.post(f"{FLIGHT_URL}/seats", json={"passenger_id": "unknown"})
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(0, response.get_json()["index"])
+
+    def test_missing_flight_is_not_found(self):
+        response = self._client.get("/api/flights/U29549/2099-11-21")
+        self.assertEqual(404, response.status_code)
+
+    def test_can_add_batch_of_passengers(self):
+        passengers = self._add_passengers(200, allocate=True)
+        self.assertEqual(200, len(passengers))
+        self.assertEqual("1A", passengers[0]["seat_number"])
+        self.assertTrue(all(passenger["seat_number"] for passenger in passengers))
+
+        flight = self._client.get(FLIGHT_URL).get_json()
+        self.assertEqual(200, flight["passengers"])
+        self.assertEqual(35, flight["available_capacity"])
+
+    def test_failed_passenger_batch_is_not_applied(self):
+        passengers = [create_passenger_properties(i) for i in range(5)]
+        passengers[3]["gender"] = "X"
+        response = self._client.post(f"{FLIGHT_URL}/passengers", json=passengers)
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(3, response.get_json()["index"])
+        self.assertEqual(0, self._client.get(FLIGHT_URL).get_json()["passengers"])
+        self._add_passengers(1)
+
+    def test_cannot_add_passenger_batch_larger_than_maximum(self):
+        passengers = [create_passenger_properties(i) for i in range(api.MAX_BATCH_SIZE + 1)]
+        response = self._client.post(f"{FLIGHT_URL}/passengers", json=passengers)
+        self.assertEqual(400, response.status_code)
+
+    def test_can_remove_passenger(self):
+        passenger = self._add_passengers(1)[0]
+        response = self._client.delete(f"{FLIGHT_URL}/passengers/{passenger['id']}")
+        self.assertEqual(204, response.status_code)
+        self.assertEqual([], self._client.get(f"{FLIGHT_URL}/passengers").get_json())
+
+    def test_can_allocate_batch_of_seats(self):
+        passengers = self._add_passengers(50)
+        allocations = [{"passenger_id": passenger["id"]} for passenger in passengers]
+        allocations[0]["seat_number"] = "20F"
+        response = self._client.post(f"{FLIGHT_URL}/seats", json=allocations)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("20F", response.get_json()[0]["seat_number"])
+        self.assertEqual(50, len(self._client.get(f"{FLIGHT_URL}/seats").get_json()))
+
+    def test_failed_seat_batch_is_not_applied(self):
+        passengers = self._add_passengers(3)
+        self._client.post(f"{FLIGHT_URL}/seats", json={"passenger_id": passengers[0]["id"], "seat_number": "2A"})
+        response = self._client.post(f"{FLIGHT_URL}/seats", json=[
+            {"passenger_id": passengers[0]["id"], "seat_number": "3A"},
+            {"passenger_id": passengers[1]["id"], "seat_number": "3B"},
+            {"passenger_id": passengers[2]["id"], "seat_number": "3B"}
+        ])
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(2, response.get_json()["index"])
+
+        seats = self._client.get(f"{FLIGHT_URL}/seats").get_json()
+        self.assertEqual([{"seat_number": "2A", "passenger_id": passengers[0]["id"]}], seats)
+
+    def test_can_clear_seat_allocation(self):
+        passenger = self._add_passengers(1, seat_number="4C")[0]
+        response = self._client.delete(f"{FLIGHT_URL}/seats/{passenger['id']}")
+        self.assertEqual(204, response.status_code)
+        self.assertIsNone(self._client.get(f"{FLIGHT_URL}/passengers").get_json()[0]["seat_number"])
+
+    def test_web_application_and_api_share_flight(self):
+        booking_model.load("U29549", "20/11/2099")
+        self._add_passengers(1)
+        booking_model.add_passenger("Web Passenger", "F", "01/01/1980", "United Kingdom", "United Kingdom", "999999")
+        booking_model.save()
+        booking_model.close_flight()
+        self._add_passengers(1, passport_number="888888")
+
+        flight = Flight.load_flight("U29549", datetime.date(2099, 11, 20))
+        self.assertEqual(["000000", "888888", "999999"],
+                         sorted(passenger["passport_number"] for passenger in flight.passengers.values()))
+
+    def test_unsaved_web_application_changes_are_not_saved_by_api(self):
+        booking_model.load("U29549", "20/11/2099")
+        booking_model.add_passenger("Web Passenger", "F", "01/01/1980", "United Kingdom", "United Kingdom", "999999")
+
+        response = self._client.post(f"{FLIGHT_URL}/passengers", json=create_passenger_properties(0))
+        self.assertEqual(409, response.status_code)
+        self.assertEqual(0, self._client.get(FLIGHT_URL).get_json()["passengers"])
+        self.assertEqual(0, len(Flight.load_flight("U29549", datetime.date(2099, 11, 20)).passengers))
+
+        booking_model.save()
+        self._add_passengers(1)
+        self.assertEqual(2, self._client.get(FLIGHT_URL).get_json()["passengers"])
+
+    def test_flight_is_reloaded_when_data_file_changes(self):
+        flight = Flight.load_flight("U29549", datetime.date(2099, 11, 20))
+        flight.load_seating("A320", "1")
+        flight.save()
+        self.assertEqual(186, self._client.get(FLIGHT_URL).get_json()["capacity"])
+
+    def test_unchanged_flight_returns_not_modified(self):
+        response = self._client.get(f"{FLIGHT_URL}/passengers")
+        etag = response.headers["ETag"]
+        response = self._client.get(f"{FLIGHT_URL}/passengers", headers={"If-None-Match": etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response.headers["ETag"])
+
+        self._add_passengers(1)
+        response = self._client.get(f"{FLIGHT_URL}/passengers", headers={"If-None-Match": etag})
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers["ETag"])
+        self.assertEqual(1, len(response.get_json()))
+
+    def test_can_get_seat_map(self):
+        self._add_passengers(1, allocate=True)
+        response = self._client.get(f"{FLIGHT_URL}/seat_map")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("image/svg+xml", response.mimetype)
+        self.assertIn("Passenger 0", response.get_data(as_text=True))
+
+        response = self._client.get(f"{FLIGHT_URL}/seat_map", headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEqual(304, response.status_code)
+
+    @patch("flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    def test_can_generate_boarding_cards(self):
+        self._add_passengers(2, allocate=True)
+        response = self._client.post(f"{FLIGHT_URL}/boarding_cards", json={"gate": "28", "format": "txt"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(["1A", "1B"], sorted(response.get_json()["generated"]))
+
+    def test_cannot_generate_boarding_cards_in_unknown_format(self):
+        self._add_passengers(1, allocate=True)
+        response = self._client.post(f"{FLIGHT_URL}/boarding_cards", json={"gate": "28", "format": "unknown"})
+        self.assertEqual(400, response.status_code)
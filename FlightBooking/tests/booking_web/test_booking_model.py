@@ -2,7 +2,8 @@ import unittest
 import datetime
 import os
 from flight_booking.utils import get_flight_file_path
-from src.booking_web.model import FlightBookingModel
+from src.booking_web.model import FlightBookingModel, FlightCache, PassengerSeatView
+from tests.helpers import remove_files
 
 
 class TestFlightBookingModel(unittest.TestCase):
@@ -186,3 +187,139 @@ class TestFlightBookingModel(unittest.TestCase):
         self.assertIsNotNone(self._model.flight)
         self._model.close_flight()
         self.assertIsNone(self._model.flight)
+
+    def test_can_get_passenger_page(self):
+        self._model.create_dummy_flight(number_of_passengers=25,
+                                        aircraft="A321",
+                                        layout="neo",
+                                        perform_seat_allocations=True)
+
+        page = self._model.get_passenger_page(page=3, page_size=10)
+        self.assertEqual(3, page["pages"])
+        self.assertEqual(25, page["matches"])
+        self.assertEqual(25, page["total"])
+        self.assertEqual([21, 22, 23, 24, 25], [passenger["number"] for passenger in page["passengers"]])
+        self.assertEqual("5D", page["passengers"][-1]["seat_number"])
+
+    def test_page_beyond_last_page_is_empty(self):
+        self._model.create_dummy_flight(number_of_passengers=5)
+        page = self._model.get_passenger_page(page=2, page_size=10)
+        self.assertEqual(1, page["pages"])
+        self.assertEqual([], page["passengers"])
+
+    def test_can_sort_passenger_page_by_seat(self):
+        self._model.create_dummy_flight(number_of_passengers=12,
+                                        aircraft="A321",
+                                        layout="neo",
+                                        perform_seat_allocations=True)
+        passenger_id = list(self._model.flight.passengers)[0]
+        self._model.flight.allocate_seat("10A", passenger_id)
+
+        page = self._model.get_passenger_page(sort="seat_number", reverse=True, page_size=3)
+        self.assertEqual(["10A", "3C", "3B"], [passenger["seat_number"] for passenger in page["passengers"]])
+
+    def test_unallocated_passengers_sort_last_by_seat(self):
+        self._model.create_dummy_flight(number_of_passengers=3, aircraft="A321", layout="neo")
+        passenger_id = list(self._model.flight.passengers)[2]
+        self._model.flight.allocate_seat("5C", passenger_id)
+
+        page = self._model.get_passenger_page(sort="seat_number")
+        self.assertEqual(["5C", None, None], [passenger["seat_number"] for passenger in page["passengers"]])
+
+    def test_can_filter_passenger_page(self):
+        self._model.create_dummy_flight(number_of_passengers=20,
+                                        aircraft="A321",
+                                        layout="neo",
+                                        perform_seat_allocations=True)
+
+        page = self._model.get_passenger_page(name="passenger 1", sort="name")
+        self.assertEqual(11, page["matches"])
+        self.assertEqual("Passenger 1", page["passengers"][0]["name"])
+
+        page = self._model.get_passenger_page(seat_number="2")
+        self.assertEqual(["2A", "2B", "2C", "2D", "2E", "2F"], [p["seat_number"] for p in page["passengers"]])
+
+        page = self._model.get_passenger_page(seat_number="3b")
+        self.assertEqual(["3B"], [p["seat_number"] for p in page["passengers"]])
+
+        passport_number = list(self._model.flight.passengers.values())[7]["passport_number"]
+        page = self._model.get_passenger_page(passport_number=passport_number)
+        self.assertEqual([8], [p["number"] for p in page["passengers"]])
+
+    def test_invalid_passenger_page_parameters_are_rejected(self):
+        self._model.create_dummy_flight(number_of_passengers=1)
+        for parameters in [{"page": 0}, {"page_size": 0}, {"page_size": 100000}, {"sort": "gender"}]:
+            with self.assertRaises(ValueError):
+                self._model.get_passenger_page(**parameters)
+
+    def test_passenger_view_reflects_passenger(self):
+        self._model.create_dummy_flight(number_of_passengers=1,
+                                        aircraft="A321",
+                                        layout="neo",
+                                        perform_seat_allocations=True)
+
+        passenger_id = list(self._model.flight.passengers.keys())[0]
+        view = self._model.get_passengers_including_seat_allocations()[passenger_id]
+        self.assertIsInstance(view, PassengerSeatView)
+        self.assertEqual(1, view["number"])
+        self.assertEqual("1A", view["seat_number"])
+
+        self._model.flight.passengers[passenger_id]["name"] = "Renamed Passenger"
+        self.assertEqual("Renamed Passenger", view["name"])
+        self.assertEqual("Renamed Passenger", view.to_dict()["name"])
+        self.assertEqual(9, len(view.to_dict()))
+
+    def test_passenger_view_is_read_only(self):
+        self._model.create_dummy_flight(number_of_passengers=1)
+        view = list(self._model.get_passengers_including_seat_allocations().values())[0]
+        with self.assertRaises(TypeError):
+            view["name"] = "Renamed Passenger"
+
+
+class TestFlightCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cache = FlightCache(max_size=2)
+        self._flights = []
+        for number in ["U28001", "U28002", "U28003"]:
+            model = FlightBookingModel()
+            model.create_flight("LGW", "RMU", "EasyJet", number, "20/11/2099", "10:45", "2:35")
+            self._cache.save(model.flight)
+            self._flights.append(model.flight)
+
+    def tearDown(self) -> None:
+        remove_files("flights")
+
+    def test_cache_returns_same_instance(self):
+        flight = self._flights[-1]
+        self.assertIs(flight, self._cache.get(flight.number, flight.departure_date))
+
+    def test_least_recently_used_flight_is_discarded(self):
+        self.assertEqual(2, len(self._cache))
+        flight = self._flights[0]
+        loaded = self._cache.get(flight.number, flight.departure_date)
+        self.assertIsNot(flight, loaded)
+        self.assertEqual(flight.number, loaded.number)
+        self.assertEqual(2, len(self._cache))
+
+    def test_flight_is_reloaded_when_data_file_changes(self):
+        flight = self._flights[-1]
+        changed = FlightCache().get(flight.number, flight.departure_date)
+        changed.load_seating("A320", "1")
+        changed.save()
+
+        loaded = self._cache.get(flight.number, flight.departure_date)
+        self.assertIsNot(flight, loaded)
+        self.assertEqual(186, loaded.capacity)
+
+    def test_unsaved_changes_are_detected(self):
+        flight = self._flights[-1]
+        self.assertFalse(self._cache.has_unsaved_changes(flight))
+        flight.load_seating("A320", "1")
+        self.assertTrue(self._cache.has_unsaved_changes(flight))
+        self._cache.save(flight)
+        self.assertFalse(self._cache.has_unsaved_changes(flight))
+        self.assertTrue(self._cache.has_unsaved_changes(self._flights[0]))
+
+    def test_missing_flight_is_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            self._cache.get("U28004", datetime.date(2099, 11, 20))
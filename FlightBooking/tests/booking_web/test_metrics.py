@@ -0,0 +1,78 @@
+import unittest
+from flight_booking.instrumentation import add_sink, remove_sink
+from src.booking_web.metrics import MetricsRegistry, Counter, Gauge, Histogram
+from src.booking_web.model import FlightBookingModel, FlightCache
+from src.booking_web.booking import app
+from tests.helpers import remove_files
+
+
+class TestMetrics(unittest.TestCase):
+    def test_can_render_counter(self):
+        counter = Counter("test_total", "Test counter", ("route",))
+        counter.inc(("/",))
+        counter.inc(("/",), 2)
+        self.assertEqual(["# HELP test_total Test counter", "# TYPE test_total counter", 'test_total{route="/"} 3'],
+                         counter.render())
+
+    def test_can_render_gauge(self):
+        gauge = Gauge("test_in_progress", "Test gauge")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        self.assertEqual("test_in_progress 1", gauge.render()[-1])
+
+    def test_can_render_histogram(self):
+        histogram = Histogram("test_seconds", "Test histogram", ("route",), buckets=(0.1, 1.0))
+        for value in [0.05, 0.5, 0.5, 5.0]:
+            histogram.observe(value, ("/",))
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{route="/",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{route="/",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{route="/",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_sum{route="/"} 6.05', lines)
+        self.assertIn('test_seconds_count{route="/"} 4', lines)
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("test_total", "Test counter", ("route",))
+        counter.inc(('a"b\\c\nd',))
+        self.assertEqual('test_total{route="a\\"b\\\\c\\nd"} 1', counter.render()[-1])
+
+    def test_registry_records_instrumentation(self):
+        registry = MetricsRegistry()
+        registry.timing("boarding_cards.render", 0.002)
+        registry.count("flight.passengers_added", 3)
+        registry.count("flight.passengers_added", 1)
+        metrics = registry.render()
+        self.assertIn('flight_booking_operation_duration_seconds_count{operation="boarding_cards.render"} 1', metrics)
+        self.assertIn("flight_booking_flight_passengers_added_total 4", metrics)
+
+    def test_registry_records_flight_cache_hits_and_misses(self):
+        registry = MetricsRegistry()
+        add_sink(registry)
+        self.addCleanup(remove_sink, registry)
+        self.addCleanup(remove_files, "flights")
+
+        model = FlightBookingModel()
+        model.create_flight("LGW", "RMU", "EasyJet", "U28001", "20/11/2099", "10:45", "2:35")
+        model.flight.save()
+        cache = FlightCache()
+        for _ in range(3):
+            cache.get(model.flight.number, model.flight.departure_date)
+
+        metrics = registry.render()
+        self.assertIn("flight_booking_flight_cache_hits_total 2", metrics)
+        self.assertIn("flight_booking_flight_cache_misses_total 1", metrics)
+
+    def test_metrics_endpoint_reports_requests(self):
+        client = app.test_client()
+        client.get("/airports/search?q=gat")
+        client.get("/airports/search?q=gat&limit=0")
+        response = client.get("/metrics")
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+
+        metrics = response.get_data(as_text=True)
+        self.assertIn('booking_web_requests_total{route="/airports/search",method="GET",status="200"}', metrics)
+        self.assertIn('booking_web_requests_total{route="/airports/search",method="GET",status="400"}', metrics)
+        self.assertIn('booking_web_requests_in_progress{route="/airports/search"} 0', metrics)
+        self.assertIn('booking_web_request_duration_seconds_count{route="/airports/search",method="GET"}', metrics)
@@ -0,0 +1,30 @@
+import unittest
+from src.booking_web.booking import app, booking_model
+
+
+class TestPassengerPage(unittest.TestCase):
+    def tearDown(self) -> None:
+        booking_model.close_flight()
+
+    def test_can_get_passenger_page(self):
+        booking_model.create_dummy_flight(30, "A321", "neo", True)
+        response = app.test_client().get("/list_passengers/page?page=2&page_size=20&sort=seat_number&order=desc")
+        self.assertEqual(200, response.status_code)
+
+        page = response.get_json()
+        self.assertEqual(2, page["page"])
+        self.assertEqual(2, page["pages"])
+        self.assertEqual(30, page["total"])
+        self.assertEqual(10, len(page["passengers"]))
+        self.assertEqual("1A", page["passengers"][-1]["seat_number"])
+
+    def test_invalid_parameters_are_rejected(self):
+        booking_model.create_dummy_flight(1)
+        for query in ["page=x", "page=0", "sort=gender"]:
+            response = app.test_client().get(f"/list_passengers/page?{query}")
+            self.assertEqual(400, response.status_code)
+            self.assertIn("error", response.get_json())
+
+    def test_page_requires_flight(self):
+        response = app.test_client().get("/list_passengers/page")
+        self.assertEqual(404, response.status_code)
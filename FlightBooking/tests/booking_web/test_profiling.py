@@ -0,0 +1,29 @@
+import os
+import unittest
+from src.booking_web.booking import app
+from src.booking_web.profiling import PROFILE_HEADER
+from tests.helpers import remove_files
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self) -> None:
+        app.debug = False
+        remove_files("profiles")
+
+    def test_request_is_profiled_in_debug_mode(self):
+        app.debug = True
+        response = app.test_client().get("/airports/search?q=gat&profile=1")
+        self.assertEqual(200, response.status_code)
+        file_path = response.headers[PROFILE_HEADER]
+        self.assertTrue(os.path.basename(file_path).startswith("web_airport_search_"))
+        self.assertTrue(os.path.exists(file_path))
+
+    def test_request_is_not_profiled_without_debug_mode(self):
+        response = app.test_client().get("/airports/search?q=gat&profile=1")
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn(PROFILE_HEADER, response.headers)
+
+    def test_request_is_not_profiled_by_default(self):
+        app.debug = True
+        response = app.test_client().get("/airports/search?q=gat")
+        self.assertNotIn(PROFILE_HEADER, response.headers)
@@ -0,0 +1,78 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from src.booking_web.booking import app, booking_model
+from src.booking_web.seat_map import get_seat_map, render_seat_map, clear_seat_map_cache, seat_maps, OCCUPIED_COLOUR
+
+
+class TestSeatMap(unittest.TestCase):
+    def setUp(self) -> None:
+        booking_model.create_dummy_flight(2, "A321", "neo", True)
+        self._flight = booking_model.flight
+
+    def tearDown(self) -> None:
+        clear_seat_map_cache()
+        booking_model.close_flight()
+
+    def test_can_render_seat_map(self):
+        seat_map = render_seat_map(self._flight)
+        self.assertTrue(seat_map.startswith("<svg"))
+        self.assertEqual(self._flight.capacity, seat_map.count("<rect x=") - seat_map.count('width="12"'))
+        self.assertEqual(2, seat_map.count(f'fill="{OCCUPIED_COLOUR}" stroke='))
+        self.assertIn("1A Up Front:", seat_map)
+
+    def test_cannot_render_seat_map_without_seating_plan(self):
+        booking_model.create_dummy_flight()
+        with self.assertRaises(Exception) as context:
+            render_seat_map(booking_model.flight)
+        self.assertEqual("InvalidOperationError", type(context.exception).__name__)
+
+    def test_seat_map_is_drawn_from_flight_seating_plan(self):
+        removed = self._flight.seating_plan.pop("40")
+        with patch("flight_booking.seating_plan.get_plan_template", side_effect=AssertionError("Plan file read")):
+            seat_map = render_seat_map(self._flight)
+        seat_count = seat_map.count("<rect x=") - seat_map.count('width="12"')
+        self.assertEqual(self._flight.capacity - len(removed["seats"]), seat_count)
+        self.assertNotIn(">40</text>", seat_map)
+
+    def test_seat_map_cache_is_thread_safe(self):
+        flights = []
+        for number in range(20):
+            booking_model.create_flight(embarkation="LGW", destination="RMU", airline="EasyJet",
+                                        number=f"U2{number:04d}", departure_date="20/11/2021",
+                                        departure_time="10:45", duration="2:25")
+            booking_model.flight.load_seating("A320", "1")
+            flights.append(booking_model.flight)
+
+        with patch("src.booking_web.seat_map.MAX_SEAT_MAPS", 4), ThreadPoolExecutor(max_workers=8) as executor:
+            seat_maps_rendered = list(executor.map(get_seat_map, flights * 5))
+
+        self.assertEqual(100, len(seat_maps_rendered))
+        self.assertEqual(4, len(seat_maps))
+
+    def test_seat_map_is_cached_until_flight_changes(self):
+        seat_map = get_seat_map(self._flight)
+        self.assertIs(seat_map, get_seat_map(self._flight))
+
+        passenger_id = list(self._flight.passengers)[0]
+        self._flight.clear_seat_allocation(passenger_id)
+        updated = get_seat_map(self._flight)
+        self.assertIsNot(seat_map, updated)
+        self.assertEqual(1, updated.count(f'fill="{OCCUPIED_COLOUR}" stroke='))
+
+    def test_seat_map_cache_is_bounded(self):
+        with patch("src.booking_web.seat_map.MAX_SEAT_MAPS", 2):
+            get_seat_map(self._flight)
+            for number in ["U28550", "U28551"]:
+                booking_model.create_flight(embarkation="LGW", destination="RMU", airline="EasyJet", number=number,
+                                            departure_date="20/11/2021", departure_time="10:45", duration="2:25")
+                booking_model.flight.load_seating("A321", "neo")
+                get_seat_map(booking_model.flight)
+
+        departure_date = self._flight.departure_date
+        self.assertEqual([("U28550", departure_date), ("U28551", departure_date)], list(seat_maps))
+
+    def test_seat_map_page_requires_seating_plan(self):
+        booking_model.create_dummy_flight()
+        response = app.test_client().get("/seat_map")
+        self.assertEqual(302, response.status_code)
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.flight_booking.airport import get_airport, convert_airport_lookup, clear_airport_lookup, search_airports, \
+    get_airport_timezone, build_airport_search_index
+from src.flight_booking.exceptions import AirportCodeNotFoundError
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV, get_lookup_file_path
+
+
+class TestAirport(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+        self._data_folder = tempfile.TemporaryDirectory()
+        os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = self._data_folder.name
+        self._write_airports({
+            "LGW": {"code": "LGW", "name": "London Gatwick", "tz": "Europe/London"},
+            "ALC": {"code": "ALC", "name": "Alicante", "tz": "Europe/Madrid"},
+            "EGLL": {"code": "EGLL", "name": "London Heathrow", "tz": "Europe/London"},
+            "ZRH": {"code": "ZRH", "name": "Zürich", "tz": "Europe/Zurich"}
+        })
+        clear_airport_lookup()
+
+    def tearDown(self) -> None:
+        clear_airport_lookup()
+        if self._original_data_folder is None:
+            del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+        else:
+            os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = self._original_data_folder
+        self._data_folder.cleanup()
+
+    @staticmethod
+    def _write_airports(airports):
+        with open(get_lookup_file_path("airport_codes.json"), mode="wt", encoding="utf-8") as f:
+            json.dump({"airport_codes": airports}, f)
+
+    def test_get_airport_from_json(self):
+        self.assertEqual("London Gatwick", get_airport("LGW")["name"])
+
+    def test_get_missing_airport_from_json(self):
+        with self.assertRaises(AirportCodeNotFoundError):
+            get_airport("XXX")
+
+    def test_convert_airport_lookup(self):
+        self.assertEqual(4, convert_airport_lookup())
+        self.assertTrue(os.path.exists(get_lookup_file_path("airport_codes.dat")))
+
+    def test_get_airport_from_index(self):
+        convert_airport_lookup()
+        os.remove(get_lookup_file_path("airport_codes.json"))
+        for code, name, tz in [("ALC", "Alicante", "Europe/Madrid"),
+                               ("EGLL", "London Heathrow", "Europe/London"),
+                               ("LGW", "London Gatwick", "Europe/London"),
+                               ("ZRH", "Zürich", "Europe/Zurich")]:
+            self.assertEqual({"code": code, "name": name, "tz": tz}, get_airport(code))
+
+    def test_get_missing_airport_from_index(self):
+        convert_airport_lookup()
+        os.remove(get_lookup_file_path("airport_codes.json"))
+        for code in ["AAA", "LGX", "ZZZ", "TOOLONG"]:
+            with self.assertRaises(AirportCodeNotFoundError):
+                get_airport(code)
+
+    def test_stale_index_is_ignored(self):
+        convert_airport_lookup()
+        index_file = get_lookup_file_path("airport_codes.dat")
+        os.utime(index_file, (0, 0))
+        self._write_airports({"RMU": {"code": "RMU", "name": "Murcia International Airport", "tz": "Europe/Madrid"}})
+        self.assertEqual("Murcia International Airport", get_airport("RMU")["name"])
+
+    def test_search_by_code_prefix(self):
+        airports = search_airports("lg")
+        self.assertEqual(["LGW"], [airport["code"] for airport in airports])
+
+    def test_search_by_name_prefix(self):
+        airports = search_airports("London")
+        self.assertEqual(["LGW", "EGLL"], [airport["code"] for airport in airports])
+
+    def test_search_by_word_prefix(self):
+        airports = search_airports("heath")
+        self.assertEqual(["EGLL"], [airport["code"] for airport in airports])
+
+    def test_search_requires_all_words(self):
+        airports = search_airports("lon hea")
+        self.assertEqual(["EGLL"], [airport["code"] for airport in airports])
+
+    def test_search_ignores_accents(self):
+        airports = search_airports("ZUR")
+        self.assertEqual(["ZRH"], [airport["code"] for airport in airports])
+
+    def test_search_prefers_code_matches(self):
+        self._write_airports({
+            "ALC": {"code": "ALC", "name": "Alicante", "tz": "Europe/Madrid"},
+            "LCA": {"code": "LCA", "name": "Larnaca", "tz": "Asia/Nicosia"}
+        })
+        airports = search_airports("al")
+        self.assertEqual(["ALC"], [airport["code"] for airport in airports])
+        airports = search_airports("l")
+        self.assertEqual(["LCA"], [airport["code"] for airport in airports])
+
+    def test_search_applies_limit(self):
+        airports = search_airports("l", limit=2)
+        self.assertEqual(["LGW", "EGLL"], [airport["code"] for airport in airports])
+
+    def test_search_with_no_matches(self):
+        self.assertEqual([], search_airports("xyz"))
+        self.assertEqual([], search_airports("  "))
+
+    def test_search_with_invalid_limit_errors(self):
+        with self.assertRaises(ValueError):
+            search_airports("LGW", limit=0)
+
+    def test_search_indexed_lookup(self):
+        convert_airport_lookup()
+        os.remove(get_lookup_file_path("airport_codes.json"))
+        airports = search_airports("gat")
+        self.assertEqual([{"code": "LGW", "name": "London Gatwick", "tz": "Europe/London"}], airports)
+
+    def test_search_index_can_be_built_up_front(self):
+        convert_airport_lookup()
+        self.assertEqual(4, build_airport_search_index())
+        with patch("src.flight_booking.airport._AirportSearchIndex", side_effect=AssertionError("Index rebuilt")):
+            airports = search_airports("zur")
+        self.assertEqual(["ZRH"], [airport["code"] for airport in airports])
+
+    def test_get_airport_timezone(self):
+        timezone = get_airport_timezone(get_airport("LGW"))
+        self.assertEqual("Europe/London", str(timezone))
+        self.assertIs(timezone, get_airport_timezone(get_airport("EGLL")))
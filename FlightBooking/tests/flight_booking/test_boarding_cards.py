@@ -0,0 +1,43 @@
+import datetime
+import unittest
+from src.flight_booking.boarding_cards import BoardingCardContext
+from src.flight_booking.utils import get_boarding_card_path
+from tests.helpers import create_test_flight
+
+
+class TestBoardingCardContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self._flight = create_test_flight()
+        self._context = self._flight.create_card_context("txt", "28A")
+
+    def test_card_details(self):
+        card_details = self._context.get_card_details("Some Passenger", "5D")
+        self.assertEqual({
+            "gate": "28A",
+            "airline": "EasyJet",
+            "embarkation_name": "London Gatwick",
+            "embarkation": "LGW",
+            "departs": "10:45 AM",
+            "destination_name": "Murcia International Airport",
+            "destination": "RMU",
+            "arrives": "02:20 PM",
+            "name": "Some Passenger",
+            "seat_number": "5D"
+        }, card_details)
+        self.assertEqual(["name", "seat_number"], list(card_details)[-2:])
+
+    def test_card_details_are_independent(self):
+        first = self._context.get_card_details("Some Passenger", "5D")
+        second = self._context.get_card_details("Another Passenger", "6E")
+        self.assertEqual("5D", first["seat_number"])
+        self.assertEqual("6E", second["seat_number"])
+
+    def test_card_path_matches_boarding_card_path(self):
+        departs = datetime.datetime(2021, 11, 20, 10, 45, 0)
+        context = BoardingCardContext({}, "U28549", departs, "pdf")
+        for seat_number in ["5B", "12F", "1 A"]:
+            self.assertEqual(get_boarding_card_path("U28549", seat_number, departs, "pdf"),
+                             context.get_card_path(seat_number))
+
+    def test_card_format(self):
+        self.assertEqual("txt", self._context.card_format)
@@ -0,0 +1,98 @@
+import datetime
+import json
+import unittest
+from src.flight_booking import Flight
+from src.flight_booking.compact_seating_plan import CompactSeatingPlan
+from src.flight_booking.seating_plan import *
+from tests.helpers import create_test_flight, create_test_passenger, fill_test_flight, remove_files
+
+
+class TestCompactSeatingPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self._a320 = read_plan("EasyJet", "A320", "1", compact=True)
+        self._a321 = read_plan("EasyJet", "A321", "neo", compact=True)
+
+    def test_can_read_compact_plan(self):
+        self.assertIsInstance(self._a321, CompactSeatingPlan)
+        self.assertEqual(235, self._a321["capacity"])
+        self.assertEqual(235, len(get_unallocated_seats(self._a321)))
+
+    def test_compact_plan_has_same_structure_as_dictionary_plan(self):
+        self.assertEqual(read_plan("EasyJet", "A320", "1"), self._a320.to_dict())
+        self.assertEqual(list(read_plan("EasyJet", "A320", "1").keys()), list(self._a320.keys()))
+
+    def test_get_seating_row(self):
+        row = get_seating_row(self._a320, "1A")
+        self.assertEqual("Up Front", row["class"])
+        self.assertEqual([f"1{letter}" for letter in "ABCDEF"], list(row["seats"].keys()))
+
+    def test_get_invalid_seating_row(self):
+        with self.assertRaises(ValueError):
+            get_seating_row(self._a320, "100A")
+
+    def test_get_invalid_seat(self):
+        with self.assertRaises(ValueError):
+            get_seating_row(self._a320, "1G")
+
+    def test_allocate_seat(self):
+        allocate_seat(self._a320, "5D", "id")
+        self.assertEqual("5D", get_allocated_seat(self._a320, "id"))
+        self.assertEqual("id", self._a320["5"]["seats"]["5D"])
+
+    def test_move_passenger(self):
+        allocate_seat(self._a320, "5D", "id")
+        allocate_seat(self._a320, "7F", "id")
+        self.assertEqual("7F", get_allocated_seat(self._a320, "id"))
+        self.assertIsNone(self._a320["5"]["seats"]["5D"])
+
+    def test_allocate_occupied_seat(self):
+        allocate_seat(self._a320, "5D", "id")
+        with self.assertRaises(ValueError):
+            allocate_seat(self._a320, "5D", "other_id")
+
+    def test_clear_allocation(self):
+        allocate_seat(self._a320, "5D", "id")
+        clear_allocation(self._a320, "5D")
+        self.assertIsNone(get_allocated_seat(self._a320, "id"))
+        self.assertEqual(186, len(get_unallocated_seats(self._a320)))
+
+    def test_get_seat_allocations(self):
+        allocate_seat(self._a320, "5D", "id-1")
+        allocate_seat(self._a320, "1A", "id-2")
+        self.assertEqual([("1A", "id-2"), ("5D", "id-1")], get_seat_allocations(self._a320))
+
+    def test_copy_seat_allocations_between_compact_and_dictionary_plans(self):
+        allocate_seat(self._a320, "28A", "id")
+        to_plan = read_plan("EasyJet", "A321", "neo")
+        copy_seat_allocations(self._a320, to_plan)
+        self.assertEqual("1A", get_allocated_seat(to_plan, "id"))
+
+    def test_cannot_remove_seats(self):
+        with self.assertRaises(TypeError):
+            del self._a320["1"]["seats"]["1A"]
+
+
+class TestFlightCompactSeatingPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self._flight = create_test_flight()
+
+    def tearDown(self) -> None:
+        remove_files("flights")
+
+    def test_can_fill_flight_with_compact_plan(self):
+        self._flight.load_seating("A321", "neo", compact=True)
+        fill_test_flight(self._flight)
+        self.assertEqual(0, self._flight.available_capacity)
+        self.assertEqual(235, len(self._flight.get_all_seat_allocations()))
+
+    def test_can_save_and_reload_flight_with_compact_plan(self):
+        self._flight.load_seating("A321", "neo", compact=True)
+        passenger = create_test_passenger()
+        self._flight.add_passenger(passenger)
+        self._flight.allocate_seat("5D", passenger["id"])
+        self.assertEqual(passenger["id"], json.loads(self._flight.to_json())["seating"]["5"]["seats"]["5D"])
+        self._flight.save()
+
+        flight = Flight.load_flight("U28549", datetime.datetime(2099, 11, 20, 10, 45, 0))
+        self.assertEqual("A321", flight.aircraft)
+        self.assertEqual("5D", flight.get_allocated_seat(passenger["id"]))
@@ -0,0 +1,129 @@
+import datetime
+import json
+import os
+import pickle
+import unittest
+from unittest.mock import patch
+from src.flight_booking import Flight, InsufficientCapacityError, SeatingPlanNotFoundError
+from src.flight_booking.fleet import select_flight_files, swap_equipment, swap_flight_equipment
+from src.flight_booking.utils import get_data_folder, get_flight_file_path
+from tests.helpers import create_test_passenger, fill_test_flight, remove_files
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self) -> None:
+        remove_files("flights")
+        self._flights = []
+        for day in range(1, 4):
+            flight = Flight(
+                airline="EasyJet",
+                number=f"U2{day:04d}",
+                embarkation="LGW",
+                destination="RMU",
+                departs=datetime.datetime(2099, 11, day, 10, 45, 0),
+                duration=datetime.timedelta(hours=2, minutes=35)
+            )
+            flight.load_seating("A321", "neo")
+            self._flights.append(flight)
+
+        # The first two flights have one passenger each. The last flight is full, so can't be moved to a
+        # smaller aircraft
+        for flight in self._flights[:2]:
+            passenger = create_test_passenger()
+            flight.add_passenger(passenger)
+            flight.allocate_seat("20A", passenger["id"])
+        fill_test_flight(self._flights[-1])
+        for flight in self._flights:
+            flight.save()
+
+    def tearDown(self) -> None:
+        remove_files("flights")
+
+    def test_select_flights_by_date(self):
+        file_paths = select_flight_files(start_date=datetime.date(2099, 11, 2), end_date=datetime.date(2099, 11, 3))
+        self.assertEqual(2, len(file_paths))
+
+    def test_select_flights_by_aircraft(self):
+        self.assertEqual(3, len(select_flight_files(airline="EasyJet", aircraft="A321", layout="neo")))
+        self.assertEqual(0, len(select_flight_files(aircraft="A320")))
+
+    def test_select_flights_outside_date_range_are_not_read(self):
+        file_path = os.path.join(get_data_folder("flights"), "u29999_20991201.json")
+        with open(file_path, mode="wt", encoding="utf-8") as f:
+            f.write("Not a flight data file")
+
+        file_paths = select_flight_files(end_date=datetime.date(2099, 11, 30))
+        self.assertEqual(3, len(file_paths))
+
+    def test_select_flights_reads_only_flight_details(self):
+        error = AssertionError("Whole file parsed")
+        with patch("src.flight_booking.fleet.json.load", side_effect=error), \
+                patch("src.flight_booking.fleet.json.loads", side_effect=error):
+            self.assertEqual(3, len(select_flight_files(airline="EasyJet")))
+
+    def test_select_flights_with_details_after_passengers(self):
+        file_path = get_flight_file_path(self._flights[0].number, self._flights[0].departure_date)
+        with open(file_path, mode="rt", encoding="utf-8") as f:
+            data = json.load(f)
+        with open(file_path, mode="wt", encoding="utf-8") as f:
+            json.dump({"passengers": data["passengers"], "seating": data["seating"], "details": data["details"]}, f)
+
+        self.assertEqual([file_path], select_flight_files(end_date=datetime.date(2099, 11, 1), aircraft="A321"))
+
+    def test_swap_equipment(self):
+        results = swap_equipment("A320", "1", max_workers=2)
+        self.assertEqual(3, len(results))
+
+        for result in results[:2]:
+            self.assertTrue(result["succeeded"])
+            self.assertIsNone(result["error"])
+            self.assertEqual(1, len(result["report"]["kept"]) + len(result["report"]["moved"]))
+            flight = Flight.load_flight(result["number"], result["departs"])
+            self.assertEqual("A320", flight.aircraft)
+            self.assertEqual(185, flight.available_capacity)
+
+        self.assertFalse(results[2]["succeeded"])
+        self.assertIsInstance(results[2]["error"], InsufficientCapacityError)
+        self.assertEqual("A320", results[2]["error"].aircraft)
+        flight = Flight.load_flight(results[2]["number"], results[2]["departs"])
+        self.assertEqual("A321", flight.aircraft)
+
+    def test_swap_equipment_reports_unreadable_flights(self):
+        folder = get_data_folder("flights")
+        with open(os.path.join(folder, "u29999_20991102.json"), mode="wt", encoding="utf-8") as f:
+            f.write("Not a flight data file")
+        with open(os.path.join(folder, "u29998_20991102.json"), mode="wt", encoding="utf-8") as f:
+            json.dump({"passengers": {}}, f)
+
+        self.assertEqual(3, len(select_flight_files()))
+
+        for max_workers in [1, 2]:
+            results = swap_equipment("A320", "1", end_date=datetime.date(2099, 11, 2), max_workers=max_workers)
+            self.assertEqual(["u20001_20991101.json", "u20002_20991102.json", "u29998_20991102.json",
+                              "u29999_20991102.json"], [os.path.basename(result["file_path"]) for result in results])
+            self.assertTrue(all(result["succeeded"] for result in results[:2]))
+            self.assertIsInstance(results[2]["error"], KeyError)
+            self.assertIsInstance(results[3]["error"], ValueError)
+            self.assertFalse(any(result["succeeded"] for result in results[2:]))
+
+    def test_swap_flight_equipment_reports_malformed_flight(self):
+        file_path = os.path.join(get_data_folder("flights"), "u29999_20991102.json")
+        with open(file_path, mode="wt", encoding="utf-8") as f:
+            json.dump({"details": {"number": "U29999"}}, f)
+
+        result = swap_flight_equipment(file_path, "A320", "1")
+        self.assertFalse(result["succeeded"])
+        self.assertIsInstance(result["error"], KeyError)
+
+    def test_swap_equipment_in_current_process(self):
+        results = swap_equipment("A320", "1", end_date=datetime.date(2099, 11, 1), max_workers=1)
+        self.assertEqual(1, len(results))
+        self.assertTrue(results[0]["succeeded"])
+
+    def test_cannot_swap_to_missing_seating_plan(self):
+        with self.assertRaises(SeatingPlanNotFoundError):
+            swap_equipment("A380", "not a valid layout")
+
+    def test_exceptions_can_be_pickled(self):
+        e = pickle.loads(pickle.dumps(InsufficientCapacityError("Message", aircraft="A320", layout="1")))
+        self.assertEqual(("A320", "1"), (e.aircraft, e.layout))
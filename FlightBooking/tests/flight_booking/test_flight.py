@@ -1,7 +1,7 @@
 import unittest
 import datetime
 import pytz
-from src.flight_booking import Flight, AirportCodeNotFoundError
+from src.flight_booking import Flight, AirportCodeNotFoundError, get_airport
 from tests.helpers import create_test_flight
 
 
@@ -37,3 +37,48 @@ class TestFlight(unittest.TestCase):
                 departs=datetime.datetime(2021, 11, 20, 10, 45, 0),
                 duration=datetime.timedelta(hours=2, minutes=30)
             )
+
+    def test_local_times(self):
+        flight = create_test_flight()
+        self.assertEqual("20/11/2099 10:45", flight.departs_localtime.strftime("%d/%m/%Y %H:%M"))
+        self.assertEqual("20/11/2099 14:20", flight.arrives_localtime.strftime("%d/%m/%Y %H:%M"))
+        self.assertEqual("Europe/Madrid", str(flight.arrives_localtime.tzinfo))
+
+    def test_local_times_are_cached(self):
+        flight = create_test_flight()
+        self.assertIs(flight.departs_localtime, flight.departs_localtime)
+        self.assertIs(flight.arrives_localtime, flight.arrives_localtime)
+
+    def test_local_times_are_recalculated_when_timing_changes(self):
+        flight = create_test_flight()
+        description = str(flight)
+        arrives = flight.arrives_localtime
+        flight._duration = datetime.timedelta(hours=3)
+        self.assertEqual("20/11/2099 14:45", flight.arrives_localtime.strftime("%d/%m/%Y %H:%M"))
+        self.assertEqual(description, str(flight))
+        self.assertNotEqual(arrives, flight.arrives_localtime)
+        flight._departs += datetime.timedelta(days=1)
+        self.assertEqual("21/11/2099 10:45", flight.departs_localtime.strftime("%d/%m/%Y %H:%M"))
+        self.assertNotEqual(description, str(flight))
+
+    def test_can_create_flight_from_normalised_data(self):
+        expected = create_test_flight()
+        flight = Flight.from_normalised(
+            embarkation=get_airport("LGW"),
+            destination=get_airport("RMU"),
+            airline="EasyJet",
+            number="U28549",
+            departs=datetime.datetime(2099, 11, 20, 10, 45, 0),
+            duration=datetime.timedelta(hours=2, minutes=35)
+        )
+
+        self.assertEqual(repr(expected), repr(flight))
+        self.assertEqual(expected.departs_localtime, flight.departs_localtime)
+        self.assertEqual(0, len(flight.passengers))
+        self.assertIsNone(flight.seating_plan)
+
+    def test_flight_has_no_instance_dictionary(self):
+        flight = create_test_flight()
+        self.assertFalse(hasattr(flight, "__dict__"))
+        with self.assertRaises(AttributeError):
+            flight.gate = "28A"
@@ -6,7 +6,8 @@ from tests.helpers import create_test_flight, \
     create_test_passenger, \
     text_card_generator, \
     binary_card_generator, \
-    get_flight_boarding_card_file_path
+    get_flight_boarding_card_file_path, \
+    remove_files
 
 
 class TestFlightBoardingCards(unittest.TestCase):
@@ -14,6 +15,9 @@ class TestFlightBoardingCards(unittest.TestCase):
         self._flight = create_test_flight()
         self._passenger = create_test_passenger()
 
+    def tearDown(self) -> None:
+        remove_files("boarding_cards")
+
     @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
     def test_can_generate_boarding_cards(self):
         self._flight.load_seating("A321", "neo")
@@ -92,3 +96,149 @@ class TestFlightBoardingCards(unittest.TestCase):
         self._flight.allocate_seat("5D", self._passenger["id"])
         with self.assertRaises(MissingBoardingCardPluginError):
             self._flight.generate_boarding_cards("missing-format", "28A")
+
+
+def failing_card_generator(card_details):
+    """
+    Card generator that fails for one seat, for testing error handling during asynchronous generation
+
+    :param card_details: Boarding card details
+    """
+    if card_details["seat_number"] == "1B":
+        raise RuntimeError("Card generation failed")
+    return text_card_generator(card_details)
+
+
+class TestFlightBoardingCardsAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._flight = create_test_flight()
+        self._flight.load_seating("A321", "neo")
+        self._seat_numbers = ["1A", "1B", "1C", "2D", "3E", "4F"]
+        for seat_number in self._seat_numbers:
+            passenger = create_test_passenger()
+            self._flight.add_passenger(passenger)
+            self._flight.allocate_seat(seat_number, passenger["id"])
+
+    def tearDown(self) -> None:
+        remove_files("boarding_cards")
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    async def test_can_generate_boarding_cards(self):
+        await self._flight.generate_boarding_cards_async("txt", "28A", max_concurrency=2, queue_size=1)
+        for seat_number in self._seat_numbers:
+            boarding_card_file = get_flight_boarding_card_file_path(self._flight, seat_number, "txt")
+            with open(boarding_card_file, mode="rt", encoding="utf-8") as f:
+                contents = f.read()
+            self.assertIn("10:45 AM", contents)
+            self.assertIn(seat_number, contents)
+
+    @patch("src.flight_booking.flight.card_generator_map", {"dat": binary_card_generator})
+    async def test_can_generate_binary_boarding_cards(self):
+        await self._flight.generate_boarding_cards_async("dat", "28A")
+        for seat_number in self._seat_numbers:
+            boarding_card_file = get_flight_boarding_card_file_path(self._flight, seat_number, "dat")
+            with open(boarding_card_file, mode="rb") as f:
+                contents = f.read().decode("utf-8")
+            self.assertIn(seat_number, contents)
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    async def test_can_generate_boarding_cards_sequentially(self):
+        await self._flight.generate_boarding_cards_async("txt", "28A", max_concurrency=1, queue_size=1)
+        for seat_number in self._seat_numbers:
+            boarding_card_file = get_flight_boarding_card_file_path(self._flight, seat_number, "txt")
+            self.assertTrue(os.path.exists(boarding_card_file))
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": failing_card_generator})
+    async def test_card_generation_error_is_raised(self):
+        with self.assertRaises(RuntimeError):
+            await self._flight.generate_boarding_cards_async("txt", "28A", max_concurrency=1, queue_size=1)
+
+    async def test_cannot_generate_boarding_cards_with_missing_gate(self):
+        with self.assertRaises(ValueError):
+            await self._flight.generate_boarding_cards_async("txt", None)
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    async def test_cannot_generate_boarding_cards_with_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            await self._flight.generate_boarding_cards_async("txt", "28A", max_concurrency=0)
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    async def test_cannot_generate_boarding_cards_with_invalid_queue_size(self):
+        with self.assertRaises(ValueError):
+            await self._flight.generate_boarding_cards_async("txt", "28A", queue_size=0)
+
+    async def test_cannot_generate_boarding_cards_when_plugin_is_missing(self):
+        with self.assertRaises(MissingBoardingCardPluginError):
+            await self._flight.generate_boarding_cards_async("missing-format", "28A")
+
+    @patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator})
+    async def test_unchanged_boarding_cards_are_not_regenerated(self):
+        await self._flight.generate_boarding_cards_async("txt", "28A")
+        report = await self._flight.generate_boarding_cards_async("txt", "28A")
+        self.assertEqual([], report["generated"])
+        self.assertEqual(sorted(self._seat_numbers), sorted(report["unchanged"]))
+
+
+class TestFlightIncrementalBoardingCards(unittest.TestCase):
+    def setUp(self) -> None:
+        self._flight = create_test_flight()
+        self._flight.load_seating("A321", "neo")
+        self._passengers = [create_test_passenger() for _ in range(3)]
+        for passenger, seat_number in zip(self._passengers, ["1A", "1B", "1C"]):
+            self._flight.add_passenger(passenger)
+            self._flight.allocate_seat(seat_number, passenger["id"])
+
+        # Generate the initial set of cards, so each test starts from an up to date set
+        self._rendered = []
+        self._generate()
+        self._rendered.clear()
+
+    def tearDown(self) -> None:
+        remove_files("boarding_cards")
+
+    def _counting_card_generator(self, card_details):
+        self._rendered.append(card_details["seat_number"])
+        return text_card_generator(card_details)
+
+    def _generate(self, gate="28A", force=False):
+        with patch("src.flight_booking.flight.card_generator_map", {"txt": self._counting_card_generator}):
+            return self._flight.generate_boarding_cards("txt", gate, force=force)
+
+    def _card_exists(self, seat_number):
+        return os.path.exists(get_flight_boarding_card_file_path(self._flight, seat_number, "txt"))
+
+    def test_unchanged_cards_are_not_regenerated(self):
+        report = self._generate()
+        self.assertEqual([], self._rendered)
+        self.assertEqual({"generated": [], "unchanged": ["1A", "1B", "1C"], "deleted": []}, report)
+
+    def test_moved_passenger_card_is_regenerated(self):
+        self._flight.allocate_seat("2D", self._passengers[0]["id"])
+        report = self._generate()
+        self.assertEqual(["2D"], self._rendered)
+        self.assertEqual(["2D"], report["generated"])
+        self.assertEqual(["1A"], report["deleted"])
+        self.assertFalse(self._card_exists("1A"))
+        self.assertTrue(self._card_exists("2D"))
+
+    def test_removed_passenger_card_is_deleted(self):
+        self._flight.remove_passenger(self._passengers[1]["id"])
+        report = self._generate()
+        self.assertEqual([], self._rendered)
+        self.assertEqual(["1B"], report["deleted"])
+        self.assertFalse(self._card_exists("1B"))
+
+    def test_gate_change_regenerates_all_cards(self):
+        report = self._generate(gate="12")
+        self.assertEqual(["1A", "1B", "1C"], self._rendered)
+        self.assertEqual(["1A", "1B", "1C"], report["generated"])
+
+    def test_missing_card_is_regenerated(self):
+        os.unlink(get_flight_boarding_card_file_path(self._flight, "1C", "txt"))
+        self._generate()
+        self.assertEqual(["1C"], self._rendered)
+        self.assertTrue(self._card_exists("1C"))
+
+    def test_force_regenerates_all_cards(self):
+        self._generate(force=True)
+        self.assertEqual(["1A", "1B", "1C"], self._rendered)
@@ -3,6 +3,8 @@ import unittest
 import datetime
 import json
 from src.flight_booking import Flight
+from src.flight_booking.passenger import PassengerRecord
+from src.flight_booking.passenger_store import PassengerStore
 from src.flight_booking.utils import get_flight_file_path
 from tests.helpers import create_test_flight, create_test_passenger, remove_files
 
@@ -49,6 +51,37 @@ class TestFlightSaveAndLoad(unittest.TestCase):
         self.assertTrue(self._passenger["id"] in flight.passengers)
         passenger = flight.passengers[self._passenger["id"]]
         self.assertEqual(self._passenger, passenger)
+        self.assertIsInstance(passenger, PassengerRecord)
+
+    def test_can_reload_flight_with_columnar_passengers(self):
+        self._flight.load_seating("A321", "neo")
+        self._flight.add_passenger(self._passenger)
+        self._flight.allocate_seat("5D", self._passenger["id"])
+        self._flight.save()
+
+        flight = Flight.load_flight("U28549", datetime.datetime(2099, 11, 20, 10, 45, 0), columnar_passengers=True)
+        self.assertIsInstance(flight.passengers, PassengerStore)
+        self.assertEqual(1, len(flight.passengers))
+        self.assertEqual(self._passenger, flight.passengers[self._passenger["id"]])
+        self.assertEqual("5D", flight.get_allocated_seat(self._passenger["id"]))
+
+        loaded = json.loads(flight.to_json())
+        self.assertEqual(self._passenger.to_dict(), loaded["passengers"][self._passenger["id"]])
+
+    def test_reloaded_departure_time_is_unchanged(self):
+        flight = Flight(
+            airline="EasyJet",
+            number="U28550",
+            embarkation="RMU",
+            destination="LGW",
+            departs=datetime.datetime(2099, 7, 20, 10, 45, 0),
+            duration=datetime.timedelta(hours=2, minutes=35)
+        )
+        flight.save()
+
+        loaded = Flight.load_flight("U28550", flight.departure_date)
+        self.assertEqual(repr(flight), repr(loaded))
+        self.assertEqual("20/07/2099 10:45", loaded.departs_localtime.strftime("%d/%m/%Y %H:%M"))
 
     def test_can_serialize_to_and_from_json(self):
         json_data = self._flight.to_json()
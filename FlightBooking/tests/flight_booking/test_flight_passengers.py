@@ -40,3 +40,9 @@ class TestFlightPassengers(unittest.TestCase):
         self._flight.add_passenger(self._passenger)
         self._flight.remove_passenger(self._passenger["id"])
         self.assertEqual(0, len(self._flight.passengers))
+
+
+class TestFlightColumnarPassengers(TestFlightPassengers):
+    def setUp(self) -> None:
+        self._flight = create_test_flight(columnar_passengers=True)
+        self._passenger = create_test_passenger()
@@ -88,6 +88,15 @@ class TestFlightSeatingPlan(unittest.TestCase):
         self.assertEqual("5D", self._flight.get_allocated_seat(pid))
         self.assertEqual(185, self._flight.available_capacity)
 
+    def test_reloading_seating_plan_returns_migration_report(self):
+        self.assertIsNone(self._flight.load_seating("A321", "neo"))
+        self._flight.add_passenger(self._passenger)
+        self._flight.allocate_seat("7A", self._passenger["id"])
+
+        report = self._flight.load_seating("A320", "1", class_aware=True)
+        self.assertEqual([(self._passenger["id"], "7A", "1A")], report["moved"])
+        self.assertEqual("1A", self._flight.get_allocated_seat(self._passenger["id"]))
+
     def test_can_reload_seating_plan_with_no_allocations(self):
         self._flight.load_seating("A320", "1")
         self.assertEqual(186, self._flight.capacity)
@@ -126,3 +135,164 @@ class TestFlightSeatingPlan(unittest.TestCase):
         self._flight.remove_passenger(self._passenger["id"])
         allocations = self._flight.get_all_seat_allocations()
         self.assertIsNone(allocations)
+
+    def test_can_clear_seat_allocation(self):
+        self._flight.load_seating("A321", "neo")
+        self._flight.add_passenger(self._passenger)
+        self._flight.allocate_seat("1A", self._passenger["id"])
+        self.assertEqual("1A", self._flight.clear_seat_allocation(self._passenger["id"]))
+        self.assertIsNone(self._flight.get_allocated_seat(self._passenger["id"]))
+        self.assertEqual(1, len(self._flight.passengers))
+        self.assertIsNone(self._flight.clear_seat_allocation(self._passenger["id"]))
+
+    def test_cannot_clear_seat_allocation_for_missing_passenger(self):
+        self._flight.load_seating("A321", "neo")
+        with self.assertRaises(ValueError):
+            self._flight.clear_seat_allocation(self._passenger["id"])
+
+    def test_version_changes_when_flight_changes(self):
+        versions = [self._flight.version]
+        self._flight.load_seating("A321", "neo")
+        versions.append(self._flight.version)
+        self._flight.add_passenger(self._passenger)
+        versions.append(self._flight.version)
+        self._flight.allocate_seat("1A", self._passenger["id"])
+        versions.append(self._flight.version)
+        self._flight.clear_seat_allocation(self._passenger["id"])
+        versions.append(self._flight.version)
+        self._flight.remove_passenger(self._passenger["id"])
+        versions.append(self._flight.version)
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_version_is_unchanged_by_reads(self):
+        self._flight.load_seating("A321", "neo")
+        version = self._flight.version
+        self._flight.get_all_seat_allocations()
+        self._flight.to_json()
+        self.assertEqual(version, self._flight.version)
+
+
+class TestFlightGroupSeating(unittest.TestCase):
+    def setUp(self) -> None:
+        self._flight = create_test_flight()
+        self._flight.load_seating("A320", "1")
+
+    def _add_passengers(self, count):
+        passenger_ids = []
+        for _ in range(count):
+            passenger = create_test_passenger()
+            self._flight.add_passenger(passenger)
+            passenger_ids.append(passenger["id"])
+        return passenger_ids
+
+    def test_group_is_seated_in_one_row(self):
+        passenger_ids = self._add_passengers(4)
+        seat_numbers = self._flight.allocate_group_seats(passenger_ids)
+        self.assertEqual(["1A", "1B", "1C", "1D"], seat_numbers)
+        for seat_number, passenger_id in zip(seat_numbers, passenger_ids):
+            self.assertEqual(seat_number, self._flight.get_allocated_seat(passenger_id))
+
+    def test_group_uses_smallest_run_that_fits(self):
+        self._flight.allocate_group_seats(self._add_passengers(4))
+        seat_numbers = self._flight.allocate_group_seats(self._add_passengers(2))
+        self.assertEqual(["1E", "1F"], seat_numbers)
+
+    def test_group_is_not_split_by_individual_allocations(self):
+        single = self._add_passengers(1)[0]
+        self._flight.allocate_next_empty_seat(single)
+        seat_numbers = self._flight.allocate_group_seats(self._add_passengers(6))
+        self.assertEqual([f"2{letter}" for letter in "ABCDEF"], seat_numbers)
+        next_passenger = self._add_passengers(1)[0]
+        self._flight.allocate_next_empty_seat(next_passenger)
+        self.assertEqual("1B", self._flight.get_allocated_seat(next_passenger))
+
+    def test_large_group_is_seated_in_adjacent_rows(self):
+        seat_numbers = self._flight.allocate_group_seats(self._add_passengers(8))
+        self.assertEqual([f"1{letter}" for letter in "ABCDEF"] + ["2A", "2B"], seat_numbers)
+
+    def test_index_is_updated_when_seats_are_released(self):
+        passenger_ids = self._add_passengers(186)
+        for passenger_id in passenger_ids:
+            self._flight.allocate_next_empty_seat(passenger_id)
+
+        self._flight.remove_passenger(passenger_ids[20])
+        self._flight.remove_passenger(passenger_ids[21])
+        seat_numbers = self._flight.allocate_group_seats(self._add_passengers(2))
+        self.assertEqual(["4C", "4D"], seat_numbers)
+
+    def test_group_members_are_moved_together(self):
+        passenger_ids = self._add_passengers(2)
+        self._flight.allocate_seat("1A", passenger_ids[0])
+        self._flight.allocate_seat("3F", passenger_ids[1])
+        seat_numbers = self._flight.allocate_group_seats(passenger_ids)
+        self.assertEqual(["1A", "1B"], seat_numbers)
+        self.assertIsNone(self._flight.seating_plan["3"]["seats"]["3F"])
+
+    def test_group_is_split_when_there_is_no_block(self):
+        passenger_ids = self._add_passengers(184)
+        for passenger_id in passenger_ids:
+            self._flight.allocate_next_empty_seat(passenger_id)
+        self._flight.remove_passenger(passenger_ids[0])
+        self._flight.remove_passenger(passenger_ids[7])
+
+        group = self._add_passengers(4)
+        self.assertEqual(["1A", "2B", "31E", "31F"], self._flight.allocate_group_seats(group))
+
+    def test_cannot_split_group_if_not_allowed(self):
+        passenger_ids = self._add_passengers(184)
+        for passenger_id in passenger_ids:
+            self._flight.allocate_next_empty_seat(passenger_id)
+        self._flight.remove_passenger(passenger_ids[0])
+
+        with self.assertRaises(InvalidOperationError):
+            self._flight.allocate_group_seats(self._add_passengers(3), allow_split=False)
+
+    def test_seats_are_kept_if_there_is_no_block_and_split_not_allowed(self):
+        passenger_ids = self._add_passengers(184)
+        for passenger_id in passenger_ids:
+            self._flight.allocate_next_empty_seat(passenger_id)
+        self._flight.remove_passenger(passenger_ids[0])
+        self._flight.remove_passenger(passenger_ids[7])
+
+        group = [passenger_ids[20], passenger_ids[40], passenger_ids[60]]
+        seat_numbers = [self._flight.get_allocated_seat(passenger_id) for passenger_id in group]
+        version = self._flight.version
+        with self.assertRaises(InvalidOperationError):
+            self._flight.allocate_group_seats(group, allow_split=False)
+
+        self.assertEqual(seat_numbers, [self._flight.get_allocated_seat(passenger_id) for passenger_id in group])
+        self.assertEqual(version, self._flight.version)
+        self.assertEqual(["31E", "31F"], self._flight.allocate_group_seats(self._add_passengers(2), allow_split=False))
+
+    def test_seats_are_kept_if_there_are_too_few_seats(self):
+        passenger_ids = self._add_passengers(186)
+        seat_numbers = [seat_number for row, entry in self._flight.seating_plan.items() if row.isnumeric()
+                        for seat_number in entry["seats"]]
+        for seat_number, passenger_id in zip(seat_numbers[:183], passenger_ids):
+            self._flight.allocate_seat(seat_number, passenger_id)
+
+        # Hold two seats outside the passenger list, so there are fewer free seats than unseated passengers
+        for seat_number in seat_numbers[183:185]:
+            self._flight.seating_plan[seat_number[:-1]]["seats"][seat_number] = "held"
+
+        group = [passenger_ids[0], passenger_ids[183], passenger_ids[184]]
+        with self.assertRaises(InvalidOperationError):
+            self._flight.allocate_group_seats(group)
+
+        self.assertEqual(seat_numbers[0], self._flight.get_allocated_seat(passenger_ids[0]))
+        self.assertIsNone(self._flight.get_allocated_seat(passenger_ids[183]))
+        self.assertEqual(seat_numbers[185], self._flight.allocate_group_seats([passenger_ids[185]])[0])
+
+    def test_cannot_allocate_group_with_duplicate_passengers(self):
+        passenger_id = self._add_passengers(1)[0]
+        with self.assertRaises(ValueError):
+            self._flight.allocate_group_seats([passenger_id, passenger_id])
+
+    def test_cannot_allocate_group_with_missing_passenger(self):
+        with self.assertRaises(ValueError):
+            self._flight.allocate_group_seats(["not_on_the_flight"])
+
+    def test_cannot_allocate_group_if_no_seating_plan(self):
+        flight = create_test_flight()
+        with self.assertRaises(InvalidOperationError):
+            flight.allocate_group_seats(["id"])
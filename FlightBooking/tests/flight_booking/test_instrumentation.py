@@ -0,0 +1,118 @@
+import logging
+import socket
+import unittest
+from unittest.mock import patch
+from src.flight_booking.instrumentation import add_sink, remove_sink, clear_sinks, is_enabled, timed, timer, \
+    increment, LogSink, HistogramSink, StatsdSink
+from tests.helpers import create_test_flight, create_test_passenger, text_card_generator, remove_files
+
+
+@timed("test.operation")
+def operation(value):
+    return value * 2
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self) -> None:
+        self._sink = HistogramSink()
+
+    def tearDown(self) -> None:
+        clear_sinks()
+
+    def test_disabled_without_sinks(self):
+        self.assertFalse(is_enabled())
+        self.assertEqual(4, operation(2))
+        with timer("test.block"):
+            pass
+        increment("test.counter")
+        self.assertEqual({"timings": {}, "counters": {}}, self._sink.summary())
+
+    def test_can_time_function(self):
+        add_sink(self._sink)
+        self.assertTrue(is_enabled())
+        self.assertEqual(4, operation(2))
+        self.assertEqual(6, operation(3))
+        timings = self._sink.summary()["timings"]["test.operation"]
+        self.assertEqual(2, timings["count"])
+        self.assertLessEqual(timings["min"], timings["p50"])
+        self.assertLessEqual(timings["p95"], timings["max"])
+
+    def test_timed_function_records_timing_on_error(self):
+        @timed("test.failing")
+        def failing():
+            raise ValueError()
+
+        add_sink(self._sink)
+        with self.assertRaises(ValueError):
+            failing()
+        self.assertEqual(1, self._sink.summary()["timings"]["test.failing"]["count"])
+
+    def test_can_time_block_and_count(self):
+        add_sink(self._sink)
+        with timer("test.block"):
+            increment("test.counter")
+            increment("test.counter", 2)
+        summary = self._sink.summary()
+        self.assertEqual(1, summary["timings"]["test.block"]["count"])
+        self.assertEqual(3, summary["counters"]["test.counter"])
+
+    def test_removed_sink_receives_no_measurements(self):
+        add_sink(self._sink)
+        remove_sink(self._sink)
+        self.assertFalse(is_enabled())
+        operation(1)
+        self.assertEqual({}, self._sink.summary()["timings"])
+
+    def test_can_report(self):
+        add_sink(self._sink)
+        operation(1)
+        increment("test.counter")
+        report = self._sink.report()
+        self.assertIn("test.operation", report)
+        self.assertIn("test.counter", report)
+
+    def test_can_reset(self):
+        add_sink(self._sink)
+        operation(1)
+        self._sink.reset()
+        self.assertEqual({"timings": {}, "counters": {}}, self._sink.summary())
+
+    def test_log_sink_writes_to_logger(self):
+        add_sink(LogSink(level=logging.INFO))
+        with self.assertLogs("src.flight_booking.instrumentation", level=logging.INFO) as logs:
+            operation(1)
+            increment("test.counter")
+        self.assertEqual(2, len(logs.output))
+        self.assertIn("test.operation", logs.output[0])
+
+    def test_statsd_sink_sends_to_listener(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.settimeout(5)
+            sink = StatsdSink(port=listener.getsockname()[1], prefix="test")
+            add_sink(sink)
+            try:
+                increment("counter", 3)
+                operation(1)
+                self.assertEqual(b"test.counter:3|c", listener.recv(1024))
+                self.assertRegex(listener.recv(1024).decode("utf-8"), r"^test\.test\.operation:[0-9.]+\|ms$")
+            finally:
+                sink.close()
+
+    def test_flight_operations_are_timed(self):
+        add_sink(self._sink)
+        flight = create_test_flight()
+        flight.load_seating("A321", "neo")
+        passenger = create_test_passenger()
+        flight.add_passenger(passenger)
+        flight.allocate_seat("1A", passenger["id"])
+        flight.to_json()
+        with patch("src.flight_booking.flight.card_generator_map", {"txt": text_card_generator}):
+            flight.generate_boarding_cards("txt", "28A")
+        remove_files("boarding_cards")
+
+        summary = self._sink.summary()
+        for name in ["seating_plan.read_plan", "seating_plan.allocate_seat", "flight.to_json",
+                     "boarding_cards.render", "boarding_cards.write"]:
+            self.assertEqual(1, summary["timings"][name]["count"])
+        self.assertEqual(1, summary["counters"]["boarding_cards.generated"])
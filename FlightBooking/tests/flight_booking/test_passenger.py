@@ -1,6 +1,10 @@
 import unittest
 import datetime
+import copy
+import json
+import pickle
 from src.flight_booking import create_passenger
+from src.flight_booking.passenger import PassengerRecord
 
 
 class TestPassenger(unittest.TestCase):
@@ -120,3 +124,65 @@ class TestPassenger(unittest.TestCase):
                     "England",
                     "United Kingdom",
                     "")
+
+
+class TestPassengerRecord(unittest.TestCase):
+    def setUp(self) -> None:
+        self._passenger = create_passenger("Some One",
+                                           "M",
+                                           datetime.datetime(1980, 1, 1),
+                                           "England",
+                                           "United Kingdom",
+                                           "123456789")
+
+    def test_passenger_is_a_record(self):
+        self.assertIsInstance(self._passenger, PassengerRecord)
+
+    def test_record_behaves_as_dictionary(self):
+        self.assertEqual(["id", "name", "gender", "dob", "nationality", "residency", "passport_number"],
+                         list(self._passenger.keys()))
+        self.assertEqual(7, len(self._passenger))
+        self.assertTrue("name" in self._passenger)
+        self.assertFalse("seat_number" in self._passenger)
+        self.assertIsNone(self._passenger.get("seat_number"))
+        self.assertEqual(self._passenger.to_dict(), dict(self._passenger))
+        self.assertEqual(self._passenger.to_dict(), self._passenger)
+
+    def test_can_update_record(self):
+        self._passenger["passport_number"] = "987654321"
+        self.assertEqual("987654321", self._passenger["passport_number"])
+        self.assertEqual("987654321", self._passenger.passport_number)
+
+    def test_cannot_get_unknown_property(self):
+        with self.assertRaises(KeyError):
+            _ = self._passenger["seat_number"]
+
+    def test_cannot_add_property(self):
+        with self.assertRaises(KeyError):
+            self._passenger["seat_number"] = "1A"
+
+    def test_cannot_remove_property(self):
+        with self.assertRaises(TypeError):
+            del self._passenger["name"]
+
+    def test_shared_properties_are_interned(self):
+        other = PassengerRecord.from_dict(json.loads(json.dumps(self._passenger.to_dict())))
+        self.assertIs(self._passenger["nationality"], other["nationality"])
+        self.assertIs(self._passenger["residency"], other["residency"])
+
+    def test_shared_properties_can_be_set_to_other_values(self):
+        for key in ["gender", "nationality", "residency"]:
+            self._passenger[key] = None
+            self.assertIsNone(self._passenger[key])
+        self._passenger.update(nationality=1)
+        self.assertEqual(1, self._passenger["nationality"])
+
+    def test_can_create_record_from_dictionary(self):
+        self.assertEqual(self._passenger, PassengerRecord.from_dict(self._passenger.to_dict()))
+
+    def test_can_serialise_record(self):
+        self.assertEqual(self._passenger, json.loads(json.dumps(self._passenger.to_dict())))
+
+    def test_can_copy_and_pickle_record(self):
+        self.assertEqual(self._passenger, copy.deepcopy(self._passenger))
+        self.assertEqual(self._passenger, pickle.loads(pickle.dumps(self._passenger)))
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+import datetime
+import csv
+import json
+from src.flight_booking import create_passenger
+from src.flight_booking.passenger import PASSENGER_FIELDS
+from src.flight_booking.passenger_store import PassengerStore
+
+
+class TestPassengerStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._passengers = [
+            create_passenger("Some One", "M", datetime.datetime(1980, 1, 1), "England", "United Kingdom", "1"),
+            create_passenger("Another One", "F", datetime.datetime(1975, 6, 1), "Spain", "Spain", "2"),
+            create_passenger("Third One", "F", datetime.datetime(1990, 3, 1), "England", "Spain", "3")
+        ]
+        self._store = PassengerStore(self._passengers)
+
+    def test_can_use_as_mapping(self):
+        self.assertEqual(3, len(self._store))
+        self.assertEqual([p["id"] for p in self._passengers], list(self._store))
+        for passenger in self._passengers:
+            self.assertTrue(passenger["id"] in self._store)
+            self.assertEqual(passenger, self._store[passenger["id"]])
+
+    def test_missing_passenger_raises_error(self):
+        with self.assertRaises(KeyError):
+            _ = self._store["missing"]
+
+    def test_can_update_passenger_property(self):
+        passenger_id = self._passengers[0]["id"]
+        self._store[passenger_id]["nationality"] = "France"
+        self.assertEqual("France", self._store[passenger_id]["nationality"])
+        self.assertEqual(["France", "Spain", "England"], self._store.column("nationality"))
+
+    def test_cannot_change_passenger_id(self):
+        with self.assertRaises(ValueError):
+            self._store[self._passengers[0]["id"]]["id"] = "new"
+
+    def test_key_must_match_passenger_id(self):
+        with self.assertRaises(ValueError):
+            self._store["other"] = self._passengers[0]
+
+    def test_invalid_dob_is_not_stored(self):
+        passenger = create_passenger("New One", "M", datetime.datetime(1980, 1, 1), "England", "England", "4")
+        passenger["dob"] = "not a date"
+        with self.assertRaises(ValueError):
+            self._store[passenger["id"]] = passenger
+        self.assertEqual(3, len(self._store))
+        self.assertEqual(3, len(self._store.column("name")))
+
+    def test_can_delete_passenger_preserving_order(self):
+        del self._store[self._passengers[0]["id"]]
+        self.assertEqual(2, len(self._store))
+        self.assertFalse(self._passengers[0]["id"] in self._store)
+        self.assertEqual([p["id"] for p in self._passengers[1:]], list(self._store))
+        self.assertEqual(self._passengers[2], self._store[self._passengers[2]["id"]])
+
+    def test_can_filter(self):
+        matches = self._store.filter(nationality="England")
+        self.assertEqual([self._passengers[0]["id"], self._passengers[2]["id"]], matches)
+        matches = self._store.filter(nationality="England", residency="Spain")
+        self.assertEqual([self._passengers[2]["id"]], matches)
+        self.assertEqual([], self._store.filter(nationality="France"))
+
+    def test_can_sort(self):
+        self.assertEqual([self._passengers[i]["id"] for i in [1, 0, 2]], self._store.sort("dob"))
+        self.assertEqual([self._passengers[i]["id"] for i in [0, 2, 1]], self._store.sort("nationality"))
+        self.assertEqual([self._passengers[i]["id"] for i in [2, 0, 1]], self._store.sort("name", reverse=True))
+
+    def test_can_find_duplicates(self):
+        self.assertEqual({}, self._store.find_duplicates("passport_number"))
+        self._store[self._passengers[1]["id"]]["passport_number"] = "1"
+        duplicates = self._store.find_duplicates("passport_number")
+        self.assertEqual({"1": [self._passengers[0]["id"], self._passengers[1]["id"]]}, duplicates)
+        self.assertTrue(self._store.contains_value("passport_number", "1"))
+        self.assertFalse(self._store.contains_value("passport_number", "2"))
+
+    def test_can_export(self):
+        exported = self._store.export(["name", "dob"], self._store.filter(gender="F"))
+        self.assertEqual({"name": ["Another One", "Third One"], "dob": ["19750601", "19900301"]}, exported)
+
+    def test_can_export_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "passengers.csv")
+            self._store.export_csv(file_path)
+            with open(file_path, mode="rt", encoding="utf-8", newline="") as f:
+                rows = list(csv.reader(f))
+
+        self.assertEqual(list(PASSENGER_FIELDS), rows[0])
+        self.assertEqual([[p[field] for field in PASSENGER_FIELDS] for p in self._passengers], rows[1:])
+
+    def test_can_serialise_to_json(self):
+        loaded = json.loads(json.dumps(self._store.to_dict()))
+        self.assertEqual({p["id"]: p.to_dict() for p in self._passengers}, loaded)
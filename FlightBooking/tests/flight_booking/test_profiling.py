@@ -0,0 +1,114 @@
+import os
+import pstats
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.flight_booking.profiling import OperationProfiler, is_profiling_requested, get_hotspots, format_hotspots, \
+    write_collapsed_stacks, PROFILE_ENV
+from src.flight_booking.utils import get_data_folder
+from tests.helpers import create_test_flight, create_test_passengers, remove_files
+
+
+def add_passengers():
+    flight = create_test_flight()
+    flight.load_seating("A321", "neo")
+    for passenger in create_test_passengers(20):
+        flight.add_passenger(passenger)
+    return flight
+
+
+def create_layered_stats(layers, width, internal_time=0.001):
+    """
+    Create profile statistics for a call graph with the specified number of layers of functions, where every function
+    in a layer is called by every function in the layer above, so the number of call paths is width ** layers
+
+    :param layers: Number of layers below the root
+    :param width: Number of functions in each layer
+    :param internal_time: Internal time for each function
+    :return: Object with a stats attribute in the form used by pstats.Stats
+    """
+    root = ("root.py", 1, "root")
+    entries = {root: (1, 1, internal_time, internal_time + width * internal_time * layers, {})}
+    above = [root]
+    for layer in range(layers):
+        # Each function's cumulative time is divided evenly between its callers
+        cumulative_time = internal_time * (layers - layer)
+        caller_time = cumulative_time / len(above)
+        functions = [(f"layer{layer}.py", i, f"function_{layer}_{i}") for i in range(width)]
+        for function in functions:
+            callers = {caller: (1, 1, internal_time / len(above), caller_time) for caller in above}
+            entries[function] = (len(above), len(above), internal_time, cumulative_time, callers)
+        above = functions
+    return SimpleNamespace(stats=entries)
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self) -> None:
+        remove_files("profiles")
+
+    def test_profiling_requested_by_environment(self):
+        for value, expected in [("1", True), ("true", True), ("Yes", True), ("0", False), ("", False)]:
+            with patch.dict(os.environ, {PROFILE_ENV: value}):
+                self.assertEqual(expected, is_profiling_requested())
+
+    def test_can_profile_operation(self):
+        with OperationProfiler("Add passengers", limit=5) as profiler:
+            flight = add_passengers()
+        self.assertEqual(20, len(flight.passengers))
+
+        report = profiler.report
+        self.assertTrue(os.path.basename(report["pstats"]).startswith("add_passengers_"))
+        self.assertTrue(os.path.exists(report["pstats"]))
+        self.assertGreater(pstats.Stats(report["pstats"]).total_calls, 0)
+        self.assertEqual(5, len(report["hotspots"]))
+        self.assertIn("Function", format_hotspots(report["hotspots"]))
+
+    def test_collapsed_stacks_follow_call_graph(self):
+        with OperationProfiler("collapsed") as profiler:
+            add_passengers()
+
+        with open(profiler.report["collapsed"], mode="rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        self.assertGreater(len(lines), 0)
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertGreater(int(microseconds), 0)
+        self.assertTrue(any("(add_passengers);" in line and "(add_passenger)" in line for line in lines))
+
+    def test_collapsed_stacks_are_bounded_for_deep_call_graphs(self):
+        stats = create_layered_stats(30, 10)
+        file_path = os.path.join(get_data_folder("profiles"), "layered.collapsed")
+
+        start = time.perf_counter()
+        write_collapsed_stacks(stats, file_path, max_paths=5000)
+        self.assertLess(time.perf_counter() - start, 10)
+
+        with open(file_path, mode="rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertLessEqual(len(lines), 5000)
+
+        # Time for the call paths that weren't expanded is attributed to their callers, so the total is preserved
+        total = sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+        self.assertAlmostEqual(stats.stats[("root.py", 1, "root")][3] * 1000000, total, delta=len(lines))
+
+    def test_collapsed_stacks_can_be_written_in_background(self):
+        with OperationProfiler("background", background=True) as profiler:
+            add_passengers()
+        profiler.wait()
+        self.assertTrue(os.path.exists(profiler.report["collapsed"]))
+
+    def test_operation_is_profiled_on_error(self):
+        profiler = OperationProfiler("failing")
+        with self.assertRaises(ValueError):
+            with profiler:
+                raise ValueError()
+        self.assertTrue(os.path.exists(profiler.report["pstats"]))
+
+    def test_hotspots_are_ordered_by_internal_time(self):
+        with OperationProfiler("ordered") as profiler:
+            add_passengers()
+        hotspots = get_hotspots(pstats.Stats(profiler.report["pstats"]), 10)
+        times = [hotspot["tottime"] for hotspot in hotspots]
+        self.assertEqual(sorted(times, reverse=True), times)
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+from src.flight_booking.seating_plan import read_plan, allocate_seat, clear_plan_template_cache
+from src.flight_booking.seating_analytics import np, \
+    seat_grids, \
+    get_seat_grid, \
+    occupancy_matrix, \
+    occupancy_matrices, \
+    class_mask, \
+    occupancy_by_class, \
+    free_seats_per_row, \
+    count_free_blocks, \
+    find_free_blocks
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSeatingAnalytics(unittest.TestCase):
+    def setUp(self) -> None:
+        self._plan = read_plan("EasyJet", "A320", "1")
+        self._compact_plan = read_plan("EasyJet", "A320", "1", compact=True)
+        for plan in [self._plan, self._compact_plan]:
+            allocate_seat(plan, "1A", "id-1")
+            allocate_seat(plan, "1D", "id-2")
+            allocate_seat(plan, "7B", "id-3")
+
+    def test_occupancy_matrix(self):
+        grid, matrix = occupancy_matrix(self._plan)
+        self.assertEqual(("A", "B", "C", "D", "E", "F"), grid.seat_letters)
+        self.assertEqual(len(grid.row_numbers), matrix.shape[0])
+        self.assertEqual(3, matrix.sum())
+        self.assertTrue(matrix[grid.row_numbers.index("7"), grid.seat_letters.index("B")])
+
+    def test_compact_plan_gives_same_occupancy_matrix(self):
+        _, matrix = occupancy_matrix(self._plan)
+        _, compact_matrix = occupancy_matrix(self._compact_plan)
+        self.assertTrue(np.array_equal(matrix, compact_matrix))
+
+    def test_seat_grid_is_replaced_when_template_changes(self):
+        grid = get_seat_grid(self._plan)
+        self.assertIs(grid, get_seat_grid(self._compact_plan))
+
+        clear_plan_template_cache()
+        plan = read_plan("EasyJet", "A320", "1")
+        self.assertIsNot(grid, get_seat_grid(plan))
+        self.assertEqual(1, len([key for key in seat_grids if key == ("EasyJet", "A320", "1")]))
+
+    def test_seat_grid_cache_is_bounded(self):
+        with patch("src.flight_booking.seating_analytics.MAX_SEAT_GRIDS", 1):
+            get_seat_grid(self._plan)
+            get_seat_grid(read_plan("EasyJet", "A321", "neo"))
+            self.assertEqual([("EasyJet", "A321", "neo")], list(seat_grids))
+
+    def test_class_mask(self):
+        grid, _ = occupancy_matrix(self._plan)
+        self.assertEqual(36, class_mask(grid, "Up Front").sum())
+        self.assertEqual(186, class_mask(grid, "Up Front").sum() + class_mask(grid, "Economy").sum())
+
+    def test_invalid_class_mask(self):
+        grid, _ = occupancy_matrix(self._plan)
+        with self.assertRaises(ValueError):
+            class_mask(grid, "Not a valid class")
+
+    def test_occupancy_by_class(self):
+        grid, matrix = occupancy_matrix(self._plan)
+        results = occupancy_by_class(grid, matrix)
+        self.assertEqual(2, results["Up Front"][0])
+        self.assertEqual(36, results["Up Front"][1])
+        self.assertEqual(1, results["Economy"][0])
+        self.assertAlmostEqual(1 / 150, results["Economy"][2])
+
+    def test_free_seats_per_row(self):
+        grid, matrix = occupancy_matrix(self._plan)
+        free = free_seats_per_row(grid, matrix)
+        self.assertEqual(4, free[grid.row_numbers.index("1")])
+        self.assertEqual(6, free[grid.row_numbers.index("2")])
+
+    def test_find_free_blocks(self):
+        grid, matrix = occupancy_matrix(self._plan)
+        blocks = find_free_blocks(grid, matrix, 3)
+        self.assertEqual(["2A", "2B", "2C"], blocks[0])
+        self.assertNotIn(["1B", "1C", "1D"], blocks)
+        self.assertIn(["7C", "7D", "7E"], blocks)
+
+    def test_invalid_block_size(self):
+        grid, matrix = occupancy_matrix(self._plan)
+        with self.assertRaises(ValueError):
+            find_free_blocks(grid, matrix, 0)
+
+    def test_batch_queries(self):
+        empty_plan = read_plan("EasyJet", "A320", "1")
+        grid, matrices = occupancy_matrices([self._plan, self._compact_plan, empty_plan])
+        self.assertEqual((3,) + grid.seat_exists.shape, matrices.shape)
+        self.assertEqual([2, 2, 0], occupancy_by_class(grid, matrices)["Up Front"][0].tolist())
+        self.assertEqual((3, len(grid.row_numbers)), free_seats_per_row(grid, matrices).shape)
+        single_count = count_free_blocks(grid, occupancy_matrix(self._plan)[1], 2)
+        self.assertEqual(single_count, count_free_blocks(grid, matrices, 2)[0])
+        self.assertEqual(31 * 5, count_free_blocks(grid, matrices, 2)[2])
+
+    def test_batch_requires_same_layout(self):
+        with self.assertRaises(ValueError):
+            occupancy_matrices([self._plan, read_plan("EasyJet", "A321", "neo")])
+
+    def test_batch_requires_plans(self):
+        with self.assertRaises(ValueError):
+            occupancy_matrices([])
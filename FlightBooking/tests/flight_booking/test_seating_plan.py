@@ -1,5 +1,8 @@
+import os
+import tempfile
 from unittest import TestCase
 from src.flight_booking.seating_plan import *
+from src.flight_booking.utils import FLIGHT_BOOKING_DATA_FOLDER_ENV
 
 
 class TestSeatingPlan(TestCase):
@@ -71,9 +74,57 @@ class TestSeatingPlan(TestCase):
         # allocation should be 1A
         allocate_seat(self._a320, "28A", "id")
         self.assertEqual("28A", get_allocated_seat(self._a320, "id"))
-        copy_seat_allocations(self._a320, self._a321)
+        self.assertEqual([], copy_seat_allocations(self._a320, self._a321))
         self.assertEqual("1A", get_allocated_seat(self._a321, "id"))
 
+    def test_copy_seat_allocations_with_no_allocations(self):
+        self.assertIsNone(copy_seat_allocations(self._a320, self._a321))
+
+    def test_copy_seat_allocations_returns_unplaced_passengers(self):
+        allocate_seat(self._a320, "1A", "id-1")
+        allocate_seat(self._a320, "1B", "id-2")
+        to_plan = read_plan("EasyJet", "A320", "1")
+        for seat_number in get_unallocated_seats(to_plan)[1:]:
+            allocate_seat(to_plan, seat_number, f"id-{seat_number}")
+        self.assertEqual(["id-2"], copy_seat_allocations(self._a320, to_plan))
+
+    def test_migrate_seat_allocations_report(self):
+        allocate_seat(self._a320, "5D", "id-1")
+        allocate_seat(self._a320, "28A", "id-2")
+        report = migrate_seat_allocations(self._a320, self._a321)
+        self.assertEqual([("id-1", "5D")], report["kept"])
+        self.assertEqual([("id-2", "28A", "1A")], report["moved"])
+        self.assertEqual([], report["unplaced"])
+
+    def test_migrate_seat_allocations_reports_unplaced_passengers(self):
+        to_plan = read_plan("EasyJet", "A320", "1")
+        for seat_number in get_unallocated_seats(self._a321):
+            allocate_seat(self._a321, seat_number, f"id-{seat_number}")
+        report = migrate_seat_allocations(self._a321, to_plan)
+        self.assertEqual(186, len(report["kept"]) + len(report["moved"]))
+        self.assertEqual(235 - 186, len(report["unplaced"]))
+        self.assertEqual(0, len(get_unallocated_seats(to_plan)))
+        for passenger_id, _ in report["unplaced"]:
+            self.assertIsNone(get_allocated_seat(to_plan, passenger_id))
+
+    def test_migrate_seat_allocations_fills_a_full_plan(self):
+        for seat_number in get_unallocated_seats(self._a320):
+            allocate_seat(self._a320, seat_number, f"id-{seat_number}")
+        to_plan = read_plan("EasyJet", "A320", "1")
+        report = migrate_seat_allocations(self._a320, to_plan)
+        self.assertEqual(186, len(report["kept"]))
+        self.assertEqual(get_seat_allocations(self._a320), get_seat_allocations(to_plan))
+
+    def test_class_aware_migrate_seat_allocations(self):
+        # Row 7 is "Up Front" in the A321neo layout but "Economy" in the A320 layout
+        allocate_seat(self._a321, "7A", "id-1")
+        allocate_seat(self._a321, "20A", "id-2")
+        to_plan = read_plan("EasyJet", "A320", "1")
+        report = migrate_seat_allocations(self._a321, to_plan, class_aware=True)
+        self.assertEqual([("id-2", "20A")], report["kept"])
+        self.assertEqual([("id-1", "7A", "1A")], report["moved"])
+        self.assertEqual("Up Front", get_seating_row(to_plan, "1A")["class"])
+
     def test_get_passengers_with_no_seat(self):
         allocate_seat(self._a320, "1A", "id-1")
         ids_with_no_allocation = get_passengers_with_no_seat(self._a320, {"id-1", "id-2"})
@@ -84,3 +135,95 @@ class TestSeatingPlan(TestCase):
         allocate_seat(self._a320, "1A", "id-1")
         clear_allocation(self._a320, "1A")
         self.assertIsNone(get_allocated_seat(self._a320, "id"))
+
+    def test_allocate_seat_returns_previous_seat(self):
+        self.assertIsNone(allocate_seat(self._a320, "5D", "id"))
+        self.assertEqual("5D", allocate_seat(self._a320, "7F", "id"))
+
+    def test_build_free_run_index(self):
+        allocate_seat(self._a320, "1C", "id-1")
+        index = build_free_run_index(self._a320)
+        self.assertEqual([(0, 2), (3, 6)], index["1"]["runs"])
+        self.assertEqual([(0, 6)], index["2"]["runs"])
+        self.assertEqual("1A", get_first_free_seat(index))
+
+    def test_update_free_run_index(self):
+        index = build_free_run_index(self._a320)
+        update_free_run_index(index, "1C", False)
+        update_free_run_index(index, "1D", False)
+        self.assertEqual([(0, 2), (4, 6)], index["1"]["runs"])
+        update_free_run_index(index, "1C", True)
+        self.assertEqual([(0, 3), (4, 6)], index["1"]["runs"])
+        update_free_run_index(index, "1D", True)
+        self.assertEqual([(0, 6)], index["1"]["runs"])
+
+    def test_find_seat_block(self):
+        allocate_seat(self._a320, "1C", "id-1")
+        index = build_free_run_index(self._a320)
+        self.assertEqual(["1A", "1B"], find_seat_block(index, 2))
+        self.assertEqual(["1D", "1E", "1F"], find_seat_block(index, 3))
+        self.assertEqual(["2A", "2B", "2C", "2D"], find_seat_block(index, 4))
+
+    def test_find_seat_block_across_adjacent_rows(self):
+        # Rows 1 and 2 have 2 free seats, row 3 is full and rows 4 to 6 have 3, 1 and 3 free seats
+        for row, letters in [("1", "ABCD"), ("2", "ABCD"), ("3", "ABCDEF"), ("4", "ABC"), ("5", "ABCDE"), ("6", "ABC")]:
+            for letter in letters:
+                allocate_seat(self._a320, f"{row}{letter}", f"id-{row}{letter}")
+        index = build_free_run_index(self._a320)
+        index = {row: index[row] for row in ["1", "2", "3", "4", "5", "6"]}
+
+        self.assertEqual(["1E", "1F", "2E", "2F"], find_seat_block(index, 4))
+        self.assertEqual(["4D", "4E", "4F", "5F", "6D"], find_seat_block(index, 5))
+        self.assertIsNone(find_seat_block(index, 8))
+
+
+class TestSeatingPlanTemplateCache(TestCase):
+    def setUp(self) -> None:
+        self._original_data_folder = os.environ.get(FLIGHT_BOOKING_DATA_FOLDER_ENV)
+        self._data_folder = tempfile.TemporaryDirectory()
+        os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = self._data_folder.name
+        self._plan_file = get_seating_file_path("Test Airline", "A320")
+        self._write_plan("1,Economy,ABC\n2,Economy,ABC\n")
+        clear_plan_template_cache()
+
+    def tearDown(self) -> None:
+        if self._original_data_folder is None:
+            del os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV]
+        else:
+            os.environ[FLIGHT_BOOKING_DATA_FOLDER_ENV] = self._original_data_folder
+        self._data_folder.cleanup()
+        clear_plan_template_cache()
+
+    def _write_plan(self, rows, mtime=None):
+        with open(self._plan_file, mode="wt", encoding="utf-8") as f:
+            f.write("Row,Class,Seats\n")
+            f.write(rows)
+        if mtime is not None:
+            os.utime(self._plan_file, ns=(mtime, mtime))
+
+    def test_template_is_cached(self):
+        template = get_plan_template("Test Airline", "A320")
+        self.assertIs(template, get_plan_template("Test Airline", "A320"))
+        self.assertEqual(6, template.capacity)
+
+    def test_plans_created_from_template_are_independent(self):
+        first = read_plan("Test Airline", "A320")
+        second = read_plan("Test Airline", "A320")
+        allocate_seat(first, "1A", "id")
+        self.assertEqual("1A", get_allocated_seat(first, "id"))
+        self.assertIsNone(get_allocated_seat(second, "id"))
+        self.assertEqual(6, len(get_unallocated_seats(second)))
+
+    def test_modified_plan_file_is_reloaded(self):
+        template = get_plan_template("Test Airline", "A320")
+        self._write_plan("1,Economy,ABCD\n2,Economy,ABCD\n", mtime=os.stat(self._plan_file).st_mtime_ns + 10 ** 9)
+        reloaded = get_plan_template("Test Airline", "A320")
+        self.assertIsNot(template, reloaded)
+        self.assertEqual(8, reloaded.capacity)
+        self.assertEqual(8, read_plan("Test Airline", "A320")["capacity"])
+
+    def test_deleted_plan_file_is_not_found(self):
+        get_plan_template("Test Airline", "A320")
+        os.unlink(self._plan_file)
+        with self.assertRaises(SeatingPlanNotFoundError):
+            _ = read_plan("Test Airline", "A320")
@@ -27,6 +27,19 @@ class TestUtils(unittest.TestCase):
         expected = os.path.join("tmp", "boarding_cards", "u28549_5b_20211120.pdf")
         self.assertEqual(expected, file_path)
 
+    def test_get_boarding_card_path_replaces_non_alphanumeric_characters(self):
+        file_path = get_boarding_card_path("U2-8549", "5 B", datetime.datetime(2021, 11, 20, 10, 45, 0), "pdf")
+        expected = os.path.join("tmp", "boarding_cards", "u2_8549_5_b_20211120.pdf")
+        self.assertEqual(expected, file_path)
+
+    def test_get_boarding_card_file_name_parts(self):
+        folder, prefix, suffix = get_boarding_card_file_name_parts("U28549",
+                                                                   datetime.datetime(2021, 11, 20, 10, 45, 0),
+                                                                   "pdf")
+        self.assertEqual(os.path.join("tmp", "boarding_cards"), folder)
+        self.assertEqual("u28549_", prefix)
+        self.assertEqual("_20211120.pdf", suffix)
+
     def test_get_lookup_file_path(self):
         file_path = get_lookup_file_path("lookup_file.dat")
         expected = os.path.join("tmp", "lookups", "lookup_file.dat")
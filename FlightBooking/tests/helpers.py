@@ -4,7 +4,9 @@ This module contains helper methods to perform common operations required by the
 
 import datetime
 import os
+import random
 import shutil
+import uuid
 from random import randint
 from src.flight_booking import Flight, create_passenger
 from src.flight_booking.utils import get_data_folder, get_flight_file_path, get_boarding_card_path
@@ -12,10 +14,11 @@ from src.flight_booking.utils import get_data_folder, get_flight_file_path, get_
 base_passport_number = randint(1, 100000)
 
 
-def create_test_flight():
+def create_test_flight(columnar_passengers=False):
     """
     Helper method to create a flight
 
+    :param columnar_passengers: If True, the flight holds its passengers in a columnar passenger store
     :return: An instance of the Flight class
     """
     return Flight(
@@ -24,7 +27,8 @@ def create_test_flight():
         embarkation="LGW",
         destination="RMU",
         departs=datetime.datetime(2099, 11, 20, 10, 45, 0),
-        duration=datetime.timedelta(hours=2, minutes=35)
+        duration=datetime.timedelta(hours=2, minutes=35),
+        columnar_passengers=columnar_passengers
     )
 
 
@@ -44,6 +48,30 @@ def create_test_passenger():
                             str(base_passport_number).zfill(6))
 
 
+def create_test_passengers(number_of_passengers, seed=0):
+    """
+    Helper method to create a reproducible list of passengers. The same seed always produces the same passengers,
+    including their IDs, so results from separate runs can be compared
+
+    :param number_of_passengers: Number of passengers to create
+    :param seed: Seed for the random number generator
+    :return: List of passengers
+    """
+    rng = random.Random(seed)
+    countries = ["United Kingdom", "Spain", "France", "Germany", "Italy", "Ireland", "Portugal", "Netherlands"]
+    passengers = []
+    for i in range(number_of_passengers):
+        passenger = create_passenger(f"Passenger {i}",
+                                     rng.choice(["M", "F"]),
+                                     datetime.date(rng.randint(1940, 2010), rng.randint(1, 12), rng.randint(1, 28)),
+                                     rng.choice(countries),
+                                     rng.choice(countries),
+                                     str(i).zfill(9))
+        passenger["id"] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        passengers.append(passenger)
+    return passengers
+
+
 def fill_test_flight(flight):
     """
     Helper method to fill the flight